@@ -0,0 +1,78 @@
+"""
+Compares per-call overhead of the compiled Tensorflow functions used
+by the networks (``network.methods``) against the ``session.run``
+call with ``feed_dict`` on a small MLP trained with mini-batches of
+32 samples.
+"""
+import timeit
+
+import numpy as np
+
+from neupy import algorithms, layers, environment
+from neupy.utils import tensorflow_session
+
+
+environment.reproducible()
+
+BATCH_SIZE = 32
+N_CALLS = 10000
+
+network = algorithms.GradientDescent(
+    [
+        layers.Input(10),
+        layers.Sigmoid(20),
+        layers.Sigmoid(1),
+    ],
+    batch_size=BATCH_SIZE,
+    verbose=False,
+)
+
+x_batch = np.random.random((BATCH_SIZE, 10)).astype('float32')
+y_batch = np.random.random((BATCH_SIZE, 1)).astype('float32')
+
+session = tensorflow_session()
+inputs = network.variables.network_inputs + [network.variables.network_output]
+error = network.variables.validation_error_func
+prediction = network.variables.prediction_func
+
+
+def feed_dict_prediction_error():
+    return session.run(error, feed_dict=dict(zip(inputs, [x_batch, y_batch])))
+
+
+def callable_prediction_error():
+    return network.methods.prediction_error(x_batch, y_batch)
+
+
+def feed_dict_predict():
+    return session.run(prediction, feed_dict={inputs[0]: x_batch})
+
+
+def callable_predict():
+    return network.methods.predict(x_batch)
+
+
+def measure(function):
+    # Warm up, first call might include graph preparations
+    function()
+    total_time = min(timeit.repeat(function, number=N_CALLS, repeat=3))
+    return 1e6 * total_time / N_CALLS
+
+
+print("Per-call time in microseconds, MLP (10, 20, 1), "
+      "batch size {}".format(BATCH_SIZE))
+print("")
+
+benchmarks = [
+    ('prediction_error', feed_dict_prediction_error,
+     callable_prediction_error),
+    ('predict', feed_dict_predict, callable_predict),
+]
+
+for name, before, after in benchmarks:
+    before_time = measure(before)
+    after_time = measure(after)
+
+    print("{:<20} feed_dict: {:>8.1f}  callable: {:>8.1f}  "
+          "speedup: {:.2f}x".format(
+              name, before_time, after_time, before_time / after_time))
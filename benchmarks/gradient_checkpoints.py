@@ -0,0 +1,90 @@
+"""
+Measures memory and time overhead of the gradient checkpointing
+for the ResNet50 trained on CPU. Each configuration runs in the
+separate process, since peak memory usage of the process cannot
+be reset. Memory is measured as a peak resident set size of the
+process and time as an average time per training update.
+"""
+import sys
+import json
+import timeit
+import resource
+import subprocess
+
+import numpy as np
+
+from neupy import algorithms, architectures, environment
+
+
+BATCH_SIZE = 16
+INPUT_SHAPE = (112, 112, 3)
+N_UPDATES = 5
+
+CONFIGURATIONS = [
+    ('no checkpoints', None),
+    ('every 14th layer', 14),
+    ('every 28th layer', 28),
+]
+
+
+def peak_memory_in_megabytes():
+    # Linux reports value in kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+
+def run_configuration(checkpoints):
+    environment.reproducible()
+
+    resnet50 = architectures.resnet50(input_shape=INPUT_SHAPE)
+    network = algorithms.Momentum(
+        resnet50,
+        step=0.001,
+        error='categorical_crossentropy',
+        checkpoints=checkpoints,
+        verbose=False,
+    )
+
+    x_batch = np.random.random((BATCH_SIZE,) + INPUT_SHAPE)
+    y_batch = np.zeros((BATCH_SIZE, 1000))
+    y_batch[np.arange(BATCH_SIZE), np.arange(BATCH_SIZE)] = 1
+
+    train_epoch = network.methods.train_epoch
+    # Warm up, first call might include graph preparations
+    train_epoch(x_batch, y_batch)
+
+    total_time = timeit.timeit(
+        lambda: train_epoch(x_batch, y_batch), number=N_UPDATES)
+
+    return {
+        'memory': peak_memory_in_megabytes(),
+        'time': total_time / N_UPDATES,
+    }
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        checkpoints = json.loads(sys.argv[1])
+        print(json.dumps(run_configuration(checkpoints)))
+        sys.exit(0)
+
+    print("ResNet50, input shape {}, batch size {}".format(
+        INPUT_SHAPE, BATCH_SIZE))
+    print("")
+
+    baseline = None
+
+    for name, checkpoints in CONFIGURATIONS:
+        output = subprocess.check_output(
+            [sys.executable, __file__, json.dumps(checkpoints)])
+        result = json.loads(output.decode('utf-8').strip().split('\n')[-1])
+
+        if baseline is None:
+            baseline = result
+
+        print("{:<18} memory: {:>8.1f} MB ({:>+6.1f}%)  "
+              "time: {:>6.2f} sec ({:>+6.1f}%)".format(
+                  name,
+                  result['memory'],
+                  100 * (result['memory'] / baseline['memory'] - 1),
+                  result['time'],
+                  100 * (result['time'] / baseline['time'] - 1)))
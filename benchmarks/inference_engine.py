@@ -0,0 +1,117 @@
+"""
+Compares NumPy-only inference network exported with
+``neupy.numpy_inference.export_inference`` against the ``predict`` method
+of the connection. Benchmark measures cold-start time (fresh process
+that loads stored network and makes single prediction) and per-request
+latency for the small CNN.
+"""
+import os
+import sys
+import timeit
+import tempfile
+import subprocess
+
+import numpy as np
+
+from neupy import layers, storage, numpy_inference, environment
+
+
+environment.reproducible()
+
+N_CALLS = 1000
+
+
+def create_connection():
+    return layers.join(
+        layers.Input((28, 28, 1)),
+        layers.Convolution((3, 3, 16)),
+        layers.BatchNorm(),
+        layers.Relu(),
+        layers.MaxPooling((2, 2)),
+        layers.Convolution((3, 3, 32)),
+        layers.Relu(),
+        layers.MaxPooling((2, 2)),
+        layers.Reshape(),
+        layers.Relu(64),
+        layers.Softmax(10),
+    )
+
+
+TENSORFLOW_COLD_START = """
+import sys
+import numpy as np
+sys.path.insert(0, {benchmarks_directory!r})
+
+from inference_engine import create_connection
+from neupy import storage
+
+connection = create_connection()
+storage.load_pickle(connection, {filepath!r})
+connection.predict(np.ones((1, 28, 28, 1), dtype='float32'))
+"""
+
+NUMPY_COLD_START = """
+import numpy as np
+from neupy.numpy_inference import InferenceNetwork
+
+network = InferenceNetwork.load({filepath!r})
+network.predict(np.ones((1, 28, 28, 1), dtype='float32'))
+"""
+
+
+def cold_start_time(code, **parameters):
+    command = [sys.executable, '-c', code.format(**parameters)]
+    return min(timeit.repeat(
+        lambda: subprocess.check_call(command), number=1, repeat=3))
+
+
+def measure(function):
+    # Warm up, first call might include graph preparations
+    function()
+    total_time = min(timeit.repeat(function, number=N_CALLS, repeat=3))
+    return 1e6 * total_time / N_CALLS
+
+
+if __name__ == '__main__':
+    connection = create_connection()
+    inference_network = numpy_inference.export_inference(connection)
+    benchmarks_directory = os.path.dirname(os.path.abspath(__file__))
+
+    parameters_file = tempfile.NamedTemporaryFile(suffix='.pickle')
+    inference_file = tempfile.NamedTemporaryFile(suffix='.pickle')
+
+    with parameters_file, inference_file:
+        storage.save_pickle(connection, parameters_file.name)
+        inference_network.save(inference_file.name)
+
+        tensorflow_time = cold_start_time(
+            TENSORFLOW_COLD_START,
+            benchmarks_directory=benchmarks_directory,
+            filepath=parameters_file.name)
+
+        numpy_time = cold_start_time(
+            NUMPY_COLD_START, filepath=inference_file.name)
+
+    print("Cold start time in seconds, small CNN")
+    print("")
+    print("predict: {:>8.2f}  inference: {:>8.2f}  speedup: {:.2f}x".format(
+        tensorflow_time, numpy_time, tensorflow_time / numpy_time))
+    print("")
+    print("Per-request time in microseconds, small CNN")
+    print("")
+
+    for batch_size in (1, 32):
+        x_batch = np.random.random((batch_size, 28, 28, 1)).astype('float32')
+
+        np.testing.assert_array_almost_equal(
+            connection.predict(x_batch),
+            inference_network.predict(x_batch),
+            decimal=5)
+
+        predict_time = measure(lambda: connection.predict(x_batch))
+        inference_time = measure(lambda: inference_network.predict(x_batch))
+
+        print("batch size {:<4} predict: {:>8.1f}  inference: {:>8.1f}  "
+              "speedup: {:.2f}x".format(
+                  batch_size, predict_time, inference_time,
+                  predict_time / inference_time))
@@ -0,0 +1,61 @@
+"""
+Measures time spent on the layer graph operations: construction of
+the connection and iteration over its layers. Benchmark uses ResNet50
+architecture and synthetic graph with 5,000 layers that consists of
+the residual blocks. Iteration time is compared between cached
+topological order and topological sort that is computed every time.
+"""
+import timeit
+
+from neupy import layers, architectures
+from neupy.layers.connections.graph import topological_sort
+
+
+N_ITERATIONS = 100
+
+
+def synthetic_graph(n_layers):
+    connection = layers.Input(10)
+
+    # Each block has 3 layers: two branches and merge layer
+    for _ in range(n_layers // 3):
+        connection = layers.join(
+            connection,
+            [layers.Relu(), layers.Sigmoid()],
+            layers.Elementwise(),
+        )
+
+    return connection
+
+
+def measure(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def iterate_cached(connection):
+    return lambda: list(connection)
+
+
+def iterate_uncached(connection):
+    return lambda: topological_sort(connection.graph.backward_graph)
+
+
+print("Time in milliseconds")
+print("")
+
+benchmarks = [
+    ('resnet50', architectures.resnet50),
+    ('synthetic 5000', lambda: synthetic_graph(5000)),
+]
+
+for name, create_connection in benchmarks:
+    construction_time = measure(create_connection, number=1)
+    connection = create_connection()
+
+    sort_time = measure(iterate_uncached(connection), number=N_ITERATIONS)
+    iteration_time = measure(iterate_cached(connection), number=N_ITERATIONS)
+
+    print("{:<16} layers: {:>5}  construction: {:>9.1f}  "
+          "topological sort: {:>7.2f}  cached iteration: {:>7.2f}".format(
+              name, len(connection), 1e3 * construction_time,
+              1e3 * sort_time, 1e3 * iteration_time))
@@ -0,0 +1,79 @@
+"""
+Compares search of the winning neurons in the SOFM with 100x100
+feature grid against the search that computes distance per each
+sample separately. Per-sample search is measured on the subset
+of the data, since it takes too long to process all of the samples.
+Memory is measured as a size of the largest array that stores
+distances.
+"""
+import timeit
+
+import numpy as np
+
+from neupy import algorithms, environment
+
+
+N_SAMPLES = 1000000
+N_SUBSET_SAMPLES = 10000
+N_FEATURES = 10
+FEATURES_GRID = (100, 100)
+CHUNK_SIZES = [256, 1024, 4096]
+DISTANCES = ['euclid', 'dot_product', 'cos']
+
+
+def per_sample_winners(sofm, input_data):
+    # Search that was used before vectorization
+    winners = np.zeros(len(input_data), dtype=int)
+
+    for i, input_row in enumerate(input_data):
+        output = sofm.distance.func(input_row.reshape(1, -1), sofm.weight)
+        winners[i] = output.argmax()
+
+    return winners
+
+
+def measure(function):
+    return min(timeit.repeat(function, number=1, repeat=3))
+
+
+if __name__ == '__main__':
+    environment.reproducible()
+
+    data = np.random.random((N_SAMPLES, N_FEATURES))
+    n_outputs = np.prod(FEATURES_GRID)
+
+    print("SOFM {}, {} samples with {} features".format(
+        FEATURES_GRID, N_SAMPLES, N_FEATURES))
+    print("")
+
+    for distance in DISTANCES:
+        sofm = algorithms.SOFM(
+            n_inputs=N_FEATURES,
+            features_grid=FEATURES_GRID,
+            distance=distance,
+            verbose=False,
+        )
+
+        subset = data[:N_SUBSET_SAMPLES]
+        per_sample_time = measure(lambda: per_sample_winners(sofm, subset))
+        per_sample_time *= N_SAMPLES / N_SUBSET_SAMPLES
+
+        print("{:<12} per sample: {:>8.1f} sec (estimated)".format(
+            distance, per_sample_time))
+
+        for chunk_size in CHUNK_SIZES:
+            sofm.chunk_size = chunk_size
+
+            np.testing.assert_array_equal(
+                sofm.find_winners(subset),
+                per_sample_winners(sofm, subset))
+
+            chunked_time = measure(lambda: sofm.find_winners(data))
+            memory = chunk_size * n_outputs * data.itemsize / 1024. ** 2
+
+            print("{:<12} chunk {:<6} {:>8.1f} sec  memory: {:>7.1f} MB  "
+                  "speedup: {:.1f}x".format(
+                      '', chunk_size, chunked_time, memory,
+                      per_sample_time / chunked_time))
+
+        print("")
@@ -3,6 +3,7 @@ from .gd.lev_marq import *
 from .gd.quasi_newton import *
 from .gd.conjgrad import *
 from .gd.hessian import *
+from .gd.hessian_free import *
 from .gd.hessdiag import *
 from .gd.rprop import *
 from .gd.momentum import *
@@ -35,6 +36,7 @@ from .competitive.sofm import *
 from .competitive.art import *
 from .competitive.lvq import *
 from .competitive.growing_neural_gas import *
+from .competitive.prototype_index import *
 
 from .rbfn.pnn import *
 from .rbfn.rbf_kmeans import *
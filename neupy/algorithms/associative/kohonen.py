@@ -1,5 +1,6 @@
 import numpy as np
 
+from neupy.core.properties import IntProperty
 from .base import BaseAssociative
 
 
@@ -18,6 +19,12 @@ class Kohonen(BaseAssociative):
 
     {BaseAssociative.weight}
 
+    chunk_size : int
+        Number of samples for which outputs will be computed at once
+        during the prediction. Memory required for the prediction is
+        proportional to the ``chunk_size * n_outputs``.
+        Defaults to ``1024``.
+
     {BaseNetwork.step}
 
     {BaseNetwork.show_epoch}
@@ -69,15 +76,44 @@ class Kohonen(BaseAssociative):
            [ 0.,  0.,  1.],
            [ 0.,  0.,  1.]])
     """
+    chunk_size = IntProperty(default=1024, minval=1)
+
     def predict_raw(self, input_data):
         input_data = self.format_input_data(input_data)
         return input_data.dot(self.weight)
 
+    def find_winners(self, input_data):
+        """
+        Finds index of the winning neuron for each sample. Samples
+        will be processed in chunks, which means that output from the
+        network is never stored for all of the samples at once.
+
+        Parameters
+        ----------
+        input_data : array-like
+
+        Returns
+        -------
+        array-like
+            Vector with index of the winning neuron per each sample.
+        """
+        input_data = self.format_input_data(input_data)
+        n_samples = input_data.shape[0]
+        winners = np.zeros(n_samples, dtype=int)
+
+        for start in range(0, n_samples, self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            raw_output = self.predict_raw(input_data[chunk])
+            winners[chunk] = raw_output.argmax(axis=1)
+
+        return winners
+
     def predict(self, input_data):
-        raw_output = self.predict_raw(input_data)
-        output = np.zeros(raw_output.shape, dtype=np.int0)
-        max_args = raw_output.argmax(axis=1)
-        output[range(raw_output.shape[0]), max_args] = 1
+        max_args = self.find_winners(input_data)
+        n_samples = max_args.shape[0]
+
+        output = np.zeros((n_samples, self.n_outputs), dtype=np.int0)
+        output[np.arange(n_samples), max_args] = 1
         return output
 
     def train_epoch(self, input_train, target_train):
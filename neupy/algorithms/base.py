@@ -13,7 +13,8 @@ from neupy.exceptions import StopTraining
 from neupy.core.base import BaseSkeleton
 from neupy.core.properties import BoundedProperty, NumberProperty, Property
 from .summary_info import SummaryTable, InlineSummary
-from .utils import iter_until_converge, shuffle
+from .utils import (iter_until_converge, shuffle, is_batch_source,
+                    is_streaming_data)
 
 
 __all__ = ('BaseNetwork',)
@@ -67,11 +68,26 @@ def show_network_options(network, highlight_options=None):
     logs.newline()
 
 
+def preformat_data_info(data):
+    if is_batch_source(data):
+        return "streamed from {}".format(preformat_value(data))
+    return "shapes: {}".format(preformat_value(data))
+
+
 def logging_info_about_the_data(network, input_train, input_test):
     logs = network.logs
-    training_shapes = preformat_value(input_train)
-
     logs.title("Start training")
+
+    # Shapes of the streamed data are unknown until
+    # the source produces its batches
+    if is_batch_source(input_train) or is_batch_source(input_test):
+        logs.message("TRAINING DATA", preformat_data_info(input_train))
+
+        if input_test is not None:
+            logs.message("TEST DATA", preformat_data_info(input_test))
+        return
+
+    training_shapes = preformat_value(input_train)
     logs.message("TRAINING DATA", "shapes: {}".format(training_shapes))
 
     if isinstance(training_shapes[0], numbers.Integral):
@@ -317,6 +333,31 @@ class BaseNetwork(BaseSkeleton):
     def train_epoch(self, input_train, target_train=None):
         raise NotImplementedError()
 
+    def shuffle_training_data(self, input_train, target_train=None):
+        """
+        Shuffles training samples. Function would be triggered
+        before each training epoch in case if ``shuffle_data``
+        property equal to ``True``.
+
+        Parameters
+        ----------
+        input_train : array-like or list of array-like
+
+        target_train : array-like or None
+
+        Returns
+        -------
+        tuple
+            Shuffled input and target data.
+        """
+        data = shuffle(*as_tuple(input_train, target_train))
+        input_train, target_train = data[:-1], data[-1]
+
+        if len(input_train) == 1:
+            input_train = input_train[0]
+
+        return input_train, target_train
+
     def prediction_error(self, input_test, target_test):
         raise NotImplementedError()
 
@@ -381,9 +422,16 @@ class BaseNetwork(BaseSkeleton):
         # iterations.
         training_errors = self.errors
         validation_errors = self.validation_errors
-        shuffle_data = self.shuffle_data
+
+        # Streaming data cannot be shuffled in memory, algorithms
+        # that support it have to shuffle batches on their own.
+        shuffle_data = (
+            self.shuffle_data and
+            not is_streaming_data(input_train)
+        )
 
         train_epoch = self.train_epoch
+        shuffle_training_data = self.shuffle_training_data
         epoch_end_signal = self.epoch_end_signal
         train_end_signal = self.train_end_signal
         on_epoch_start_update = self.on_epoch_start_update
@@ -398,11 +446,8 @@ class BaseNetwork(BaseSkeleton):
             on_epoch_start_update(epoch)
 
             if shuffle_data:
-                data = shuffle(*as_tuple(input_train, target_train))
-                input_train, target_train = data[:-1], data[-1]
-
-                if len(input_train) == 1:
-                    input_train = input_train[0]
+                input_train, target_train = shuffle_training_data(
+                    input_train, target_train)
 
             try:
                 train_error = train_epoch(input_train, target_train)
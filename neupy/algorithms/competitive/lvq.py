@@ -8,6 +8,7 @@ from neupy.exceptions import NotTrained
 from neupy.algorithms.base import BaseNetwork
 from neupy.core.properties import (IntProperty, Property, TypedListProperty,
                                    NumberProperty)
+from .prototype_index import PrototypeIndex
 
 
 __all__ = ('LVQ', 'LVQ2', 'LVQ21', 'LVQ3')
@@ -134,6 +135,15 @@ class LVQ(BaseNetwork):
         property useful only in case if ``n_updates_to_stepdrop``
         is not ``None``. Defaults to ``1e-5``.
 
+    search_index : PrototypeIndex or None
+        Index that will be used in order to find closest prototypes
+        instead of computing distances to all of the prototypes.
+        Index can miss closest prototype, which makes training and
+        prediction approximate, but for the large number of prototypes
+        search becomes much faster. Value ``None`` means that closest
+        prototypes will be found with the exhaustive search.
+        Defaults to ``None``.
+
     {BaseNetwork.show_epoch}
 
     {BaseNetwork.shuffle_data}
@@ -174,6 +184,8 @@ class LVQ(BaseNetwork):
     n_updates_to_stepdrop = IntProperty(default=None, allow_none=True,
                                         minval=1)
     minstep = NumberProperty(minval=0, default=1e-5)
+    search_index = Property(expected_type=PrototypeIndex, allow_none=True,
+                            default=None)
 
     def __init__(self, **options):
         self.initialized = False
@@ -238,6 +250,34 @@ class LVQ(BaseNetwork):
         updates_ratio = (1 - self.n_updates / self.n_updates_to_stepdrop)
         return self.minstep + (self.step - self.minstep) * updates_ratio
 
+    def find_closest_prototypes(self, input_row, n):
+        """
+        Finds prototypes that are closest to the sample.
+
+        Parameters
+        ----------
+        input_row : 1d array-like
+            Data sample.
+
+        n : int
+            Number of closest prototypes.
+
+        Returns
+        -------
+        tuple
+            Indices of the closest prototypes sorted by the distance
+            and distances to them.
+        """
+        if self.search_index is None:
+            output = euclid_distance(input_row, self.weight)
+            indices = n_argmin(output, n=n, axis=1)
+            return indices, output[0, indices]
+
+        indices, distances = self.search_index.query(
+            np.expand_dims(input_row, axis=0), self.weight, k=n)
+
+        return indices[0], distances[0]
+
     def predict(self, input_data):
         if not self.initialized:
             raise NotTrained("LVQ network hasn't been trained yet")
@@ -246,6 +286,10 @@ class LVQ(BaseNetwork):
         subclass_to_class = self.subclass_to_class
         weight = self.weight
 
+        if self.search_index is not None:
+            indices, _ = self.search_index.query(input_data, weight)
+            return np.array(subclass_to_class)[indices[:, 0]]
+
         predictions = []
         for input_row in input_data:
             output = euclid_distance(input_row, weight)
@@ -303,17 +347,21 @@ class LVQ(BaseNetwork):
             self.weight = np.array(weights)
             self.initialized = True
 
+            if self.search_index is not None:
+                self.search_index.reset()
+
         super(LVQ, self).train(input_train, target_train, *args, **kwargs)
 
     def train_epoch(self, input_train, target_train):
         weight = self.weight
         subclass_to_class = self.subclass_to_class
+        search_index = self.search_index
 
         n_correct_predictions = 0
         for input_row, target in zip(input_train, target_train):
             step = self.training_step
-            output = euclid_distance(input_row, weight)
-            winner_subclass = int(output.argmin())
+            winner_subclasses, _ = self.find_closest_prototypes(input_row, n=1)
+            winner_subclass = int(winner_subclasses[0])
             predicted_class = subclass_to_class[winner_subclass]
 
             weight_update = input_row - weight[winner_subclass, :]
@@ -325,6 +373,9 @@ class LVQ(BaseNetwork):
                 weight[winner_subclass, :] -= step * weight_update
 
             n_correct_predictions += is_correct_prediction
+
+            if search_index is not None:
+                search_index.register_updates()
             self.n_updates += 1
 
         n_samples = len(input_train)
@@ -366,13 +417,14 @@ class LVQ2(LVQ):
     def train_epoch(self, input_train, target_train):
         weight = self.weight
         epsilon = self.epsilon
+        search_index = self.search_index
         subclass_to_class = self.subclass_to_class
 
         n_correct_predictions = 0
         for input_row, target in zip(input_train, target_train):
             step = self.training_step
-            output = euclid_distance(input_row, weight)
-            winner_subclasses = n_argmin(output, n=2, axis=1)
+            winner_subclasses, distances = self.find_closest_prototypes(
+                input_row, n=2)
 
             top1_subclass, top2_subclass = winner_subclasses
             top1_class = subclass_to_class[top1_subclass]
@@ -381,7 +433,7 @@ class LVQ2(LVQ):
             top1_weight_update = input_row - weight[top1_subclass, :]
             is_correct_prediction = (top1_class == target)
 
-            closest_dist, runner_up_dist = output[0, winner_subclasses]
+            closest_dist, runner_up_dist = distances
             double_update_condition_satisfied = (
                 not is_correct_prediction and
                 (top2_class == target) and
@@ -402,6 +454,9 @@ class LVQ2(LVQ):
 
             n_correct_predictions += is_correct_prediction
 
+            if search_index is not None:
+                search_index.register_updates()
+
         n_samples = len(input_train)
         return 1 - n_correct_predictions / n_samples
 
@@ -435,13 +490,14 @@ class LVQ21(LVQ2):
     def train_epoch(self, input_train, target_train):
         weight = self.weight
         epsilon = self.epsilon
+        search_index = self.search_index
         subclass_to_class = self.subclass_to_class
 
         n_correct_predictions = 0
         for input_row, target in zip(input_train, target_train):
             step = self.training_step
-            output = euclid_distance(input_row, weight)
-            winner_subclasses = n_argmin(output, n=2, axis=1)
+            winner_subclasses, distances = self.find_closest_prototypes(
+                input_row, n=2)
 
             top1_subclass, top2_subclass = winner_subclasses
             top1_class = subclass_to_class[top1_subclass]
@@ -450,7 +506,7 @@ class LVQ21(LVQ2):
             top1_weight_update = input_row - weight[top1_subclass, :]
             is_correct_prediction = (top1_class == target)
 
-            closest_dist, runner_up_dist = output[0, winner_subclasses]
+            closest_dist, runner_up_dist = distances
             double_update_condition_satisfied = (
                 (
                     (top1_class == target and top2_class != target) or
@@ -477,6 +533,9 @@ class LVQ21(LVQ2):
                 weight[top1_subclass, :] -= step * top1_weight_update
 
             n_correct_predictions += is_correct_prediction
+
+            if search_index is not None:
+                search_index.register_updates()
             self.n_updates += 1
 
         n_samples = len(input_train)
@@ -508,6 +567,8 @@ class LVQ3(LVQ21):
     step : float
         Learning rate, defaults to ``0.01``.
 
+    {LVQ.search_index}
+
     {BaseNetwork.show_epoch}
 
     {BaseNetwork.shuffle_data}
@@ -543,14 +604,15 @@ class LVQ3(LVQ21):
     def train_epoch(self, input_train, target_train):
         weight = self.weight
         epsilon = self.epsilon
+        search_index = self.search_index
         slowdown_rate = self.slowdown_rate
         subclass_to_class = self.subclass_to_class
 
         n_correct_predictions = 0
         for input_row, target in zip(input_train, target_train):
             step = self.training_step
-            output = euclid_distance(input_row, weight)
-            winner_subclasses = n_argmin(output, n=2, axis=1)
+            winner_subclasses, distances = self.find_closest_prototypes(
+                input_row, n=2)
 
             top1_subclass, top2_subclass = winner_subclasses
             top1_class = subclass_to_class[top1_subclass]
@@ -560,7 +622,7 @@ class LVQ3(LVQ21):
             is_first_correct = (top1_class == target)
             is_second_correct = (top2_class == target)
 
-            closest_dist, runner_up_dist = output[0, winner_subclasses]
+            closest_dist, runner_up_dist = distances
             double_update_condition_satisfied = (
                 (
                     (is_first_correct and not is_second_correct) or
@@ -595,6 +657,9 @@ class LVQ3(LVQ21):
                 weight[top1_subclass, :] -= step * top1_weight_update
 
             n_correct_predictions += is_first_correct
+
+            if search_index is not None:
+                search_index.register_updates()
             self.n_updates += 1
 
         n_samples = len(input_train)
@@ -0,0 +1,158 @@
+from __future__ import division
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+__all__ = ('PrototypeIndex',)
+
+
+class PrototypeIndex(object):
+    """
+    Index that speeds up search of the prototypes that are closest
+    to the data samples in terms of the Euclidian distance. Prototypes
+    are stored in the KD-tree and since prototypes move during the
+    training, tree becomes outdated. Instead of rebuilding tree after
+    every update, index retrieves a few candidates from the tree and
+    ranks them based on the exact distances to the current prototypes.
+    Tree gets rebuilt lazily, during the first search after the
+    specified number of updates.
+
+    Parameters
+    ----------
+    n_candidates : int
+        Number of candidates retrieved from the tree per each sample.
+        The larger the value the smaller chance to miss closest
+        prototype when tree is outdated, but search becomes slower.
+        Defaults to ``4``.
+
+    eps : float
+        Allows approximate search in the tree. Distance to the
+        candidates can be at most ``(1 + eps)`` times larger than
+        distance to the true closest prototypes. Value ``0`` means
+        that candidates are exact for the prototypes stored in the
+        tree. Defaults to ``0``.
+
+    rebuild_after : int
+        Number of updates after which tree will be rebuilt.
+        The larger the value the less time spent on rebuilding,
+        but search becomes less accurate. Value ``1`` means
+        that search is always exact when ``eps=0``.
+        Defaults to ``100``.
+
+    Attributes
+    ----------
+    tree : cKDTree or None
+        Tree that stores copy of the prototypes. Equal to ``None``
+        in case if tree hasn't been built yet.
+
+    n_updates : int
+        Number of updates registered since the tree was built.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from neupy import algorithms
+    >>>
+    >>> sofm = algorithms.SOFM(
+    ...     n_inputs=2,
+    ...     features_grid=(100, 100),
+    ...     search_index=algorithms.PrototypeIndex(rebuild_after=1000),
+    ... )
+    """
+    def __init__(self, n_candidates=4, eps=0, rebuild_after=100):
+        if n_candidates < 1:
+            raise ValueError("Number of candidates should be greater "
+                             "than zero, got {}".format(n_candidates))
+
+        if eps < 0:
+            raise ValueError("Parameter eps cannot be negative, "
+                             "got {}".format(eps))
+
+        if rebuild_after < 1:
+            raise ValueError("Parameter rebuild_after should be greater "
+                             "than zero, got {}".format(rebuild_after))
+
+        self.n_candidates = n_candidates
+        self.eps = eps
+        self.rebuild_after = rebuild_after
+
+        self.tree = None
+        self.n_updates = 0
+
+    def register_updates(self, n_updates=1):
+        """
+        Registers prototype updates. Tree will be rebuilt during
+        the next search once number of updates reaches the limit.
+
+        Parameters
+        ----------
+        n_updates : int
+            Defaults to ``1``.
+        """
+        self.n_updates += n_updates
+
+    def reset(self):
+        """
+        Removes tree, which means that it will be rebuilt
+        during the next search.
+        """
+        self.tree = None
+        self.n_updates = 0
+
+    def query(self, input_data, prototypes, k=1):
+        """
+        Finds ``k`` closest prototypes per each sample.
+
+        Parameters
+        ----------
+        input_data : 2d array-like
+            Matrix with shape ``(n_samples, n_features)``.
+
+        prototypes : 2d array-like
+            Matrix with shape ``(n_prototypes, n_features)`` that
+            contains current prototypes.
+
+        k : int
+            Number of closest prototypes. Defaults to ``1``.
+
+        Returns
+        -------
+        tuple
+            Two matrices with shape ``(n_samples, k)``. The first one
+            contains indices of the closest prototypes and the second
+            one contains distances to them. Prototypes are sorted by
+            the distance in ascending order.
+        """
+        n_prototypes = prototypes.shape[0]
+
+        if k > n_prototypes:
+            raise ValueError("Cannot find {} closest prototypes, since "
+                             "there are only {} prototypes"
+                             "".format(k, n_prototypes))
+
+        is_outdated = (
+            self.tree is None or
+            self.tree.n != n_prototypes or
+            self.n_updates >= self.rebuild_after
+        )
+
+        if is_outdated:
+            # Tree has to store a copy, since prototypes
+            # will be modified inplace during the training
+            self.tree = cKDTree(prototypes, copy_data=True)
+            self.n_updates = 0
+
+        n_candidates = min(max(k, self.n_candidates), n_prototypes)
+        _, candidates = self.tree.query(
+            input_data, k=n_candidates, eps=self.eps)
+        candidates = np.reshape(candidates, (len(input_data), n_candidates))
+
+        distances = np.linalg.norm(
+            np.expand_dims(input_data, axis=1) - prototypes[candidates],
+            axis=2)
+
+        order = distances.argsort(axis=1)[:, :k]
+        rows = np.arange(len(input_data))[:, None]
+
+        return candidates[rows, order], distances[rows, order]
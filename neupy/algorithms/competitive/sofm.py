@@ -1,5 +1,9 @@
 from __future__ import division
 
+import os
+import shutil
+import tempfile
+import multiprocessing
 from collections import namedtuple
 
 import six
@@ -13,8 +17,10 @@ from neupy.exceptions import WeightInitializationError
 from neupy.algorithms.associative.base import BaseAssociative
 from neupy.core.properties import (BaseProperty, TypedListProperty,
                                    ChoiceProperty, NumberProperty,
-                                   ParameterProperty, IntProperty)
+                                   ParameterProperty, IntProperty,
+                                   Property)
 from .randomized_pca import randomized_pca
+from .prototype_index import PrototypeIndex
 from .neighbours import (find_step_scaler_on_rect_grid,
                          find_neighbours_on_rect_grid,
                          find_neighbours_on_hexagon_grid,
@@ -41,8 +47,15 @@ def neg_euclid_distance(input_data, weight):
     -------
     array-like
     """
-    euclid_dist = norm(input_data.T - weight, axis=0)
-    return -np.expand_dims(euclid_dist, axis=0)
+    # Squared distance can be expressed in terms of the matrix
+    # product, which doesn't require difference per each pair
+    squared_euclid_dist = (
+        np.sum(input_data ** 2, axis=1, keepdims=True) -
+        2 * np.dot(input_data, weight) +
+        np.sum(weight ** 2, axis=0)
+    )
+    # Small negative values might appear due to the rounding errors
+    return -np.sqrt(np.clip(squared_euclid_dist, 0, None))
 
 
 def cosine_similarity(input_data, weight):
@@ -61,10 +74,200 @@ def cosine_similarity(input_data, weight):
     -------
     array-like
     """
-    norm_prod = norm(input_data) * norm(weight, axis=0)
+    norm_prod = norm(input_data, axis=1, keepdims=True) * norm(weight, axis=0)
     summated_data = np.dot(input_data, weight)
-    cosine_dist = summated_data / norm_prod
-    return np.reshape(cosine_dist, (1, weight.shape[1]))
+    return summated_data / norm_prod
+
+
+def find_winners(input_data, weight, distance_name):
+    """
+    Finds index of the closest weight for each input sample.
+    Closest weights will be found using one matrix product between
+    input data and weights.
+
+    Parameters
+    ----------
+    input_data : array-like
+        Input dataset.
+
+    weight : array-like
+        Neural network's weights.
+
+    distance_name : {``dot_product``, ``euclid``, ``cosine``}
+        Name of the distance function.
+
+    Returns
+    -------
+    array-like
+        Vector with index of the winning neuron per each sample.
+    """
+    output = np.dot(input_data, weight)
+
+    if distance_name == 'euclid':
+        # Squared norm of the input sample is the same for all
+        # of the neurons and it doesn't change the winner
+        output = 2 * output - np.sum(weight ** 2, axis=0)
+
+    elif distance_name == 'cosine':
+        # The same is true for the norm of the input sample
+        output = output / norm(weight, axis=0)
+
+    return output.argmax(axis=1)
+
+
+def batch_statistics(input_data, weight, winners):
+    """
+    Collects statistics that are required for the weight update in
+    the batch mode. Statistics can be collected for different parts
+    of the data separately and summed up afterwards.
+
+    Parameters
+    ----------
+    input_data : array-like
+        Input dataset.
+
+    weight : array-like
+        Neural network's weights.
+
+    winners : array-like
+        Index of the winning neuron per each sample.
+
+    Returns
+    -------
+    tuple
+        Sum of the samples per each winning neuron, number of samples
+        per each winning neuron and sum of the absolute differences
+        between samples and weights of their winning neurons.
+    """
+    n_outputs = weight.shape[1]
+    n_features = input_data.shape[1]
+
+    n_winners = np.bincount(winners, minlength=n_outputs)
+    sum_per_winner = np.zeros((n_outputs, n_features))
+
+    for feature in range(n_features):
+        sum_per_winner[:, feature] = np.bincount(
+            winners, weights=input_data[:, feature], minlength=n_outputs)
+
+    error = np.abs(input_data - weight[:, winners].T).sum()
+    return sum_per_winner, n_winners, error
+
+
+def is_file_memmap(data):
+    """
+    Checks whether data is a memory-mapped array that can be opened
+    from the file by another process. Views of the memory-mapped
+    arrays don't satisfy this condition.
+
+    Parameters
+    ----------
+    data : object
+
+    Returns
+    -------
+    bool
+    """
+    return (
+        isinstance(data, np.memmap) and
+        data.filename is not None and
+        data.flags.c_contiguous and
+        not isinstance(data.base, np.memmap)
+    )
+
+
+def shard_batch_statistics(shard):
+    """
+    Collects batch statistics for the part of the memory-mapped data.
+    Function runs in the worker process.
+
+    Parameters
+    ----------
+    shard : tuple
+        Tuple that contains information about the memory-mapped
+        file (filename, data type, shape and offset), range of the
+        samples (start and stop), weight, name of the distance and
+        chunk size.
+
+    Returns
+    -------
+    tuple
+        The same statistics as returned from the
+        ``batch_statistics`` function.
+    """
+    (filename, dtype, shape, offset, start, stop,
+     weight, distance_name, chunk_size) = shard
+
+    data = np.memmap(filename, dtype=dtype, mode='r',
+                     shape=shape, offset=offset)
+    statistics = None
+
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop)
+        chunk = np.asarray(data[chunk_start:chunk_stop])
+
+        winners = find_winners(chunk, weight, distance_name)
+        chunk_statistics = batch_statistics(chunk, weight, winners)
+
+        if statistics is None:
+            statistics = chunk_statistics
+        else:
+            statistics = [
+                total + value
+                for total, value in zip(statistics, chunk_statistics)]
+
+    return statistics
+
+
+def parallel_batch_statistics(input_data, weight, distance_name,
+                              chunk_size, n_jobs):
+    """
+    Splits memory-mapped data into equal shards and collects batch
+    statistics for each shard in the separate process. Processes
+    read their shards from the file, which means that data doesn't
+    have to be copied into each process.
+
+    Parameters
+    ----------
+    input_data : numpy.memmap
+        Input dataset.
+
+    weight : array-like
+        Neural network's weights.
+
+    distance_name : {``dot_product``, ``euclid``, ``cosine``}
+        Name of the distance function.
+
+    chunk_size : int
+        Number of samples that each process loads at once.
+
+    n_jobs : int
+        Number of processes.
+
+    Returns
+    -------
+    tuple
+        The same statistics as returned from the
+        ``batch_statistics`` function.
+    """
+    n_samples = input_data.shape[0]
+    n_jobs = min(n_jobs, n_samples)
+    bounds = np.linspace(0, n_samples, n_jobs + 1).astype(int)
+
+    shards = [(
+        input_data.filename, input_data.dtype.str, input_data.shape,
+        input_data.offset, start, stop, weight, distance_name, chunk_size,
+    ) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    pool = multiprocessing.Pool(n_jobs)
+
+    try:
+        results = pool.map(shard_batch_statistics, shards)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    sum_per_winner, n_winners, error = zip(*results)
+    return sum(sum_per_winner), sum(n_winners), sum(error)
 
 
 def decay_function(value, epoch, reduction_rate):
@@ -312,6 +515,44 @@ class SOFM(Kohonen):
 
         Defaults to ``100``.
 
+    {Kohonen.chunk_size}
+
+    training_mode : {{``online``, ``batch``}}
+        Defines the way how weights will be updated during the
+        training.
+
+        - ``online`` - Weights will be updated after each
+          training sample.
+
+        - ``batch`` - Winning neurons will be found for all of the
+          samples at once and each weight will be updated only once
+          per epoch. New weight is equal to the average of the samples
+          weighted by the step scaler of the neuron with respect to
+          the winning neuron of each sample. Training in the batch mode
+          doesn't depend on the order of the samples and on the
+          ``step`` parameter.
+
+        Defaults to ``online``.
+
+    n_jobs : int
+        Number of processes that train network in the ``batch`` mode.
+        Each process finds winning neurons and sums up samples for
+        its own part of the training data. Processes read data from
+        the memory-mapped file. Training data that is not stored in
+        the ``numpy.memmap`` will be copied into the temporary file
+        before the training. Processes always find winning neurons
+        with the exhaustive search. Value ``1`` means that network
+        will be trained in the main process. Defaults to ``1``.
+
+    search_index : PrototypeIndex or None
+        Index that will be used in order to find winning neurons
+        instead of computing distances to all of the neurons. Index
+        can miss winning neuron, which makes training and prediction
+        approximate, but for the large feature grids search becomes
+        much faster. Index works only with ``euclid`` and ``cos``
+        distances. Value ``None`` means that winning neurons will be
+        found with the exhaustive search. Defaults to ``None``.
+
     weight : array-like, Initializer or {{``init_pca``, ``sample_from_data``}}
         Neural network weights.
         Value defined manualy should have shape ``(n_inputs, n_outputs)``.
@@ -425,6 +666,13 @@ class SOFM(Kohonen):
         }
     )
 
+    training_mode = ChoiceProperty(
+        default='online', choices=['online', 'batch'])
+    n_jobs = IntProperty(default=1, minval=1)
+
+    search_index = Property(expected_type=PrototypeIndex, allow_none=True,
+                            default=None)
+
     learning_radius = IntProperty(default=0, minval=0)
     std = NumberProperty(minval=0, default=1)
 
@@ -466,10 +714,18 @@ class SOFM(Kohonen):
                                 len(self.features_grid),
                                 self.features_grid))
 
+        if self.search_index is not None and \
+                self.distance.name == 'dot_product':
+            raise ValueError("Search index cannot be used with the "
+                             "`dot_product` distance")
+
         is_pca_init = (
             isinstance(options.get('weight'), six.string_types) and
             options.get('weight') == 'init_pca')
 
+        self.neighbourhood_cache = {}
+        self.neighbourhood_cache_key = None
+
         self.initialized = False
         if not callable(self.weight):
             self.init_layers()
@@ -489,17 +745,42 @@ class SOFM(Kohonen):
         n_samples = input_data.shape[0]
         output = np.zeros((n_samples, self.n_outputs))
 
-        for i, input_row in enumerate(input_data):
-            output[i, :] = self.distance.func(
-                input_row.reshape(1, -1), self.weight)
+        for start in range(0, n_samples, self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            output[chunk] = self.distance.func(input_data[chunk], self.weight)
 
         return output
 
-    def update_indexes(self, layer_output):
-        neuron_winner = layer_output.argmax(axis=1).item(0)
-        winner_neuron_coords = np.unravel_index(
-            neuron_winner, self.features_grid)
+    def find_winners(self, input_data):
+        input_data = self.format_input_data(input_data)
 
+        n_samples = input_data.shape[0]
+        winners = np.zeros(n_samples, dtype=int)
+
+        if self.search_index is not None and self.distance.name == 'cosine':
+            # Weights are normalized, which means that the neuron with
+            # the largest cosine similarity is the closest one to the
+            # normalized sample
+            input_data = input_data / norm(input_data, axis=1, keepdims=True)
+
+        for start in range(0, n_samples, self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+
+            if self.search_index is None:
+                winners[chunk] = find_winners(
+                    input_data[chunk], self.weight, self.distance.name)
+            else:
+                indices, _ = self.search_index.query(
+                    input_data[chunk], self.weight.T)
+                winners[chunk] = indices[:, 0]
+
+        return winners
+
+    def decayed_parameters(self):
+        """
+        Returns learning radius, step and standard deviation
+        reduced according to the current epoch.
+        """
         learning_radius = self.learning_radius
         step = self.step
         std = self.std
@@ -516,6 +797,31 @@ class SOFM(Kohonen):
             std = decay_function(std, self.last_epoch,
                                  self.reduce_std_after)
 
+        return learning_radius, step, std
+
+    def find_neighbours(self, layer_output, learning_radius, std):
+        """
+        Finds neighbours of the winning neuron and their step scalers.
+
+        Parameters
+        ----------
+        layer_output : array-like
+            Output from the network for one sample.
+
+        learning_radius : int
+
+        std : float
+
+        Returns
+        -------
+        tuple
+            Vector that has non-zero values for the neighbours and
+            vector with step scaler for each output neuron.
+        """
+        neuron_winner = layer_output.argmax(axis=1).item(0)
+        winner_neuron_coords = np.unravel_index(
+            neuron_winner, self.features_grid)
+
         methods = self.grid_type
         output_grid = np.reshape(layer_output, self.features_grid)
 
@@ -529,11 +835,61 @@ class SOFM(Kohonen):
             center=winner_neuron_coords,
             std=std)
 
-        index_y, = np.nonzero(
-            output_with_neightbours.reshape(self.n_outputs))
+        return (
+            output_with_neightbours.reshape(self.n_outputs),
+            step_scaler.reshape(self.n_outputs),
+        )
+
+    def find_neighbourhood(self, neuron_winner, learning_radius, std):
+        """
+        Finds indices of the winning neuron's neighbours and their
+        step scalers. Neighbourhood depends only on the winning
+        neuron, learning radius and standard deviation. Found
+        neighbourhoods are stored in the cache, which gets cleared
+        every time learning radius or standard deviation decays.
+
+        Parameters
+        ----------
+        neuron_winner : int
+            Index of the winning neuron.
+
+        learning_radius : int
+
+        std : float
+
+        Returns
+        -------
+        tuple
+            Indices of the neighbour neurons and step scaler
+            for each of them.
+        """
+        cache_key = (learning_radius, std)
+
+        if self.neighbourhood_cache_key != cache_key:
+            self.neighbourhood_cache = {}
+            self.neighbourhood_cache_key = cache_key
+
+        if neuron_winner not in self.neighbourhood_cache:
+            layer_output = np.zeros((1, self.n_outputs))
+            layer_output[0, neuron_winner] = 1
+
+            neighbours, step_scaler = self.find_neighbours(
+                layer_output, learning_radius, std)
+
+            index_y, = np.nonzero(neighbours)
+            self.neighbourhood_cache[neuron_winner] = (
+                index_y, step_scaler[index_y])
+
+        return self.neighbourhood_cache[neuron_winner]
+
+    def update_indexes(self, layer_output):
+        learning_radius, step, std = self.decayed_parameters()
+        neuron_winner = layer_output.argmax(axis=1).item(0)
+
+        index_y, step_scaler = self.find_neighbourhood(
+            neuron_winner, learning_radius, std)
 
-        step_scaler = step_scaler.reshape(self.n_outputs)
-        return index_y, step * step_scaler[index_y]
+        return index_y, step * step_scaler
 
     def init_weights(self, input_train):
         if self.initialized:
@@ -544,6 +900,9 @@ class SOFM(Kohonen):
         self.weight = weight_initializer(input_train, self.features_grid)
         self.initialized = True
 
+        if self.search_index is not None:
+            self.search_index.reset()
+
         if self.distance.name == 'cosine':
             self.weight /= np.linalg.norm(self.weight, axis=0)
 
@@ -551,12 +910,38 @@ class SOFM(Kohonen):
         if not self.initialized:
             self.init_weights(input_train)
 
-        super(SOFM, self).train(input_train, summary=summary, epochs=epochs)
+        input_train = self.format_input_data(input_train)
+        is_parallel_training = (
+            self.training_mode == 'batch' and self.n_jobs > 1)
+
+        if not is_parallel_training or is_file_memmap(input_train):
+            super(SOFM, self).train(
+                input_train, summary=summary, epochs=epochs)
+            return
+
+        directory = tempfile.mkdtemp()
+
+        try:
+            data = np.memmap(
+                os.path.join(directory, 'input_train.dat'),
+                dtype=input_train.dtype, mode='w+', shape=input_train.shape)
+
+            data[:] = input_train
+            data.flush()
+
+            super(SOFM, self).train(data, summary=summary, epochs=epochs)
+
+        finally:
+            shutil.rmtree(directory)
 
     def train_epoch(self, input_train, target_train=None):
+        if self.training_mode == 'batch':
+            return self.train_batch_epoch(input_train)
+
         step = self.step
         predict = self.predict
         update_indexes = self.update_indexes
+        search_index = self.search_index
 
         error = 0
         for input_row in input_train:
@@ -573,4 +958,67 @@ class SOFM(Kohonen):
             self.weight[:, index_y] = updated_weights
             error += np.abs(distance).mean()
 
+            if search_index is not None:
+                search_index.register_updates()
+
         return error / len(input_train)
+
+    def train_batch_epoch(self, input_train):
+        """
+        Trains network over one epoch in the batch mode.
+
+        Parameters
+        ----------
+        input_train : array-like
+
+        Returns
+        -------
+        float
+            Average absolute distance between samples and
+            weights of their winning neurons.
+        """
+        n_outputs = self.n_outputs
+        learning_radius, _, std = self.decayed_parameters()
+
+        if self.n_jobs > 1 and is_file_memmap(input_train):
+            sum_per_winner, n_winners, error = parallel_batch_statistics(
+                input_train, self.weight, self.distance.name,
+                self.chunk_size, self.n_jobs)
+        else:
+            winners = self.find_winners(input_train)
+            sum_per_winner, n_winners, error = batch_statistics(
+                input_train, self.weight, winners)
+
+        # Each sample contributes to the neurons based on the
+        # neighbourhood of its winning neuron, which means that it's
+        # enough to find neighbourhood once per each winning neuron.
+        # Only neighbours are updated, since dense neuron to neuron
+        # kernel grows quadratically with the number of neurons.
+        numerator = np.zeros(sum_per_winner.shape)
+        denominator = np.zeros(n_outputs)
+
+        for neuron_winner in np.nonzero(n_winners)[0]:
+            index_y, step_scaler = self.find_neighbourhood(
+                neuron_winner, learning_radius, std)
+
+            numerator[index_y] += (
+                step_scaler[:, None] * sum_per_winner[neuron_winner])
+            denominator[index_y] += step_scaler * n_winners[neuron_winner]
+
+        error /= input_train.size
+
+        # Neurons that don't have any samples in their
+        # neighbourhood keep their weights unchanged
+        index_y, = np.nonzero(denominator)
+        updated_weights = (numerator[index_y].T / denominator[index_y])
+
+        if self.distance.name == 'cosine':
+            updated_weights /= np.linalg.norm(updated_weights, axis=0)
+
+        self.weight[:, index_y] = updated_weights
+
+        if self.search_index is not None:
+            # All of the weights have been updated at once
+            self.search_index.reset()
+
+        return error
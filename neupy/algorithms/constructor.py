@@ -1,20 +1,30 @@
 import abc
 import time
+import weakref
+import threading
 from functools import wraps
 
 import six
+import numpy as np
 import tensorflow as tf
+from tensorflow.python.util import nest
+from tensorflow.core.protobuf import config_pb2
 
+from neupy.environment import get_float_type
 from neupy import layers
 from neupy.layers.utils import preformat_layer_shape
 from neupy.layers.connections import LayerConnection, is_sequential
 from neupy.layers.connections.base import create_input_variables
+from neupy.layers.connections.checkpoint import checkpointed_output
 from neupy.exceptions import InvalidConnection
-from neupy.core.properties import FunctionWithOptionsProperty
+from neupy.core.properties import FunctionWithOptionsProperty, Property
 from neupy.algorithms.base import BaseNetwork
+from neupy.algorithms.utils import (is_batch_source, check_batch_source,
+                                    slice_values, assign_update)
 from neupy.utils import (
     AttributeKeyDict, asfloat, format_data, as_tuple,
-    tensorflow_session, initialize_uninitialized_variables
+    tensorflow_session, close_tensorflow_session, find_graph,
+    initialize_uninitialized_variables
 )
 from .gd import errors
 
@@ -22,6 +32,12 @@ from .gd import errors
 __all__ = ('ConstructibleNetwork',)
 
 
+# Algorithms that have been initialized in the same graph share
+# the session. Session is closed only after all of them were closed.
+graph_algorithms = weakref.WeakKeyDictionary()
+graph_algorithms_lock = threading.Lock()
+
+
 def does_layer_accept_1d_feature(layer):
     """
     Check if 1D feature values are valid for the layer.
@@ -96,6 +112,38 @@ class BaseAlgorithm(six.with_metaclass(abc.ABCMeta)):
     """
     Base class for algorithms implemeted in Tensorflow.
 
+    Notes
+    -----
+    Algorithm uses Tensorflow graph that was the default one
+    during the initialization. Networks that have been initialized
+    inside of the different graphs, for instance, with
+    ``with tf.Graph().as_default():``, have their own sessions
+    and can be trained at the same time from different threads.
+    Tensorflow has separate default graph per each thread, which
+    means that networks that were created without explicit graph
+    in the same thread share the graph and its session. It's
+    important for the thread pools, since each thread processes
+    multiple tasks. Layers have to be created inside of the same
+    graph as the network.
+
+    .. code-block:: python
+
+        import tensorflow as tf
+        from multiprocessing.pool import ThreadPool
+        from neupy import algorithms, layers
+
+        def train_network(data):
+            x_train, y_train = data
+
+            with tf.Graph().as_default():
+                network = algorithms.GradientDescent(
+                    [layers.Input(10), layers.Sigmoid(1)])
+
+            network.train(x_train, y_train, epochs=10)
+            return network
+
+        networks = ThreadPool(4).map(train_network, datasets)
+
     Attributes
     ----------
     variables : dict
@@ -103,6 +151,16 @@ class BaseAlgorithm(six.with_metaclass(abc.ABCMeta)):
 
     methods : dict
         Compiled Tensorflow functions.
+
+    tensorflow_graph : tf.Graph
+        Graph that contains all variables and functions.
+
+    float_type : str
+        Float type that was specified in the environment
+        during the initialization.
+
+    session : tf.Session
+        Session associated with the ``tensorflow_graph``.
     """
     def __init__(self, *args, **kwargs):
         super(BaseAlgorithm, self).__init__(*args, **kwargs)
@@ -115,10 +173,20 @@ class BaseAlgorithm(six.with_metaclass(abc.ABCMeta)):
 
         self.variables = AttributeKeyDict()
         self.methods = AttributeKeyDict()
+        self.tensorflow_graph = tf.get_default_graph()
+        self.float_type = get_float_type()
 
-        self.init_input_output_variables()
-        self.init_variables()
-        self.init_methods()
+        with graph_algorithms_lock:
+            algorithms = graph_algorithms.setdefault(
+                self.tensorflow_graph, weakref.WeakSet())
+            algorithms.add(self)
+
+        # Default graph is specific to each thread and we need to make
+        # sure that it won't change during the initialization.
+        with self.tensorflow_graph.as_default():
+            self.init_input_output_variables()
+            self.init_variables()
+            self.init_methods()
 
         finish_init_time = time.time()
         self.logs.message(
@@ -126,6 +194,25 @@ class BaseAlgorithm(six.with_metaclass(abc.ABCMeta)):
             "Initialization finished successfully. It took {:.2f} seconds"
             "".format(finish_init_time - start_init_time))
 
+    @property
+    def session(self):
+        return tensorflow_session(self.tensorflow_graph)
+
+    def close(self):
+        """
+        Closes session associated with the algorithm's graph and
+        releases all resources that it holds. Algorithm can't be used
+        after that. In case if other algorithms use the same graph,
+        session will be closed only after all of them were closed.
+        """
+        with graph_algorithms_lock:
+            algorithms = graph_algorithms.get(self.tensorflow_graph, set())
+            algorithms.discard(self)
+            graph_has_other_algorithms = bool(algorithms)
+
+        if not graph_has_other_algorithms:
+            close_tensorflow_session(self.tensorflow_graph)
+
     @abc.abstractmethod
     def init_input_output_variables(self):
         """
@@ -152,35 +239,77 @@ def function(inputs, outputs, updates=None, name=None):
     if updates is None:
         updates = []
 
-    session = tensorflow_session()
+    # Function might be defined for the network that has its own graph
+    graph = find_graph(inputs)
+    session = tensorflow_session(graph)
     tensorflow_updates = []
 
     # Ensure that all new values has been computed. Absence of these
     # checks might lead to the non-deterministic update behaviour.
-    new_values = [val[1] for val in updates if isinstance(val, (list, tuple))]
+    new_values = [
+        slice_values(val[1]) for val in updates
+        if isinstance(val, (list, tuple))
+    ]
 
     # Make sure that all outputs has been computed
-    with tf.control_dependencies(as_tuple(outputs, new_values)):
+    with graph.as_default(), \
+            tf.control_dependencies(nest.flatten(outputs) + new_values):
         for update in updates:
             if isinstance(update, (list, tuple)):
                 old_value, new_value = update
-                update = old_value.assign(new_value)
+                update = assign_update(old_value, new_value)
             tensorflow_updates.append(update)
 
         # Group variables in order to avoid output for the updates
         tensorflow_updates = tf.group(*tensorflow_updates)
 
+    # Callable has fixed feeds and fetches and it's compiled only once.
+    # It allows to avoid graph lookup and feed validation per each call
+    # that happens when we run ``session.run`` with ``feed_dict``.
+    # Public ``session.make_callable`` falls back to the ``session.run``
+    # in case if function has inputs.
+    fetches = nest.flatten(outputs)
+
+    callable_options = config_pb2.CallableOptions()
+    callable_options.feed.extend(variable.name for variable in inputs)
+    callable_options.fetch.extend(fetch.name for fetch in fetches)
+    callable_options.target.append(tensorflow_updates.name)
+
+    session_callable = session._make_callable_from_options(callable_options)
+    input_dtypes = [variable.dtype.as_numpy_dtype for variable in inputs]
+
     @wraps(function)
     def wrapper(*input_values):
-        feed_dict = dict(zip(inputs, input_values))
-        result, _ = session.run(
-            [outputs, tensorflow_updates],
-            feed_dict=feed_dict,
-        )
-        return result
+        # Unlike ``session.run``, callable doesn't convert inputs
+        input_values = [
+            np.asarray(value, dtype=dtype)
+            for value, dtype in zip(input_values, input_dtypes)
+        ]
+        results = session_callable(*input_values)
+        return nest.pack_sequence_as(outputs, results)
     return wrapper
 
 
+class CheckpointsProperty(Property):
+    """
+    Property that stores list of the checkpoint layers or
+    the number of layers between checkpoints.
+
+    Parameters
+    ----------
+    {Property.Parameters}
+    """
+    expected_type = (list, tuple, int)
+
+    def validate(self, value):
+        super(CheckpointsProperty, self).validate(value)
+
+        if isinstance(value, int) and value < 1:
+            raise ValueError(
+                "Property `{}` should be a positive integer, got {}"
+                "".format(self.name, value))
+
+
 class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
     """
     Class contains functionality that helps work with network that have
@@ -233,6 +362,18 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
             def custom_func(expected, predicted):
                 return expected - predicted
 
+    checkpoints : list, int or None
+        Layers which outputs will be stored for the gradient
+        computation. Outputs from the layers between checkpoints
+        will be recomputed during the backward pass, which reduces
+        memory usage during the training at cost of the additional
+        forward pass. Value can be a list of layers or layer names.
+        Integer value means that output from every n-th layer will be
+        stored. Square root from the number of layers is a good choice,
+        since memory usage grows with the square root from the number
+        of layers instead of the linear growth. Defaults to ``None``,
+        which means that outputs from all layers will be stored.
+
     {BaseNetwork.Parameters}
 
     Attributes
@@ -266,6 +407,7 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
         'binary_hinge': errors.binary_hinge,
         'categorical_hinge': errors.categorical_hinge,
     })
+    checkpoints = CheckpointsProperty(default=None, allow_none=True)
 
     def __init__(self, connection, *args, **kwargs):
         self.connection = clean_layers(connection)
@@ -289,7 +431,7 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
                 self.connection.input_layers
             ),
             network_output=tf.placeholder(
-                tf.float32,
+                get_float_type(),
                 name='network-output/from-layer-{}'.format(output_layer.name),
             ),
         )
@@ -298,7 +440,7 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
         network_inputs = self.variables.network_inputs
         network_output = self.variables.network_output
 
-        train_prediction = self.connection.output(*network_inputs)
+        train_prediction = self.training_output(*network_inputs)
         with self.connection.disable_training_state():
             prediction = self.connection.output(*network_inputs)
 
@@ -306,12 +448,12 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
             step=tf.Variable(
                 asfloat(self.step),
                 name='network/scalar-step',
-                dtype=tf.float32
+                dtype=get_float_type()
             ),
             epoch=tf.Variable(
                 asfloat(self.last_epoch),
                 name='network/scalar-epoch',
-                dtype=tf.float32
+                dtype=get_float_type()
             ),
 
             prediction_func=prediction,
@@ -321,6 +463,27 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
             validation_error_func=self.error(network_output, prediction),
         )
 
+    def training_output(self, *input_values):
+        """
+        Propagates input values through the network in the training
+        state. In case if checkpoints were specified, only outputs from
+        the checkpoint layers will be stored for the backward pass.
+
+        Parameters
+        ----------
+        *input_values
+            Inputs for each input layer.
+
+        Returns
+        -------
+        Tensorfow variable
+        """
+        if self.checkpoints is None:
+            return self.connection.output(*input_values)
+
+        return checkpointed_output(
+            self.connection, input_values, self.checkpoints)
+
     def init_methods(self):
         network_inputs = self.variables.network_inputs
         network_output = self.variables.network_output
@@ -331,6 +494,7 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
             for layer in self.layers:
                 training_updates.extend(layer.updates)
 
+        self.variables.training_updates = training_updates
         initialize_uninitialized_variables()
 
         self.methods.update(
@@ -374,16 +538,25 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
             Function returns formatted array.
         """
         input_layers = self.connection.input_layers
+        check_batch_source(input_data)
+
+        if is_batch_source(input_data):
+            raise TypeError(
+                "Algorithm {} cannot use batch source as an input. Batch "
+                "sources can be used only with algorithms that train "
+                "network using mini-batches.".format(self.class_name()))
 
         if not isinstance(input_data, (tuple, list)):
             input_layer = input_layers[0]
             is_feature1d = does_layer_accept_1d_feature(input_layer)
-            return format_data(input_data, is_feature1d)
+            return format_data(
+                input_data, is_feature1d, float_type=self.float_type)
 
         formated_data = []
         for input_to_layer, input_layer in zip(input_data, input_layers):
             is_feature1d = does_layer_accept_1d_feature(input_layer)
-            data = format_data(input_to_layer, is_feature1d)
+            data = format_data(
+                input_to_layer, is_feature1d, float_type=self.float_type)
             formated_data.append(data)
 
         return tuple(formated_data)
@@ -402,7 +575,7 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
         array-like or None
             Function returns formatted array.
         """
-        return format_data(target_data)
+        return format_data(target_data, float_type=self.float_type)
 
     def prediction_error(self, input_data, target_data):
         """
@@ -448,16 +621,28 @@ class ConstructibleNetwork(BaseAlgorithm, BaseNetwork):
             Current epoch number.
         """
         super(ConstructibleNetwork, self).on_epoch_start_update(epoch)
-        self.variables.epoch.load(epoch, tensorflow_session())
+        self.variables.epoch.load(epoch, self.session)
 
-    def train(self, input_train, target_train, input_test=None,
+    def train(self, input_train, target_train=None, input_test=None,
               target_test=None, *args, **kwargs):
         """
         Train neural network.
         """
+        check_batch_source(input_train)
+        check_batch_source(input_test)
+
+        if target_train is None and not is_batch_source(input_train):
+            raise ValueError("Target training samples are missed. They can "
+                             "be omitted only in case if input is a batch "
+                             "source that produces both inputs and targets.")
+
         is_test_data_partialy_missed = (
             (input_test is None and target_test is not None) or
-            (input_test is not None and target_test is None)
+            (
+                input_test is not None and
+                target_test is None and
+                not is_batch_source(input_test)
+            )
         )
 
         if is_test_data_partialy_missed:
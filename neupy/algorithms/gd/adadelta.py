@@ -1,6 +1,7 @@
 import tensorflow as tf
 
 from neupy.core.properties import ProperFractionProperty, NumberProperty
+from neupy.algorithms.utils import gather_rows, slice_values, with_indices
 from .base import GradientDescent
 
 
@@ -28,6 +29,12 @@ class Adadelta(GradientDescent):
 
     {GradientDescent.batch_size}
 
+    {GradientDescent.prefetch}
+
+    {GradientDescent.stage_data}
+
+    {GradientDescent.steps_per_call}
+
     {BaseGradientDescent.addons}
 
     {ConstructibleNetwork.connection}
@@ -77,34 +84,38 @@ class Adadelta(GradientDescent):
         epsilon = self.epsilon
 
         for layer, parameter, gradient in self.iter_params_and_grads():
-            prev_mean_squred_grad = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/prev-mean-squred-grad".format(parameter.op.name),
-                dtype=tf.float32,
-            )
-            prev_mean_squared_update = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/prev-mean-squred-update".format(parameter.op.name),
-                dtype=tf.float32,
-            )
+            prev_mean_squred_grad = self.init_parameter_state(
+                parameter, name="prev-mean-squred-grad")
+            prev_mean_squared_update = self.init_parameter_state(
+                parameter, name="prev-mean-squred-update")
+
+            prev_mean_squred_grad_rows = gather_rows(
+                prev_mean_squred_grad, gradient)
+            prev_mean_squared_update_rows = gather_rows(
+                prev_mean_squared_update, gradient)
+            parameter_rows = gather_rows(parameter, gradient)
+            gradient_values = slice_values(gradient)
 
             mean_squred_grad = (
-                self.decay * prev_mean_squred_grad +
-                (1 - self.decay) * gradient ** 2
+                self.decay * prev_mean_squred_grad_rows +
+                (1 - self.decay) * gradient_values ** 2
             )
-            parameter_delta = gradient * (
-                tf.sqrt(prev_mean_squared_update + epsilon) /
+            parameter_delta = gradient_values * (
+                tf.sqrt(prev_mean_squared_update_rows + epsilon) /
                 tf.sqrt(mean_squred_grad + epsilon)
             )
             mean_squared_update = (
-                self.decay * prev_mean_squared_update +
+                self.decay * prev_mean_squared_update_rows +
                 (1 - self.decay) * parameter_delta ** 2
             )
 
             updates.extend([
-                (prev_mean_squred_grad, mean_squred_grad),
-                (prev_mean_squared_update, mean_squared_update),
-                (parameter, parameter - step * parameter_delta),
+                (prev_mean_squred_grad,
+                 with_indices(mean_squred_grad, gradient)),
+                (prev_mean_squared_update,
+                 with_indices(mean_squared_update, gradient)),
+                (parameter, with_indices(
+                    parameter_rows - step * parameter_delta, gradient)),
             ])
 
         return updates
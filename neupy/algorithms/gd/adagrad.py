@@ -1,6 +1,7 @@
 import tensorflow as tf
 
 from neupy.core.properties import NumberProperty
+from neupy.algorithms.utils import gather_rows, slice_values, with_indices
 from .base import GradientDescent
 
 
@@ -52,19 +53,24 @@ class Adagrad(GradientDescent):
         step = self.variables.step
 
         for layer, parameter, gradient in self.iter_params_and_grads():
-            prev_mean_squred_grad = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/prev-mean-squred-grad".format(parameter.op.name),
-                dtype=tf.float32,
-            )
-
-            mean_squred_grad = prev_mean_squred_grad + gradient ** 2
-            parameter_delta = gradient / (
+            prev_mean_squred_grad = self.init_parameter_state(
+                parameter, name="prev-mean-squred-grad")
+
+            prev_mean_squred_grad_rows = gather_rows(
+                prev_mean_squred_grad, gradient)
+            parameter_rows = gather_rows(parameter, gradient)
+            gradient_values = slice_values(gradient)
+
+            mean_squred_grad = (
+                prev_mean_squred_grad_rows + gradient_values ** 2)
+            parameter_delta = gradient_values / (
                 tf.sqrt(mean_squred_grad + self.epsilon))
 
             updates.extend([
-                (prev_mean_squred_grad, mean_squred_grad),
-                (parameter, parameter - step * parameter_delta),
+                (prev_mean_squred_grad,
+                 with_indices(mean_squred_grad, gradient)),
+                (parameter, with_indices(
+                    parameter_rows - step * parameter_delta, gradient)),
             ])
 
         return updates
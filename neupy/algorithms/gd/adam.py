@@ -1,7 +1,9 @@
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy.utils import asfloat
 from neupy.core.properties import ProperFractionProperty, NumberProperty
+from neupy.algorithms.utils import gather_rows, slice_values, with_indices
 from .base import GradientDescent
 
 
@@ -30,6 +32,12 @@ class Adam(GradientDescent):
 
     {GradientDescent.batch_size}
 
+    {GradientDescent.prefetch}
+
+    {GradientDescent.stage_data}
+
+    {GradientDescent.steps_per_call}
+
     {BaseGradientDescent.addons}
 
     {ConstructibleNetwork.connection}
@@ -82,7 +90,7 @@ class Adam(GradientDescent):
         self.variables.iteration = tf.Variable(
             asfloat(1),
             name='iteration',
-            dtype=tf.float32,
+            dtype=get_float_type(),
         )
 
     def init_train_updates(self):
@@ -108,33 +116,33 @@ class Adam(GradientDescent):
         )
 
         for layer, parameter, gradient in self.iter_params_and_grads():
-            prev_first_moment = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/prev-first-moment".format(parameter.op.name),
-                dtype=tf.float32,
-            )
-            prev_second_moment = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/prev-second-moment".format(parameter.op.name),
-                dtype=tf.float32,
-            )
+            prev_first_moment = self.init_parameter_state(
+                parameter, name="prev-first-moment")
+            prev_second_moment = self.init_parameter_state(
+                parameter, name="prev-second-moment")
+
+            prev_first_moment_rows = gather_rows(prev_first_moment, gradient)
+            prev_second_moment_rows = gather_rows(prev_second_moment, gradient)
+            parameter_rows = gather_rows(parameter, gradient)
+            gradient_values = slice_values(gradient)
 
             first_moment = (
-                self.beta1 * prev_first_moment +
-                (1. - self.beta1) * gradient
+                self.beta1 * prev_first_moment_rows +
+                (1. - self.beta1) * gradient_values
             )
             second_moment = (
-                self.beta2 * prev_second_moment +
-                (1. - self.beta2) * gradient ** 2
+                self.beta2 * prev_second_moment_rows +
+                (1. - self.beta2) * gradient_values ** 2
             )
 
             parameter_delta = bias_correction * first_moment / (
                 tf.sqrt(second_moment) + self.epsilon)
 
             updates.extend([
-                (prev_first_moment, first_moment),
-                (prev_second_moment, second_moment),
-                (parameter, parameter - step * parameter_delta),
+                (prev_first_moment, with_indices(first_moment, gradient)),
+                (prev_second_moment, with_indices(second_moment, gradient)),
+                (parameter, with_indices(
+                    parameter_rows - step * parameter_delta, gradient)),
             ])
 
         updates.append((iteration, iteration + 1))
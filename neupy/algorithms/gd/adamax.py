@@ -1,7 +1,9 @@
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy.utils import asfloat
 from neupy.core.properties import ProperFractionProperty, NumberProperty
+from neupy.algorithms.utils import gather_rows, slice_values, with_indices
 from .base import GradientDescent
 
 
@@ -30,6 +32,12 @@ class Adamax(GradientDescent):
 
     {GradientDescent.batch_size}
 
+    {GradientDescent.prefetch}
+
+    {GradientDescent.stage_data}
+
+    {GradientDescent.steps_per_call}
+
     {BaseGradientDescent.addons}
 
     {ConstructibleNetwork.connection}
@@ -82,7 +90,7 @@ class Adamax(GradientDescent):
         self.variables.iteration = tf.Variable(
             asfloat(1),
             name='iteration',
-            dtype=tf.float32,
+            dtype=get_float_type(),
         )
 
     def init_train_updates(self):
@@ -96,30 +104,35 @@ class Adamax(GradientDescent):
         scale = step / (1. - beta1 ** iteration)
 
         for layer, parameter, gradient in self.iter_params_and_grads():
-            prev_first_moment = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/prev-first-moment".format(parameter.op.name),
-                dtype=tf.float32,
+            prev_first_moment = self.init_parameter_state(
+                parameter, name="prev-first-moment")
+            prev_weighted_inf_norm = self.init_parameter_state(
+                parameter, name="prev-weighted-inf-norm")
+
+            prev_first_moment_rows = gather_rows(prev_first_moment, gradient)
+            prev_weighted_inf_norm_rows = gather_rows(
+                prev_weighted_inf_norm, gradient)
+            parameter_rows = gather_rows(parameter, gradient)
+            gradient_values = slice_values(gradient)
+
+            first_moment = (
+                beta1 * prev_first_moment_rows +
+                (1. - beta1) * gradient_values
             )
-            prev_weighted_inf_norm = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/prev-weighted-inf-norm".format(parameter.op.name),
-                dtype=tf.float32,
-            )
-
-            first_moment = beta1 * prev_first_moment + (1. - beta1) * gradient
             weighted_inf_norm = tf.maximum(
-                beta2 * prev_weighted_inf_norm,
-                tf.abs(gradient),
+                beta2 * prev_weighted_inf_norm_rows,
+                tf.abs(gradient_values),
             )
 
             parameter_delta = (
                 scale * (first_moment / (weighted_inf_norm + self.epsilon)))
 
             updates.extend([
-                (prev_first_moment, first_moment),
-                (prev_weighted_inf_norm, weighted_inf_norm),
-                (parameter, parameter - parameter_delta),
+                (prev_first_moment, with_indices(first_moment, gradient)),
+                (prev_weighted_inf_norm,
+                 with_indices(weighted_inf_norm, gradient)),
+                (parameter, with_indices(
+                    parameter_rows - parameter_delta, gradient)),
             ])
 
         updates.append((iteration, iteration + 1))
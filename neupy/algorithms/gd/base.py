@@ -1,17 +1,28 @@
 from __future__ import division
 
 import math
+import threading
+from functools import partial
 
 import six
+from six.moves import queue
 import numpy as np
 import tensorflow as tf
 import progressbar
 
+from neupy.environment import get_float_type
 from neupy.core.config import Configurable
-from neupy.core.properties import Property, BoundedProperty
-from neupy.utils import as_tuple
-from neupy.layers.utils import iter_parameters
-from neupy.algorithms.constructor import ConstructibleNetwork
+from neupy.core.docs import shared_docs
+from neupy.core.properties import Property, BoundedProperty, IntProperty
+from neupy.utils import (as_tuple, AttributeKeyDict,
+                         read_variables_per_iteration)
+from neupy.layers.utils import iter_parameters, find_variables
+from neupy.algorithms.constructor import ConstructibleNetwork, function
+from neupy.algorithms.utils import (
+    BatchSource, is_batch_source, is_lazy_array, is_streaming_data,
+    merge_duplicate_slices, gather_rows, slice_values,
+    with_indices, assign_update,
+)
 from neupy.algorithms.gd import addon_types
 
 
@@ -26,6 +37,16 @@ class BaseGradientDescent(ConstructibleNetwork):
     ----------
     {ConstructibleNetwork.Parameters}
 
+    sparse_updates : bool
+        Parameters that were used in the gather operation, like
+        weight matrix of the ``Embedding`` layer, get sparse gradient.
+        In case if value is equal to ``True``, only rows that appear
+        in the gradient and their optimizer states will be updated.
+        Rows that don't appear in the mini-batch keep their states,
+        which means that momentum and decay won't be applied to them.
+        Sparse gradients will be converted to dense in case if value
+        is equal to ``False``. Defaults to ``False``.
+
     addons : list or None
         The list of addon algortihms. ``None`` by default.
         If this option is not empty it will generate new class which
@@ -42,6 +63,7 @@ class BaseGradientDescent(ConstructibleNetwork):
     """
     supported_addon_types = addon_types.keys()
 
+    sparse_updates = Property(default=False, expected_type=bool)
     addons = Property(default=None, expected_type=list)
 
     # TODO: The arguments that have default value equal to `None`
@@ -105,21 +127,68 @@ class BaseGradientDescent(ConstructibleNetwork):
             layers.append(layer)
             parameters.append(parameter)
 
-        gradients = tf.gradients(self.variables.error_func, parameters)
+        # Conversion makes sure that gradients will be computed with
+        # respect to the values that were read on the current iteration
+        # in case if updates are defined inside of the loop.
+        gradients = tf.gradients(
+            self.variables.error_func,
+            [tf.convert_to_tensor(parameter) for parameter in parameters],
+        )
         iterator = zip(layers, parameters, gradients)
 
         for layer, parameter, gradient in iterator:
-            yield layer, parameter, gradient
+            if isinstance(gradient, tf.IndexedSlices) and (
+                    not self.sparse_updates):
+                gradient = tf.convert_to_tensor(gradient)
+
+            # Gradient for the parameters that were used in the gather
+            # operation, like embedding matrix, is sparse. Each row has
+            # to be unique in order to update only rows that were used.
+            yield layer, parameter, merge_duplicate_slices(gradient)
 
     def init_train_updates(self):
         updates = []
         step = self.variables.step
 
         for layer, parameter, gradient in self.iter_params_and_grads():
-            updates.append((parameter, parameter - step * gradient))
+            new_value = (
+                gather_rows(parameter, gradient) -
+                step * slice_values(gradient))
+
+            updates.append((parameter, with_indices(new_value, gradient)))
 
         return updates
 
+    def init_parameter_state(self, parameter, name):
+        """
+        Initialize variable that stores algorithm's state associated
+        with the parameter, for instance, previous gradient. Variable
+        has the same shape as the parameter and initialized with
+        zeros. Variable will be created only once and each next
+        call returns the same variable.
+
+        Parameters
+        ----------
+        parameter : Variable
+        name : str
+            Name of the state.
+
+        Returns
+        -------
+        Variable
+        """
+        states = self.variables.setdefault('parameter_states', {})
+        full_name = "{}/{}".format(parameter.op.name, name)
+
+        if full_name not in states:
+            states[full_name] = tf.Variable(
+                tf.zeros(parameter.shape, dtype=get_float_type()),
+                name=full_name,
+                dtype=get_float_type(),
+            )
+
+        return states[full_name]
+
     def class_name(self):
         return self.main_class.__name__
 
@@ -218,9 +287,75 @@ def cannot_divide_into_batches(data, batch_size):
     return batch_size is None or n_samples <= batch_size
 
 
+def prefetch_batches(batches, n_batches):
+    """
+    Iterates over batches that has been prepared in the background
+    thread. Thread prepares next batches while the current one is
+    being processed. Number of prepared batches stored in memory
+    is bounded.
+
+    Parameters
+    ----------
+    batches : iterable
+        Iterable object that produces batches.
+
+    n_batches : int
+        Maximum number of batches prepared in advance.
+
+    Yields
+    ------
+    object
+        Batches in the same order as they were produced by
+        the ``batches`` iterable.
+    """
+    batch_queue = queue.Queue(maxsize=n_batches)
+    stop_event = threading.Event()
+    end_of_batches = object()
+
+    def put(item):
+        # Timeout allows to stop producer in case if iteration
+        # has been interrupted, for instance, by an exception
+        while not stop_event.is_set():
+            try:
+                batch_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def producer():
+        try:
+            for batch in batches:
+                if not put((batch, None)):
+                    return
+            put((end_of_batches, None))
+
+        except Exception as exception:
+            put((None, exception))
+
+    thread = threading.Thread(target=producer)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            batch, exception = batch_queue.get()
+
+            if exception is not None:
+                raise exception
+
+            if batch is end_of_batches:
+                break
+
+            yield batch
+    finally:
+        stop_event.set()
+        thread.join()
+
+
 def apply_batches(function, arguments, batch_size, description='',
                   show_progressbar=False, show_error_output=True,
-                  scalar_output=True):
+                  scalar_output=True, prefetch=0):
     """
     Apply batches to a specified function.
 
@@ -252,6 +387,11 @@ def apply_batches(function, arguments, batch_size, description='',
         Error will be related to the last epoch.
         Defaults to ``True``.
 
+    prefetch : int
+        Number of batches that will be prepared in the background
+        thread while function processes current batch. Value ``0``
+        disables prefetching. Defaults to ``0``.
+
     Returns
     -------
     list
@@ -288,9 +428,16 @@ def apply_batches(function, arguments, batch_size, description='',
     else:
         bar = progressbar.NullBar()
 
+    batches = (
+        [argument[batch] for argument in arguments]
+        for batch in batch_iterator
+    )
+
+    if prefetch:
+        batches = prefetch_batches(batches, prefetch)
+
     outputs = []
-    for i, batch in enumerate(batch_iterator):
-        sliced_arguments = [argument[batch] for argument in arguments]
+    for i, sliced_arguments in enumerate(batches):
         output = function(*sliced_arguments)
 
         if scalar_output:
@@ -314,7 +461,95 @@ def apply_batches(function, arguments, batch_size, description='',
     return outputs
 
 
-def average_batch_errors(errors, n_samples, batch_size):
+@shared_docs(apply_batches)
+def apply_batch_source(function, batch_source, description='',
+                       show_progressbar=False, show_error_output=True,
+                       scalar_output=True, prefetch=0):
+    """
+    Apply batches produced by the source to a specified function.
+    Number of batches and samples might be unknown in advance.
+
+    Parameters
+    ----------
+    function : func
+        Function that accepts one or more positional arguments.
+
+    batch_source : callable
+        Function that returns iterator over the batches. Each batch
+        should be a tuple of arguments that will be provided to
+        the function specified in the ``function`` argument.
+
+    {apply_batches.description}
+
+    {apply_batches.show_progressbar}
+
+    {apply_batches.show_error_output}
+
+    {apply_batches.prefetch}
+
+    Returns
+    -------
+    tuple
+        List of function outputs and list that contains
+        number of samples per each batch.
+    """
+    if not scalar_output and show_error_output:
+        raise ValueError("Cannot show error when output isn't scalar")
+
+    if show_progressbar:
+        widgets = [
+            progressbar.Timer(format='Time: %(elapsed)s'), ' |',
+            ' Batches: ', progressbar.Counter(),
+        ]
+
+        if show_error_output:
+            widgets.extend([' | ', progressbar.DynamicMessage('error')])
+
+        bar = progressbar.ProgressBar(
+            widgets=widgets,
+            max_value=progressbar.UnknownLength,
+            poll_interval=0.1,
+        )
+        bar.update(0)
+    else:
+        bar = progressbar.NullBar()
+
+    batches = batch_source()
+
+    if prefetch:
+        batches = prefetch_batches(batches, prefetch)
+
+    outputs, batch_sizes = [], []
+    for i, arguments in enumerate(batches):
+        output = function(*arguments)
+
+        if scalar_output:
+            output = np.atleast_1d(output)
+
+            if output.size > 1:
+                raise ValueError(
+                    "Cannot convert output from the batch, "
+                    "because it has more than one output value")
+
+            output = output.item(0)
+
+        outputs.append(output)
+        batch_sizes.append(len(arguments[0]))
+
+        if show_error_output:
+            bar.update(i, error=output)
+        else:
+            bar.update(i)
+
+    if not outputs:
+        raise ValueError("Batch source hasn't produced any batches")
+
+    bar.fd.write('\r' + ' ' * bar.term_width + '\r')
+    return outputs, batch_sizes
+
+
+def average_batch_errors(errors, n_samples=None, batch_size=None,
+                         batch_sizes=None):
     """
     Computes average error per sample.
 
@@ -324,17 +559,28 @@ def average_batch_errors(errors, n_samples, batch_size):
         List of errors where each element is a average error
         per batch.
 
-    n_samples : int
-        Number of samples in the dataset.
+    n_samples : int or None
+        Number of samples in the dataset. Can be ``None`` when
+        ``batch_sizes`` specified.
 
     batch_size : int
         Mini-batch size.
 
+    batch_sizes : list or None
+        Number of samples per each batch. Useful in case if
+        number of samples in the dataset is unknown in advance.
+        Defaults to ``None``.
+
     Returns
     -------
     float
         Average error per sample.
     """
+    if batch_sizes is not None:
+        total_error = sum(
+            error * size for error, size in zip(errors, batch_sizes))
+        return total_error / sum(batch_sizes)
+
     if batch_size is None:
         return errors[0]
 
@@ -369,12 +615,22 @@ class MinibatchTrainingMixin(Configurable):
         to one of the values from the list (like ``full``) then
         it's just a batch that equal to number of samples.
         Defaults to ``128``.
+
+    prefetch : int
+        Number of mini-batches that will be sliced and formatted
+        in the background thread while network processes current
+        mini-batch. Value ``0`` disables prefetching. Prefetching
+        is useful when data preparation takes noticeable amount of
+        time compared to the computations per mini-batch, for
+        instance, for small networks or data stored on disk.
+        Defaults to ``0``.
     """
     batch_size = BatchSizeProperty(default=128)
+    prefetch = IntProperty(default=0, minval=0)
 
     def apply_batches(self, function, input_data, arguments=(), description='',
                       show_progressbar=None, show_error_output=False,
-                      scalar_output=True):
+                      scalar_output=True, batch_size=None):
         """
         Apply function per each mini-batch.
 
@@ -406,6 +662,10 @@ class MinibatchTrainingMixin(Configurable):
         scalar_output : bool
             ``True`` means that we expect scalar value per each
 
+        batch_size : int or None
+            Mini-batch size. ``None`` means that network's
+            ``batch_size`` will be used. Defaults to ``None``.
+
         Returns
         -------
         list
@@ -414,7 +674,10 @@ class MinibatchTrainingMixin(Configurable):
         """
         arguments = as_tuple(input_data, arguments)
 
-        if cannot_divide_into_batches(input_data, self.batch_size):
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        if cannot_divide_into_batches(input_data, batch_size):
             output = function(*arguments)
             if scalar_output:
                 output = np.atleast_1d(output).item(0)
@@ -430,12 +693,69 @@ class MinibatchTrainingMixin(Configurable):
         return apply_batches(
             function=function,
             arguments=arguments,
-            batch_size=self.batch_size,
+            batch_size=batch_size,
 
             description=description,
             show_progressbar=show_progressbar,
             show_error_output=show_error_output,
             scalar_output=scalar_output,
+            prefetch=self.prefetch,
+        )
+
+    def apply_batch_source(self, function, batch_source, description='',
+                           show_progressbar=None, show_error_output=False,
+                           scalar_output=True):
+        """
+        Apply function per each mini-batch produced by the source.
+
+        Parameters
+        ----------
+        function : callable
+
+        batch_source : callable
+            Function that returns iterator over the batches. Each
+            batch is a tuple of arguments to the function.
+
+        description : str
+            Some description for the progressbar. Defaults to ``''``.
+
+        show_progressbar : None or bool
+            ``True``/``False`` will show/hide progressbar. If value
+            is equal to ``None`` than progressbar will be visible in
+            case if network expects to see logging after each
+            training epoch.
+
+        show_error_output : bool
+            Assumes that outputs from the function errors.
+            ``True`` will show information in the progressbar.
+            Error will be related to the last epoch.
+
+        scalar_output : bool
+            ``True`` means that we expect scalar value per each
+            batch.
+
+        Returns
+        -------
+        tuple
+            List of outputs from the function and list that
+            contains number of samples per each batch.
+        """
+        if show_progressbar is None:
+            show_progressbar = (
+                self.training and
+                self.training.show_epoch == 1 and
+                self.logs.enable
+            )
+
+        return apply_batch_source(
+            function=function,
+            batch_source=batch_source,
+
+            description=description,
+            show_progressbar=show_progressbar,
+            show_error_output=show_error_output,
+            scalar_output=scalar_output,
+            prefetch=self.prefetch,
         )
 
 
@@ -458,6 +778,61 @@ def count_samples(input_data):
     return len(input_data)
 
 
+def create_staged_variable(dtype, shape, name):
+    """
+    Creates variable that can store data that has the
+    specified type and shape. Number of samples in the variable
+    can change every time new data has been loaded.
+
+    Parameters
+    ----------
+    dtype : Tensorflow data type
+
+    shape : TensorShape
+        Shape of the data. Number of samples and other
+        dimensions can be unknown.
+
+    name : str
+        Variable's name.
+
+    Returns
+    -------
+    Tensorflow variable
+    """
+    # Empty arrays allow to avoid initialization with any
+    # data and placeholder allows to load array with
+    # any shape into the variable.
+    n_dimensions = 1 if shape.ndims is None else shape.ndims
+    empty_array = tf.zeros([0] * n_dimensions, dtype=dtype)
+
+    return tf.Variable(
+        tf.placeholder_with_default(empty_array, shape=None),
+        name=name,
+        dtype=dtype,
+        trainable=False,
+        validate_shape=False,
+    )
+
+
+def is_same_data(data, other_data):
+    """
+    Checks whether two objects refer to the same data.
+
+    Parameters
+    ----------
+    data : array-like, list/tuple of array-like or None
+
+    other_data : array-like, list/tuple of array-like or None
+
+    Returns
+    -------
+    bool
+    """
+    if data is None or other_data is None:
+        return False
+    return as_tuple(data)[0] is as_tuple(other_data)[0]
+
+
 class GradientDescent(BaseGradientDescent, MinibatchTrainingMixin):
     """
     Mini-batch Gradient Descent algorithm.
@@ -466,6 +841,25 @@ class GradientDescent(BaseGradientDescent, MinibatchTrainingMixin):
     ----------
     {MinibatchTrainingMixin.Parameters}
 
+    stage_data : bool
+        ``True`` means that training and validation data will
+        be loaded into the Tensorflow variables once per each
+        ``train`` method call. Data shuffling and mini-batch
+        slicing will be done inside of the Tensorflow graph,
+        which allows to avoid copying of each mini-batch to the
+        Tensorflow runtime. Option is useful only in case if
+        data fits in memory. Streaming data won't be staged.
+        Defaults to ``False``.
+
+    steps_per_call : int
+        Number of mini-batch updates that will be applied per one
+        Tensorflow call during the training. Updates are applied one
+        after another inside of the ``tf.while_loop`` and each of them
+        uses its own mini-batch, which means that training is the same
+        as for the value ``1``. Larger values reduce overhead from the
+        Python side, which is noticeable for small networks.
+        Option doesn't work for the streaming data. Defaults to ``1``.
+
     {BaseGradientDescent.Parameters}
 
     Attributes
@@ -489,24 +883,530 @@ class GradientDescent(BaseGradientDescent, MinibatchTrainingMixin):
     ... )
     >>> mgdnet.train(x_train, y_train)
     """
+    stage_data = Property(default=False, expected_type=bool)
+    steps_per_call = IntProperty(default=1, minval=1)
+    staged = None
+
+    def init_input_output_variables(self):
+        super(GradientDescent, self).init_input_output_variables()
+
+        if self.stage_data:
+            self.init_staged_data_variables()
+
+    def init_staged_data_variables(self):
+        """
+        Initialize variables that store training and validation
+        data inside of the Tensorflow graph. Validation samples
+        are stored after the training samples. By default network
+        takes mini-batch from the staged data, but input and target
+        can still be fed directly.
+        """
+        variables = self.variables
+        placeholders = variables.network_inputs + [variables.network_output]
+
+        with tf.name_scope('staged-data'):
+            staged_data = [
+                create_staged_variable(
+                    placeholder.dtype, placeholder.shape, name='samples')
+                for placeholder in placeholders
+            ]
+            staged_indices = create_staged_variable(
+                tf.int32, tf.TensorShape([None]), name='indices')
+
+            n_train_samples = tf.Variable(
+                0, name='n-train-samples', dtype=tf.int32, trainable=False)
+            n_samples = tf.shape(staged_data[0])[0]
+
+            batch_start = tf.placeholder(tf.int32, shape=(), name='start')
+            batch_end = tf.placeholder(tf.int32, shape=(), name='end')
+            batch_indices = staged_indices[batch_start:batch_end]
+
+            # Only training samples have to be shuffled. Validation
+            # samples are always at the end.
+            shuffled_indices = tf.concat([
+                tf.random_shuffle(tf.range(n_train_samples)),
+                tf.range(n_train_samples, n_samples),
+            ], axis=0)
+
+            batches = []
+            for placeholder, data in zip(placeholders, staged_data):
+                batch = tf.placeholder_with_default(
+                    tf.gather(data, batch_indices),
+                    shape=placeholder.shape,
+                    name='batch',
+                )
+                batches.append(batch)
+
+        variables.update(
+            network_inputs=batches[:-1],
+            network_output=batches[-1],
+
+            staged_data=staged_data,
+            n_staged_train_samples=n_train_samples,
+            staged_batch_start=batch_start,
+            staged_batch_end=batch_end,
+
+            reset_staged_indices=tf.assign(
+                staged_indices, tf.range(n_samples), validate_shape=False),
+            shuffle_staged_indices=tf.assign(
+                staged_indices, shuffled_indices, validate_shape=False),
+        )
+
+    def init_methods(self):
+        super(GradientDescent, self).init_methods()
+
+        if self.stage_data:
+            variables = self.variables
+            batch_bounds = [
+                variables.staged_batch_start,
+                variables.staged_batch_end,
+            ]
+
+            self.methods.update(
+                staged_train_epoch=function(
+                    inputs=batch_bounds,
+                    outputs=variables.error_func,
+                    updates=variables.training_updates,
+                    name='network/func-staged-train-epoch',
+                ),
+                staged_prediction_error=function(
+                    inputs=batch_bounds,
+                    outputs=variables.validation_error_func,
+                    name='network/func-staged-prediction-error',
+                ),
+            )
+
+        if self.steps_per_call > 1:
+            self.init_fused_train_steps()
+
+    def init_fused_train_steps(self):
+        """
+        Initialize functions that apply multiple training updates
+        per one call. Function accepts mini-batch size and data that
+        contains samples for all of the updates. Data is divided
+        into mini-batches inside of the Tensorflow graph. Function
+        returns training error per each update.
+        """
+        variables = self.variables
+        network_inputs = variables.network_inputs
+        network_output = variables.network_output
+
+        # Parameters of the network and variables that store
+        # algorithm's state have to be read again on each step
+        loop_variables = find_variables(self.layers, only_trainable=False)
+        loop_variables.extend(variables.get('parameter_states', {}).values())
+        loop_variables.extend(
+            value for value in variables.values()
+            if isinstance(value, tf.Variable))
+
+        with tf.name_scope('fused-training-updates'):
+            batch_size = tf.placeholder(tf.int32, shape=(), name='batch-size')
+            n_samples = tf.shape(network_inputs[0])[0]
+            n_steps = (n_samples + batch_size - 1) // batch_size
+
+            def train_step(step, errors):
+                start = step * batch_size
+                input_batches = [
+                    value[start:start + batch_size] for value in network_inputs
+                ]
+                target_batch = network_output[start:start + batch_size]
+
+                error_func = variables.error_func
+                layer_updates = [layer.updates for layer in self.layers]
+
+                # Each step has to see parameters updated by the
+                # previous step. New step value is computed only after
+                # all of the updates has been applied.
+                with read_variables_per_iteration(loop_variables, [step]):
+                    try:
+                        prediction = self.training_output(*input_batches)
+                        error = self.error(target_batch, prediction)
+
+                        # Updates are defined with respect to the
+                        # error of the current mini-batch.
+                        variables.error_func = error
+                        updates = self.init_train_updates()
+
+                        for layer in self.layers:
+                            updates.extend(layer.updates)
+
+                    finally:
+                        variables.error_func = error_func
+
+                        for layer, updates_ in zip(self.layers, layer_updates):
+                            layer.updates = updates_
+
+                new_values = [
+                    slice_values(update[1]) for update in updates
+                    if isinstance(update, (list, tuple))
+                ]
+                assign_ops = []
+
+                with tf.control_dependencies([error] + new_values):
+                    for update in updates:
+                        if isinstance(update, (list, tuple)):
+                            old_value, new_value = update
+                            update = assign_update(old_value, new_value)
+                        assign_ops.append(update)
+
+                with tf.control_dependencies(assign_ops):
+                    return step + 1, errors.write(step, error)
+
+            _, errors = tf.while_loop(
+                cond=lambda step, errors: step < n_steps,
+                body=train_step,
+                loop_vars=[
+                    tf.constant(0),
+                    tf.TensorArray(get_float_type(), size=n_steps),
+                ],
+                # Steps can't be applied in parallel, since each
+                # of them depends on the previous one
+                parallel_iterations=1,
+            )
+            errors = errors.stack()
+
+        self.methods.fused_train_epoch = function(
+            inputs=[batch_size] + network_inputs + [network_output],
+            outputs=errors,
+            name='network/func-fused-train-epoch',
+        )
+
+        if self.stage_data:
+            self.methods.staged_fused_train_epoch = function(
+                inputs=[
+                    batch_size,
+                    variables.staged_batch_start,
+                    variables.staged_batch_end,
+                ],
+                outputs=errors,
+                name='network/func-staged-fused-train-epoch',
+            )
+
+    def load_staged_data(self, input_train, target_train,
+                         input_test=None, target_test=None):
+        """
+        Loads training and validation data into the Tensorflow
+        variables.
+
+        Parameters
+        ----------
+        input_train : array-like or list of array-like
+        target_train : array-like
+        input_test : array-like, list of array-like or None
+        target_test : array-like or None
+        """
+        session = self.session
+        variables = self.variables
+
+        train_data = as_tuple(input_train, target_train)
+
+        if input_test is None:
+            test_data = [None] * len(variables.staged_data)
+        else:
+            test_data = as_tuple(input_test, target_test)
+
+        for data, train, test in zip(variables.staged_data,
+                                     train_data, test_data):
+            if test is not None:
+                train = np.concatenate([train, test], axis=0)
+            data.load(train, session)
+
+        variables.n_staged_train_samples.load(len(train_data[0]), session)
+        session.run(variables.reset_staged_indices)
+
+        self.staged = AttributeKeyDict(
+            input_train=input_train,
+            input_test=input_test,
+            n_train_samples=len(train_data[0]),
+            n_test_samples=0 if input_test is None else len(test_data[0]),
+        )
+
+    def release_staged_data(self):
+        """
+        Removes all staged data from the Tensorflow variables.
+        """
+        session = self.session
+        variables = self.variables
+
+        for data in variables.staged_data:
+            dtype = data.dtype.base_dtype.as_numpy_dtype
+            data.load(np.zeros(0, dtype=dtype), session)
+
+        variables.n_staged_train_samples.load(0, session)
+        session.run(variables.reset_staged_indices)
+
+        self.staged = None
+
+    def apply_staged_batches(self, function, offset, n_samples, **kwargs):
+        """
+        Apply function per each mini-batch of the staged data.
+        Batches are the same as for the arrays with ``n_samples``
+        samples.
+
+        Parameters
+        ----------
+        function : callable
+            Function that accepts position of the first sample
+            in the batch and position after the last one.
+
+        offset : int
+            Position of the first sample in the staged data.
+
+        n_samples : int
+            Number of samples.
+
+        **kwargs
+            Additional arguments to the ``apply_batches`` method.
+
+        Returns
+        -------
+        list
+            List of outputs from the function.
+        """
+        def apply_to_batch(positions):
+            return function(positions[0], positions[-1] + 1)
+
+        return self.apply_batches(
+            function=apply_to_batch,
+            input_data=np.arange(offset, offset + n_samples),
+            **kwargs
+        )
+
+    def train(self, input_train, target_train=None, input_test=None,
+              target_test=None, *args, **kwargs):
+        can_stage_data = (
+            self.stage_data and
+            target_train is not None and
+            not is_streaming_data(input_train)
+        )
 
-    def train_epoch(self, input_train, target_train):
+        if not can_stage_data:
+            return super(GradientDescent, self).train(
+                input_train, target_train, input_test, target_test,
+                *args, **kwargs)
+
+        input_train = self.format_input_data(input_train)
+        target_train = self.format_target_data(target_train)
+
+        if input_test is not None and not is_streaming_data(input_test):
+            input_test = self.format_input_data(input_test)
+            target_test = self.format_target_data(target_test)
+            self.load_staged_data(
+                input_train, target_train, input_test, target_test)
+        else:
+            self.load_staged_data(input_train, target_train)
+
+        try:
+            return super(GradientDescent, self).train(
+                input_train, target_train, input_test, target_test,
+                *args, **kwargs)
+        finally:
+            self.release_staged_data()
+
+    def shuffle_training_data(self, input_train, target_train=None):
+        if self.staged is not None:
+            # Staged samples are shuffled inside of the graph
+            # and the data in memory stays the same
+            self.session.run(self.variables.shuffle_staged_indices)
+            return input_train, target_train
+
+        return super(GradientDescent, self).shuffle_training_data(
+            input_train, target_train)
+
+    def format_input_data(self, input_data):
+        # Streaming data will be formatted batch by batch
+        if is_streaming_data(input_data):
+            return input_data
+        return super(GradientDescent, self).format_input_data(input_data)
+
+    def format_target_data(self, target_data):
+        if is_lazy_array(target_data):
+            return target_data
+        return super(GradientDescent, self).format_target_data(target_data)
+
+    def format_batch(self, batch):
+        """
+        Format batch produced by the batch source.
+
+        Parameters
+        ----------
+        batch : tuple or array-like
+            Inputs for each input layer followed by the
+            target. Target can be omitted.
+
+        Returns
+        -------
+        tuple
+            Formatted arguments for the Tensorflow functions.
+        """
+        if not isinstance(batch, tuple):
+            batch = (batch,)
+
+        n_inputs = len(self.connection.input_layers)
+        input_data, target_data = batch[:n_inputs], batch[n_inputs:]
+
+        if len(input_data) == 1:
+            input_data = input_data[0]
+
+        input_data = super(GradientDescent, self).format_input_data(
+            input_data)
+
+        if not target_data:
+            return as_tuple(input_data)
+
+        target_data = super(GradientDescent, self).format_target_data(
+            target_data[0])
+
+        return as_tuple(input_data, target_data)
+
+    def create_batch_source(self, input_data, target_data=None,
+                            shuffle_data=False):
+        """
+        Creates batch source from the streaming data. Memory
+        required to process data from the source is bounded
+        by the size of one mini-batch.
+
+        Parameters
+        ----------
+        input_data : BatchSource, array-like or list of array-like
+            Batch source or arrays stored outside of the memory,
+            like ``numpy.memmap`` or HDF5 dataset.
+
+        target_data : array-like or None
+            Should be ``None`` when input is a batch source.
+
+        shuffle_data : bool
+            Shuffles order of the batches produced from the arrays.
+            Samples inside of the batch stay in the same order which
+            allows to read them from the disk sequentially.
+            Defaults to ``False``.
+
+        Returns
+        -------
+        BatchSource
+            Source that produces formatted batches.
+        """
+        format_batch = self.format_batch
+
+        if is_batch_source(input_data):
+            if target_data is not None:
+                raise ValueError("Target data should be produced by the "
+                                 "batch source together with input data")
+
+            def batch_source():
+                for batch in input_data():
+                    yield format_batch(batch)
+
+            return BatchSource(batch_source)
+
+        arguments = [arg for arg in as_tuple(input_data, target_data)
+                     if arg is not None]
+
+        n_samples = len(arguments[0])
+        batch_size = self.batch_size or n_samples
+
+        def batch_source():
+            batches = list(iter_batches(n_samples, batch_size))
+
+            if shuffle_data:
+                np.random.shuffle(batches)
+
+            for batch in batches:
+                yield format_batch(tuple(arg[batch] for arg in arguments))
+
+        return BatchSource(batch_source)
+
+    def train_epoch(self, input_train, target_train=None):
         """
         Train one epoch.
 
         Parameters
         ----------
-        input_train : array-like
-            Training input dataset.
+        input_train : array-like or BatchSource
+            Training input dataset or batch source.
 
-        target_train : array-like
-            Training target dataset.
+        target_train : array-like or None
+            Training target dataset. Should be ``None`` when
+            input is a batch source.
 
         Returns
         -------
         float
             Training error.
         """
+        staged = self.staged
+        use_fused_steps = (
+            self.steps_per_call > 1 and
+            self.batch_size is not None
+        )
+
+        if use_fused_steps:
+            # Each call of the fused function returns errors per
+            # each mini-batch and errors can't be displayed.
+            fused_options = dict(
+                batch_size=self.steps_per_call * self.batch_size,
+                description='Training batches',
+                show_error_output=False,
+                scalar_output=False,
+            )
+
+        if staged is not None and is_same_data(input_train,
+                                               staged.input_train):
+            if use_fused_steps:
+                errors = self.apply_staged_batches(
+                    function=partial(
+                        self.methods.staged_fused_train_epoch,
+                        self.batch_size),
+                    offset=0,
+                    n_samples=staged.n_train_samples,
+                    **fused_options
+                )
+                return average_batch_errors(
+                    np.concatenate(errors),
+                    n_samples=staged.n_train_samples,
+                    batch_size=self.batch_size,
+                )
+
+            errors = self.apply_staged_batches(
+                function=self.methods.staged_train_epoch,
+                offset=0,
+                n_samples=staged.n_train_samples,
+
+                description='Training batches',
+                show_error_output=True,
+            )
+            return average_batch_errors(
+                errors,
+                n_samples=staged.n_train_samples,
+                batch_size=self.batch_size,
+            )
+
+        if is_streaming_data(input_train):
+            errors, batch_sizes = self.apply_batch_source(
+                function=self.methods.train_epoch,
+                batch_source=self.create_batch_source(
+                    input_train, target_train,
+                    shuffle_data=self.shuffle_data),
+
+                description='Training batches',
+                show_error_output=True,
+            )
+            return average_batch_errors(errors, batch_sizes=batch_sizes)
+
+        if use_fused_steps:
+            errors = self.apply_batches(
+                function=partial(
+                    self.methods.fused_train_epoch, self.batch_size),
+                input_data=input_train,
+                arguments=as_tuple(target_train),
+                **fused_options
+            )
+            return average_batch_errors(
+                np.concatenate(errors),
+                n_samples=count_samples(input_train),
+                batch_size=self.batch_size,
+            )
+
         errors = self.apply_batches(
             function=self.methods.train_epoch,
             input_data=input_train,
@@ -521,24 +1421,53 @@ class GradientDescent(BaseGradientDescent, MinibatchTrainingMixin):
             batch_size=self.batch_size,
         )
 
-    def prediction_error(self, input_data, target_data):
+    def prediction_error(self, input_data, target_data=None):
         """
         Check the prediction error for the specified input samples
         and their targets.
 
         Parameters
         ----------
-        input_data : array-like
-        target_data : array-like
+        input_data : array-like or BatchSource
+        target_data : array-like or None
 
         Returns
         -------
         float
             Prediction error.
         """
+        staged = self.staged
+
+        if staged is not None and is_same_data(input_data,
+                                               staged.input_test):
+            errors = self.apply_staged_batches(
+                function=self.methods.staged_prediction_error,
+                offset=staged.n_train_samples,
+                n_samples=staged.n_test_samples,
+
+                description='Validation batches',
+                show_error_output=True,
+            )
+            return average_batch_errors(
+                errors,
+                n_samples=staged.n_test_samples,
+                batch_size=self.batch_size,
+            )
+
         input_data = self.format_input_data(input_data)
         target_data = self.format_target_data(target_data)
 
+        if is_streaming_data(input_data):
+            errors, batch_sizes = self.apply_batch_source(
+                function=self.methods.prediction_error,
+                batch_source=self.create_batch_source(
+                    input_data, target_data),
+
+                description='Validation batches',
+                show_error_output=True,
+            )
+            return average_batch_errors(errors, batch_sizes=batch_sizes)
+
         errors = self.apply_batches(
             function=self.methods.prediction_error,
             input_data=input_data,
@@ -559,15 +1488,38 @@ class GradientDescent(BaseGradientDescent, MinibatchTrainingMixin):
 
         Parameters
         ----------
-        input_data : array-like
+        input_data : array-like or BatchSource
 
         Returns
         -------
         array-like
         """
+        input_data = self.format_input_data(input_data)
+
+        if is_streaming_data(input_data):
+            n_inputs = len(self.connection.input_layers)
+            batch_source = self.create_batch_source(input_data)
+
+            def input_batch_source():
+                # Batch source might produce targets, for instance,
+                # the same source that has been used for training.
+                for batch in batch_source():
+                    yield batch[:n_inputs]
+
+            outputs, _ = self.apply_batch_source(
+                function=self.methods.predict,
+                batch_source=input_batch_source,
+
+                description='Prediction batches',
+                show_progressbar=True,
+                show_error_output=False,
+                scalar_output=False,
+            )
+            return np.concatenate(outputs, axis=0)
+
         outputs = self.apply_batches(
             function=self.methods.predict,
-            input_data=self.format_input_data(input_data),
+            input_data=input_data,
 
             description='Prediction batches',
             show_progressbar=True,
@@ -1,5 +1,6 @@
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy.utils import dot, function_name_scope
 from neupy.core.properties import (ChoiceProperty, NumberProperty,
                                    WithdrawProperty)
@@ -159,14 +160,14 @@ class ConjugateGradient(WolfeLineSearchForStep, BaseGradientDescent):
 
         self.variables.update(
             prev_delta=tf.Variable(
-                tf.zeros([n_parameters]),
+                tf.zeros([n_parameters], dtype=get_float_type()),
                 name="conj-grad/prev-delta",
-                dtype=tf.float32,
+                dtype=get_float_type(),
             ),
             prev_gradient=tf.Variable(
-                tf.zeros([n_parameters]),
+                tf.zeros([n_parameters], dtype=get_float_type()),
                 name="conj-grad/prev-gradient",
-                dtype=tf.float32,
+                dtype=get_float_type(),
             ),
         )
 
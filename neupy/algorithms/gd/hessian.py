@@ -1,5 +1,6 @@
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy.core.properties import BoundedProperty, WithdrawProperty
 from neupy.utils import asfloat, flatten, function_name_scope
 from neupy.layers.utils import count_parameters
@@ -45,7 +46,7 @@ def find_hessian_and_gradient(error_function, parameters):
         compute_gradient_per_value,
         [
             tf.constant(0, tf.int32),
-            tf.TensorArray(tf.float32, size=n_samples),
+            tf.TensorArray(get_float_type(), size=n_samples),
         ]
     )
 
@@ -129,7 +130,8 @@ class Hessian(StepSelectionBuiltIn, BaseGradientDescent):
             self.variables.error_func, parameters
         )
         parameter_update = tf.matrix_solve(
-            hessian_matrix + penalty_const * tf.eye(n_parameters),
+            hessian_matrix + penalty_const * tf.eye(
+                n_parameters, dtype=get_float_type()),
             tf.reshape(full_gradient, [-1, 1])
         )
         updated_parameters = param_vector - flatten(parameter_update)
@@ -0,0 +1,288 @@
+import tensorflow as tf
+
+from neupy.core.properties import (NumberProperty, IntProperty,
+                                   WithdrawProperty)
+from neupy.utils import asfloat, dot, function_name_scope
+from neupy.algorithms.utils import (parameter_values, setup_parameter_updates,
+                                    make_single_vector)
+from .base import BaseGradientDescent, BatchSizeProperty
+from .quasi_newton import WolfeLineSearchForStep
+
+
+__all__ = ('HessianFree',)
+
+
+@function_name_scope
+def hessian_vector_product(gradients, parameters, vector):
+    """
+    Compute product between hessian and vector without hessian.
+    Hessian is the jacobian of the gradient and it's symmetric,
+    which means that product is equal to the gradient of the
+    gradients, where vector specifies gradients with respect to the
+    gradients. Vector is never used in the graph that has to be
+    differentiated, so product can be computed inside of the
+    ``tf.while_loop`` body, even when vector is a loop variable.
+
+    Parameters
+    ----------
+    gradients : list of Tensorfow variables
+        Gradients of the error with respect to the parameters.
+
+    parameters : list of Tensorfow variables
+        Neural network parameters (e.g. weights, biases).
+
+    vector : Tensorfow variable
+        Vector with the same number of values as in all of the
+        parameters.
+
+    Returns
+    -------
+    Tensorfow variable
+    """
+    sizes = [gradient.shape.num_elements() for gradient in gradients]
+    vectors = tf.split(vector, sizes)
+
+    products = tf.gradients(gradients, parameters, grad_ys=[
+        tf.reshape(value, tf.shape(gradient))
+        for value, gradient in zip(vectors, gradients)
+    ])
+
+    return make_single_vector([
+        # Gradient is equal to ``None`` when error
+        # depends linearly on the parameter
+        tf.zeros_like(parameter) if product is None else product
+        for parameter, product in zip(parameters, products)
+    ])
+
+
+@function_name_scope
+def conjugate_gradient(matvec, vector, maxiter, tol):
+    """
+    Approximately solves linear system ``A * x = b`` with conjugate
+    gradient method. Iterations stop as soon as direction with
+    non-positive curvature has been found, which means that matrix
+    is not positive definite.
+
+    Parameters
+    ----------
+    matvec : callable
+        Function that computes product between matrix ``A``
+        and vector.
+
+    vector : Tensorfow variable
+        Vector ``b``.
+
+    maxiter : int
+        Maximum number of iterations.
+
+    tol : float
+        Iterations stop when norm of the residual becomes smaller
+        than norm of the vector ``b`` multiplied by this value.
+
+    Returns
+    -------
+    Tensorfow variable
+    """
+    threshold = (tol * tf.norm(vector)) ** 2
+
+    def should_continue(index, solution, residual, direction,
+                        residual_norm, is_finished):
+        return tf.logical_and(
+            tf.logical_not(is_finished),
+            tf.logical_and(index < maxiter, residual_norm > threshold),
+        )
+
+    def iteration(index, solution, residual, direction,
+                  residual_norm, is_finished):
+        product = matvec(direction)
+        curvature = dot(direction, product)
+        has_negative_curvature = curvature <= 0
+
+        alpha = residual_norm / tf.where(
+            has_negative_curvature, tf.ones_like(curvature), curvature)
+
+        new_solution = solution + alpha * direction
+        new_residual = residual - alpha * product
+        new_residual_norm = dot(new_residual, new_residual)
+        new_direction = new_residual + (
+            new_residual_norm / residual_norm) * direction
+
+        def select(old_value, new_value):
+            return tf.where(has_negative_curvature, old_value, new_value)
+
+        return (
+            index + 1,
+            select(solution, new_solution),
+            select(residual, new_residual),
+            select(direction, new_direction),
+            select(residual_norm, new_residual_norm),
+            has_negative_curvature,
+        )
+
+    _, solution, _, _, _, _ = tf.while_loop(
+        should_continue,
+        iteration,
+        [
+            tf.constant(0, tf.int32),
+            tf.zeros_like(vector),
+            vector,
+            vector,
+            dot(vector, vector),
+            tf.constant(False),
+        ]
+    )
+
+    return solution
+
+
+class HessianFree(WolfeLineSearchForStep, BaseGradientDescent):
+    """
+    Hessian-free optimization, also known as truncated Newton's method.
+    Instead of building hessian matrix, algorithm finds Newton's direction
+    with conjugate gradient method that requires only products between
+    hessian and vector. Each product costs about the same as computing
+    gradient twice. Step size along the direction is selected with
+    line search that satisfies strong Wolfe condition. Parameters that
+    control wolfe search start with the ``wolfe_`` prefix.
+
+    Parameters
+    ----------
+    damping : float
+        Hessian can be singular or not positive definite. Damping adds
+        identity matrix multiplied by this value to the hessian.
+        Defaults to ``0.01``.
+
+    cg_maxiter : int
+        Maximum number of conjugate gradient iterations per each
+        update. Defaults to ``20``.
+
+    cg_tol : float
+        Conjugate gradient stops when norm of the residual becomes
+        smaller than norm of the gradient multiplied by this value.
+        Defaults to ``1e-5``.
+
+    curvature_batch_size : int or None
+        Number of randomly selected training samples used for the
+        hessian-vector products. Curvature estimated from the
+        mini-batch is cheaper to compute and gradient is still computed
+        from all of the training samples. Value ``None`` means that all
+        samples will be used. Defaults to ``None``.
+
+    {WolfeLineSearchForStep.Parameters}
+
+    {BaseGradientDescent.connection}
+
+    {BaseGradientDescent.error}
+
+    {BaseGradientDescent.show_epoch}
+
+    {BaseGradientDescent.shuffle_data}
+
+    {BaseGradientDescent.epoch_end_signal}
+
+    {BaseGradientDescent.train_end_signal}
+
+    {BaseGradientDescent.verbose}
+
+    {BaseGradientDescent.addons}
+
+    Notes
+    -----
+    - Method requires all training data during propagation, which means
+      it's not allowed to use mini-batches.
+
+    - In case if conjugate gradient finds direction that doesn't
+      decrease the error, negative gradient will be used instead.
+
+    Attributes
+    ----------
+    {BaseGradientDescent.Attributes}
+
+    Methods
+    -------
+    {BaseGradientDescent.Methods}
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from neupy import algorithms
+    >>>
+    >>> x_train = np.array([[1, 2], [3, 4]])
+    >>> y_train = np.array([[1], [0]])
+    >>>
+    >>> hfnet = algorithms.HessianFree((2, 3, 1), curvature_batch_size=1)
+    >>> hfnet.train(x_train, y_train, epochs=10)
+
+    References
+    ----------
+    [1] James Martens, Deep learning via Hessian-free optimization.
+        http://www.cs.toronto.edu/~jmartens/docs/Deep_HessianFree.pdf
+
+    [2] Jorge Nocedal, Stephen J. Wright, Numerical Optimization.
+        Chapter 7.1, Inexact Newton Methods, p. 165-175
+
+    See Also
+    --------
+    :network:`Hessian` : Newton's method with full hessian matrix.
+    """
+    damping = NumberProperty(default=0.01, minval=0)
+    cg_maxiter = IntProperty(default=20, minval=1)
+    cg_tol = NumberProperty(default=1e-5, minval=0)
+    curvature_batch_size = BatchSizeProperty(default=None)
+
+    step = WithdrawProperty()
+
+    def curvature_error(self):
+        """
+        Error for the randomly selected mini-batch that will be
+        used in order to estimate curvature.
+        """
+        network_inputs = self.variables.network_inputs
+        network_output = self.variables.network_output
+
+        n_samples = tf.shape(network_inputs[0])[0]
+        indices = tf.random_shuffle(tf.range(n_samples))
+        indices = indices[:self.curvature_batch_size]
+
+        # Updates, like the ones from the batch normalization
+        # layer, have to be defined by the main training output
+        layer_updates = [layer.updates for layer in self.layers]
+        output = self.connection.output(*[
+            tf.gather(value, indices) for value in network_inputs])
+
+        for layer, updates in zip(self.layers, layer_updates):
+            layer.updates = updates
+
+        return self.error(tf.gather(network_output, indices), output)
+
+    def init_train_updates(self):
+        damping = asfloat(self.damping)
+
+        params = parameter_values(self.connection)
+        param_vector = make_single_vector(params)
+
+        gradients = tf.gradients(self.variables.error_func, params)
+        full_gradient = make_single_vector(gradients)
+
+        curvature_gradients = gradients
+
+        if self.curvature_batch_size is not None:
+            curvature_gradients = tf.gradients(self.curvature_error(), params)
+
+        def matvec(vector):
+            return damping * vector + hessian_vector_product(
+                curvature_gradients, params, vector)
+
+        param_delta = conjugate_gradient(
+            matvec, -full_gradient, self.cg_maxiter, asfloat(self.cg_tol))
+
+        param_delta = tf.where(
+            dot(param_delta, full_gradient) < 0,
+            param_delta,
+            -full_gradient,
+        )
+
+        step = self.find_optimal_step(param_vector, param_delta)
+        updated_params = param_vector + step * param_delta
+
+        return setup_parameter_updates(params, updated_params)
@@ -1,11 +1,18 @@
 import numpy as np
 import tensorflow as tf
 
-from neupy.utils import tensorflow_session, flatten, function_name_scope
+from neupy.environment import get_float_type
+from neupy.utils import (asfloat, flatten, function_name_scope, as_tuple,
+                         initialize_uninitialized_variables)
 from neupy.core.properties import (BoundedProperty, ChoiceProperty,
                                    WithdrawProperty)
+from neupy.layers.activations import ActivationLayer
+from neupy.layers.utils import count_parameters
 from neupy.algorithms import BaseGradientDescent
+from neupy.algorithms.constructor import function
 from neupy.algorithms.gd import StepSelectionBuiltIn, errors
+from neupy.algorithms.gd.base import (BatchSizeProperty, iter_batches,
+                                      count_samples)
 from neupy.algorithms.utils import (parameter_values, setup_parameter_updates,
                                     make_single_vector)
 
@@ -43,13 +50,157 @@ def compute_jacobian(values, parameters):
         compute_gradient_per_value,
         [
             tf.constant(0, tf.int32),
-            tf.TensorArray(tf.float32, size=n_samples),
+            tf.TensorArray(get_float_type(), size=n_samples),
         ]
     )
 
     return jacobian.stack()
 
 
+def is_dense_layer(layer):
+    """
+    Checks whether layer applies only matrix multiplication,
+    bias and element-wise activation function.
+    """
+    return (
+        isinstance(layer, ActivationLayer) and
+        layer.size is not None and
+        set(layer.parameters) <= {'weight', 'bias'}
+    )
+
+
+def propagate_dense_layers(connection, input_values):
+    """
+    Propagates input values through the connection and stores
+    inputs and outputs before activation for each dense layer.
+
+    Parameters
+    ----------
+    connection : connection
+
+    input_values : list of Tensorfow variables
+        Inputs for each input layer.
+
+    Returns
+    -------
+    tuple
+        Output from the connection and dictionary that maps each
+        dense layer to the pair of its input and linear output.
+    """
+    graph = connection.graph
+    values, linear_outputs = {}, {}
+
+    for input_layer, input_value in zip(connection.input_layers,
+                                        input_values):
+        values[input_layer] = input_layer.output(input_value)
+
+    for layer in graph.topological_order:
+        if layer in values:
+            continue
+
+        inputs = [values[input_layer]
+                  for input_layer in graph.backward_graph[layer]]
+
+        if is_dense_layer(layer):
+            input_value, = inputs
+            linear_output = tf.matmul(input_value, layer.weight)
+
+            if layer.bias is not None:
+                linear_output += layer.bias
+
+            linear_outputs[layer] = (input_value, linear_output)
+            values[layer] = layer.activation_function(linear_output)
+
+        else:
+            values[layer] = layer.output(*inputs)
+
+    return values[connection.output_layers[0]], linear_outputs
+
+
+@function_name_scope
+def compute_jacobian_products(connection, input_values, target_value):
+    """
+    Compute products between jacobian and itself and between jacobian
+    and errors for the chunk of samples. Jacobian is never stored for
+    the whole chunk when all of the layers with parameters are dense.
+    Gradient of the summed errors with respect to the layer's linear
+    output contains gradient per each sample, since samples don't
+    interact with each other. Gradient per sample for the weight is
+    an outer product between layer's input and this gradient. Other
+    networks compute jacobian for the chunk with the
+    ``compute_jacobian`` function.
+
+    Parameters
+    ----------
+    connection : connection
+
+    input_values : list of Tensorfow variables
+        Inputs for each input layer.
+
+    target_value : Tensorfow variable
+        Expected output from the network.
+
+    Returns
+    -------
+    tuple
+        Products J.T * J, J.T * e and sum of squared errors.
+    """
+    layers = [layer for layer in connection if layer.parameters]
+    parameters = parameter_values(layers)
+    output_shape = connection.output_layers[0].output_shape
+
+    # Shared and non-trainable parameters break one to one
+    # relation between layer's parameters and jacobian's columns
+    is_vectorizable = (
+        all(is_dense_layer(layer) for layer in layers) and
+        len(parameters) == sum(len(layer.parameters) for layer in layers) and
+        output_shape is not None and len(output_shape) == 1
+    )
+
+    if not is_vectorizable:
+        output = connection.output(*input_values)
+        err_for_each_sample = flatten((target_value - output) ** 2)
+        J = compute_jacobian(err_for_each_sample, parameters)
+
+        return (
+            tf.matmul(J, J, transpose_a=True),
+            tf.matmul(J, tf.expand_dims(err_for_each_sample, 1),
+                      transpose_a=True),
+            tf.reduce_sum(err_for_each_sample),
+        )
+
+    output, linear_outputs = propagate_dense_layers(connection, input_values)
+    errors = (target_value - output) ** 2
+    linear_values = [linear_outputs[layer][1] for layer in layers]
+
+    jtj, jte = 0, 0
+
+    # Each output unit gives one row in the jacobian per sample
+    for index in range(output_shape[0]):
+        error = errors[:, index:index + 1]
+        gradients = tf.gradients(tf.reduce_sum(error), linear_values)
+        per_sample_gradients = []
+
+        for layer, gradient in zip(layers, gradients):
+            input_value = linear_outputs[layer][0]
+            n_parameters = layer.weight.shape[0] * layer.weight.shape[1]
+
+            for name in layer.parameters:
+                if name == 'weight':
+                    per_sample_gradients.append(tf.reshape(
+                        tf.expand_dims(input_value, 2) *
+                        tf.expand_dims(gradient, 1),
+                        [-1, n_parameters.value]))
+                else:
+                    per_sample_gradients.append(gradient)
+
+        J = tf.concat(per_sample_gradients, axis=1)
+        jtj += tf.matmul(J, J, transpose_a=True)
+        jte += tf.matmul(J, error, transpose_a=True)
+
+    return jtj, jte, tf.reduce_sum(errors)
+
+
 class LevenbergMarquardt(StepSelectionBuiltIn, BaseGradientDescent):
     """
     Levenberg-Marquardt algorithm is a variation of the Newton's method.
@@ -59,7 +210,8 @@ class LevenbergMarquardt(StepSelectionBuiltIn, BaseGradientDescent):
     Notes
     -----
     - Method requires all training data during propagation, which means
-      it's not allowed to use mini-batches.
+      it's not allowed to use mini-batches. Instead, data can be
+      divided into chunks with the ``chunk_size`` parameter.
 
     - Network minimizes only Mean Squared Error (MSE) loss function.
 
@@ -79,6 +231,16 @@ class LevenbergMarquardt(StepSelectionBuiltIn, BaseGradientDescent):
         Factor to decrease the mu if update decrese the error, otherwise
         increse mu by the same factor. Defaults to ``1.2``
 
+    chunk_size : int or None
+        Number of samples that will be propagated through the network
+        at once. Products J.T * J and J.T * e will be accumulated over
+        all chunks and parameters will be updated once per epoch, which
+        means that update is the same as the one computed from the full
+        dataset. Memory usage depends on the number of parameters and
+        the chunk size, but not on the number of training samples.
+        Value ``None`` means that jacobian will be computed for all
+        training samples at once. Defaults to ``None``.
+
     error : {{``mse``}}
         Levenberg-Marquardt works only for quadratic functions.
         Defaults to ``mse``.
@@ -120,6 +282,7 @@ class LevenbergMarquardt(StepSelectionBuiltIn, BaseGradientDescent):
     """
     mu = BoundedProperty(default=0.01, minval=0)
     mu_update_factor = BoundedProperty(default=1.2, minval=1)
+    chunk_size = BatchSizeProperty(default=None)
     error = ChoiceProperty(default='mse', choices={'mse': errors.mse})
 
     step = WithdrawProperty()
@@ -127,36 +290,82 @@ class LevenbergMarquardt(StepSelectionBuiltIn, BaseGradientDescent):
     def init_variables(self):
         super(LevenbergMarquardt, self).init_variables()
         self.variables.update(
-            mu=tf.Variable(self.mu, name='lev-marq/mu'),
-            last_error=tf.Variable(np.nan, name='lev-marq/last-error'),
+            mu=tf.Variable(asfloat(self.mu), name='lev-marq/mu'),
+            last_error=tf.Variable(
+                asfloat(np.nan), name='lev-marq/last-error'),
         )
 
+        if self.chunk_size is not None:
+            n_params = count_parameters(self.connection)
+            float_type = get_float_type()
+
+            self.variables.update(
+                jtj=tf.Variable(
+                    tf.zeros((n_params, n_params), dtype=float_type),
+                    name='lev-marq/jtj'),
+                jte=tf.Variable(
+                    tf.zeros((n_params, 1), dtype=float_type),
+                    name='lev-marq/jte'),
+                error_sum=tf.Variable(
+                    asfloat(0), name='lev-marq/error-sum'),
+                n_errors=tf.Variable(
+                    asfloat(0), name='lev-marq/n-errors'),
+            )
+
+    def init_chunk_updates(self):
+        """
+        Initialize updates that accumulate products between
+        jacobian and errors for the chunk of samples.
+        """
+        variables = self.variables
+        network_output = variables.network_output
+
+        jtj, jte, error_sum = compute_jacobian_products(
+            self.connection, variables.network_inputs, network_output)
+        n_errors = tf.cast(tf.size(network_output), get_float_type())
+        variables.chunk_error = error_sum / n_errors
+
+        return [
+            (variables.jtj, variables.jtj + jtj),
+            (variables.jte, variables.jte + jte),
+            (variables.error_sum, variables.error_sum + error_sum),
+            (variables.n_errors, variables.n_errors + n_errors),
+        ]
+
     def init_train_updates(self):
         network_output = self.variables.network_output
         prediction_func = self.variables.train_prediction_func
         last_error = self.variables.last_error
-        error_func = self.variables.error_func
         mu = self.variables.mu
 
+        params = parameter_values(self.connection)
+        param_vector = make_single_vector(params)
+        n_params = count_parameters(self.connection)
+
+        if self.chunk_size is None:
+            error_func = self.variables.error_func
+            err_for_each_sample = flatten(
+                (network_output - prediction_func) ** 2)
+
+            J = compute_jacobian(err_for_each_sample, params)
+            J_T = tf.transpose(J)
+
+            jtj = tf.matmul(J_T, J)
+            jte = tf.matmul(J_T, tf.expand_dims(err_for_each_sample, 1))
+
+        else:
+            error_func = self.variables.accumulated_error
+            jtj = self.variables.jtj
+            jte = self.variables.jte
+
         new_mu = tf.where(
             tf.less(last_error, error_func),
             mu * self.mu_update_factor,
             mu / self.mu_update_factor,
         )
 
-        err_for_each_sample = flatten((network_output - prediction_func) ** 2)
-
-        params = parameter_values(self.connection)
-        param_vector = make_single_vector(params)
-
-        J = compute_jacobian(err_for_each_sample, params)
-        J_T = tf.transpose(J)
-        n_params = J.shape[1]
-
         parameter_update = tf.matrix_solve(
-            tf.matmul(J_T, J) + new_mu * tf.eye(n_params.value),
-            tf.matmul(J_T, tf.expand_dims(err_for_each_sample, 1))
-        )
+            jtj + new_mu * tf.eye(n_params, dtype=get_float_type()), jte)
         updated_params = param_vector - flatten(parameter_update)
 
         updates = [(mu, new_mu)]
@@ -165,9 +374,72 @@ class LevenbergMarquardt(StepSelectionBuiltIn, BaseGradientDescent):
 
         return updates
 
+    def init_methods(self):
+        if self.chunk_size is None:
+            return super(LevenbergMarquardt, self).init_methods()
+
+        variables = self.variables
+        network_inputs = variables.network_inputs
+        network_output = variables.network_output
+        variables.accumulated_error = variables.error_sum / variables.n_errors
+
+        with tf.name_scope('training-updates'):
+            chunk_updates = self.init_chunk_updates()
+            training_updates = self.init_train_updates()
+
+            for layer in self.layers:
+                chunk_updates.extend(layer.updates)
+
+            # Accumulated values will be used only once
+            for variable in (variables.jtj, variables.jte,
+                             variables.error_sum, variables.n_errors):
+                training_updates.append((variable, tf.zeros_like(variable)))
+
+        variables.training_updates = training_updates
+        initialize_uninitialized_variables()
+
+        self.methods.update(
+            predict=function(
+                inputs=network_inputs,
+                outputs=variables.prediction_func,
+                name='network/func-predict'
+            ),
+            accumulate_chunk=function(
+                inputs=network_inputs + [network_output],
+                outputs=variables.chunk_error,
+                updates=chunk_updates,
+                name='lev-marq/func-accumulate-chunk'
+            ),
+            train_epoch=function(
+                inputs=[],
+                outputs=variables.accumulated_error,
+                updates=training_updates,
+                name='network/func-train-epoch'
+            ),
+            prediction_error=function(
+                inputs=network_inputs + [network_output],
+                outputs=variables.validation_error_func,
+                name='network/func-prediction-error'
+            )
+        )
+
+    def train_epoch(self, input_train, target_train):
+        if self.chunk_size is None:
+            return super(LevenbergMarquardt, self).train_epoch(
+                input_train, target_train)
+
+        arguments = as_tuple(input_train, target_train)
+        n_samples = count_samples(input_train)
+
+        for chunk in iter_batches(n_samples, self.chunk_size):
+            self.methods.accumulate_chunk(
+                *[argument[chunk] for argument in arguments])
+
+        return self.methods.train_epoch()
+
     def on_epoch_start_update(self, epoch):
         super(LevenbergMarquardt, self).on_epoch_start_update(epoch)
 
         last_error = self.errors.last()
         if last_error is not None:
-            self.variables.last_error.load(last_error, tensorflow_session())
+            self.variables.last_error.load(last_error, self.session)
@@ -1,6 +1,5 @@
-import tensorflow as tf
-
 from neupy.core.properties import ProperFractionProperty, Property
+from neupy.algorithms.utils import gather_rows, slice_values, with_indices
 from .base import GradientDescent
 
 
@@ -57,19 +56,23 @@ class Momentum(GradientDescent):
         step = self.variables.step
 
         for layer, parameter, gradient in self.iter_params_and_grads():
-            previous_velocity = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/previous-velocity".format(parameter.op.name),
-                dtype=tf.float32,
-            )
-            velocity = self.momentum * previous_velocity - step * gradient
+            previous_velocity = self.init_parameter_state(
+                parameter, name="previous-velocity")
+
+            previous_velocity_rows = gather_rows(previous_velocity, gradient)
+            parameter_rows = gather_rows(parameter, gradient)
+            gradient_values = slice_values(gradient)
+
+            velocity = (
+                self.momentum * previous_velocity_rows -
+                step * gradient_values)
 
             if self.nesterov:
-                velocity = self.momentum * velocity - step * gradient
+                velocity = self.momentum * velocity - step * gradient_values
 
             updates.extend([
-                (parameter, parameter + velocity),
-                (previous_velocity, velocity),
+                (parameter, with_indices(parameter_rows + velocity, gradient)),
+                (previous_velocity, with_indices(velocity, gradient)),
             ])
 
         return updates
@@ -1,5 +1,6 @@
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy.core.config import Configurable
 from neupy.core.properties import (ChoiceProperty, NumberProperty,
                                    WithdrawProperty, IntProperty)
@@ -71,16 +72,15 @@ class WolfeLineSearchForStep(StepSelectionBuiltIn, Configurable):
 
             return output
 
-        def phi(step):
-            return self.error(network_output, prediction(step))
-
-        def derphi(step):
+        def phi_and_derphi(step):
+            # Value and derivative share the same forward pass
             error_func = self.error(network_output, prediction(step))
             gradient, = tf.gradients(error_func, step)
-            return gradient
+            return error_func, gradient
 
         return line_search(
-            phi, derphi, self.wolfe_maxiter, self.wolfe_c1, self.wolfe_c2)
+            phi_and_derphi, None,
+            self.wolfe_maxiter, self.wolfe_c1, self.wolfe_c2)
 
 
 @function_name_scope
@@ -116,7 +116,7 @@ def bfgs(inv_H, delta_w, delta_grad, epsilon=1e-7):
     """
     n_parameters = int(inv_H.shape[0])
 
-    I = tf.eye(n_parameters)
+    I = tf.eye(n_parameters, dtype=inv_H.dtype)
     rho = safe_reciprocal(dot(delta_grad, delta_w), epsilon)
 
     X = I - outer(delta_w, delta_grad) * rho
@@ -172,6 +172,74 @@ def sr1(inv_H, delta_w, delta_grad, epsilon=1e-7):
     )
 
 
+@function_name_scope
+def lbfgs(gradient, delta_ws, delta_grads, h0_scale=1, epsilon=1e-7):
+    """
+    Limited-memory BFGS (L-BFGS). Computes product between inverse
+    hessian approximation and gradient with two-loop recursion, which
+    means that inverse hessian is never stored. Approximation is based
+    only on the last few pairs of parameter and gradient differences.
+    Pairs filled with zeros are ignored.
+
+    Parameters
+    ----------
+    gradient : Tensorfow variable
+        Full gradient vector.
+
+    delta_ws : Tensorfow variable
+        Matrix where each row is a difference between parameters
+        from two consecutive iterations. Rows ordered from the
+        oldest to the most recent one.
+
+    delta_grads : Tensorfow variable
+        Matrix where each row is a difference between gradients
+        from two consecutive iterations.
+
+    h0_scale : float
+        Scale for the initial inverse hessian when there is no
+        pairs stored. Defaults to ``1``.
+
+    epsilon : float
+        Controls numerical stability. Defaults to ``1e-7``.
+
+    Returns
+    -------
+    Tensorfow variable
+    """
+    memory_size = int(delta_ws.shape[0])
+
+    delta_w = [delta_ws[index] for index in range(memory_size)]
+    delta_grad = [delta_grads[index] for index in range(memory_size)]
+    rho = [safe_reciprocal(dot(delta_grad[index], delta_w[index]), epsilon)
+           for index in range(memory_size)]
+
+    alpha = [None] * memory_size
+    result = gradient
+
+    for index in reversed(range(memory_size)):
+        alpha[index] = rho[index] * dot(delta_w[index], result)
+        result = result - alpha[index] * delta_grad[index]
+
+    # Scaling makes step from the search direction approximately
+    # equal to one, which reduces number of line search iterations
+    last_delta_w, last_delta_grad = delta_w[-1], delta_grad[-1]
+    grad_squared_norm = dot(last_delta_grad, last_delta_grad)
+
+    gamma = tf.where(
+        tf.greater(grad_squared_norm, 0),
+        safe_division(
+            dot(last_delta_w, last_delta_grad), grad_squared_norm, epsilon),
+        asfloat(h0_scale),
+    )
+    result = gamma * result
+
+    for index in range(memory_size):
+        beta = rho[index] * dot(delta_grad[index], result)
+        result = result + delta_w[index] * (alpha[index] - beta)
+
+    return result
+
+
 class QuasiNewton(WolfeLineSearchForStep, BaseGradientDescent):
     """
     Quasi-Newton algorithm. Every iteration quasi-Network method approximates
@@ -182,7 +250,7 @@ class QuasiNewton(WolfeLineSearchForStep, BaseGradientDescent):
 
     Parameters
     ----------
-    update_function : ``bfgs``, ``dfp``, ``sr1``
+    update_function : ``bfgs``, ``dfp``, ``sr1``, ``lbfgs``
         Update function for the iterative inverse hessian matrix
         approximation. Defaults to ``bfgs``.
 
@@ -199,11 +267,22 @@ class QuasiNewton(WolfeLineSearchForStep, BaseGradientDescent):
           this case update won't be applied and original inverse hessian
           will be returned.
 
+        - ``lbfgs`` - Limited-memory BFGS (L-BFGS). Inverse hessian
+          matrix isn't stored. Instead, algorithm stores only last
+          ``memory_size`` differences between parameters and gradients
+          from consecutive iterations. Memory and time per update
+          grow linearly with the number of parameters, which makes
+          it possible to train large networks.
+
     h0_scale : float
         Default Hessian matrix is an identity matrix. The
         ``h0_scale`` parameter scales identity matrix.
         Defaults to ``1``.
 
+    memory_size : int
+        Number of the most recent parameter and gradient differences
+        stored by the ``lbfgs`` update function. Defaults to ``10``.
+
     epsilon : float
         Controls numerical stability for the ``update_function`` parameter.
         Defaults to ``1e-7``.
@@ -268,10 +347,12 @@ class QuasiNewton(WolfeLineSearchForStep, BaseGradientDescent):
             'bfgs': bfgs,
             'dfp': dfp,
             'sr1': sr1,
+            'lbfgs': lbfgs,
         }
     )
     epsilon = NumberProperty(default=1e-7, minval=0)
     h0_scale = NumberProperty(default=1, minval=0)
+    memory_size = IntProperty(default=10, minval=1)
 
     step = WithdrawProperty()
 
@@ -279,25 +360,44 @@ class QuasiNewton(WolfeLineSearchForStep, BaseGradientDescent):
         super(QuasiNewton, self).init_variables()
         n_parameters = count_parameters(self.connection)
 
-        self.variables.update(
-            inv_hessian=tf.Variable(
-                asfloat(self.h0_scale) * tf.eye(n_parameters),
+        if self.update_function is lbfgs:
+            history_shape = [self.memory_size, n_parameters]
+            self.variables.update(
+                delta_ws=tf.Variable(
+                    tf.zeros(history_shape, dtype=get_float_type()),
+                    name="quasi-newton/delta-ws",
+                    dtype=get_float_type(),
+                ),
+                delta_grads=tf.Variable(
+                    tf.zeros(history_shape, dtype=get_float_type()),
+                    name="quasi-newton/delta-grads",
+                    dtype=get_float_type(),
+                ),
+            )
+        else:
+            self.variables.inv_hessian = tf.Variable(
+                self.h0_scale * tf.eye(n_parameters, dtype=get_float_type()),
                 name="quasi-newton/inv-hessian",
-                dtype=tf.float32,
-            ),
+                dtype=get_float_type(),
+            )
+
+        self.variables.update(
             prev_params=tf.Variable(
-                tf.zeros([n_parameters]),
+                tf.zeros([n_parameters], dtype=get_float_type()),
                 name="quasi-newton/prev-params",
-                dtype=tf.float32,
+                dtype=get_float_type(),
             ),
             prev_full_gradient=tf.Variable(
-                tf.zeros([n_parameters]),
+                tf.zeros([n_parameters], dtype=get_float_type()),
                 name="quasi-newton/prev-full-gradient",
-                dtype=tf.float32,
+                dtype=get_float_type(),
             ),
         )
 
     def init_train_updates(self):
+        if self.update_function is lbfgs:
+            return self.init_lbfgs_updates()
+
         inv_hessian = self.variables.inv_hessian
         prev_params = self.variables.prev_params
         prev_full_gradient = self.variables.prev_full_gradient
@@ -337,3 +437,57 @@ class QuasiNewton(WolfeLineSearchForStep, BaseGradientDescent):
             ])
 
         return updates
+
+    def init_lbfgs_updates(self):
+        delta_ws = self.variables.delta_ws
+        delta_grads = self.variables.delta_grads
+        prev_params = self.variables.prev_params
+        prev_full_gradient = self.variables.prev_full_gradient
+
+        params = parameter_values(self.connection)
+        param_vector = make_single_vector(params)
+
+        gradients = tf.gradients(self.variables.error_func, params)
+        full_gradient = make_single_vector(gradients)
+
+        delta_w = param_vector - prev_params
+        delta_grad = full_gradient - prev_full_gradient
+
+        # Pair is stored only when it satisfies curvature condition,
+        # otherwise approximation might stop being positive definite
+        is_valid_pair = tf.logical_and(
+            tf.not_equal(self.variables.epoch, 1),
+            tf.greater(dot(delta_grad, delta_w), self.epsilon),
+        )
+        new_delta_ws = tf.where(
+            is_valid_pair,
+            tf.concat([delta_ws[1:], tf.expand_dims(delta_w, 0)], axis=0),
+            delta_ws,
+        )
+        new_delta_grads = tf.where(
+            is_valid_pair,
+            tf.concat(
+                [delta_grads[1:], tf.expand_dims(delta_grad, 0)], axis=0),
+            delta_grads,
+        )
+
+        param_delta = -lbfgs(
+            full_gradient, new_delta_ws, new_delta_grads,
+            h0_scale=self.h0_scale, epsilon=self.epsilon)
+
+        step = self.find_optimal_step(param_vector, param_delta)
+        updated_params = param_vector + step * param_delta
+        updates = setup_parameter_updates(params, updated_params)
+
+        required_variables = [
+            new_delta_ws, new_delta_grads, param_vector, full_gradient]
+
+        with tf.control_dependencies(required_variables):
+            updates.extend([
+                delta_ws.assign(new_delta_ws),
+                delta_grads.assign(new_delta_grads),
+                prev_params.assign(param_vector),
+                prev_full_gradient.assign(full_gradient),
+            ])
+
+        return updates
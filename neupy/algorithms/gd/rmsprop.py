@@ -1,6 +1,7 @@
 import tensorflow as tf
 
 from neupy.core.properties import ProperFractionProperty, NumberProperty
+from neupy.algorithms.utils import gather_rows, slice_values, with_indices
 from .base import GradientDescent
 
 
@@ -49,22 +50,26 @@ class RMSProp(GradientDescent):
         step = self.variables.step
 
         for layer, parameter, gradient in self.iter_params_and_grads():
-            prev_mean_squred_grad = tf.Variable(
-                tf.zeros(parameter.shape),
-                name="{}/prev-mean-squared-grad".format(parameter.op.name),
-                dtype=tf.float32,
-            )
+            prev_mean_squred_grad = self.init_parameter_state(
+                parameter, name="prev-mean-squared-grad")
+
+            prev_mean_squred_grad_rows = gather_rows(
+                prev_mean_squred_grad, gradient)
+            parameter_rows = gather_rows(parameter, gradient)
+            gradient_values = slice_values(gradient)
 
             mean_squred_grad = (
-                self.decay * prev_mean_squred_grad +
-                (1. - self.decay) * tf.pow(gradient, 2)
+                self.decay * prev_mean_squred_grad_rows +
+                (1. - self.decay) * tf.pow(gradient_values, 2)
             )
-            parameter_delta = gradient / tf.sqrt(
+            parameter_delta = gradient_values / tf.sqrt(
                 mean_squred_grad + self.epsilon)
 
             updates.extend([
-                (prev_mean_squred_grad, mean_squred_grad),
-                (parameter, parameter - step * parameter_delta),
+                (prev_mean_squred_grad,
+                 with_indices(mean_squred_grad, gradient)),
+                (parameter, with_indices(
+                    parameter_rows - step * parameter_delta, gradient)),
             ])
 
         return updates
@@ -1,7 +1,8 @@
 import tensorflow as tf
 import numpy as np
 
-from neupy.utils import tensorflow_session
+from neupy.environment import get_float_type
+from neupy.utils import asfloat
 from neupy.algorithms.gd import StepSelectionBuiltIn
 from neupy.core.properties import BoundedProperty, ProperFractionProperty
 from .base import BaseGradientDescent
@@ -100,19 +101,19 @@ class RPROP(StepSelectionBuiltIn, BaseGradientDescent):
                     # step value.
                     tf.ones_like(parameter) * self.step,
                     name="steps",
-                    dtype=tf.float32,
+                    dtype=get_float_type(),
                 )
                 prev_delta = tf.Variable(
-                    tf.zeros(parameter.shape),
+                    tf.zeros(parameter.shape, dtype=get_float_type()),
                     name="prev-delta",
-                    dtype=tf.float32,
+                    dtype=get_float_type(),
                 )
                 # We collect only signs since it ensures numerical stability
                 # after multiplication when we deal with small numbers.
                 prev_gradient_sign = tf.Variable(
-                    tf.zeros(parameter.shape),
+                    tf.zeros(parameter.shape, dtype=get_float_type()),
                     name="prev-grad-sign",
-                    dtype=tf.float32,
+                    dtype=get_float_type(),
                 )
 
             updated_prev_delta = self.update_prev_delta(prev_delta)
@@ -229,9 +230,10 @@ class IRPROPPlus(RPROP):
     def init_variables(self):
         super(IRPROPPlus, self).init_variables()
         self.variables.update(
-            last_error=tf.Variable(np.nan, name='irprop-plus/last-error'),
+            last_error=tf.Variable(
+                asfloat(np.nan), name='irprop-plus/last-error'),
             previous_error=tf.Variable(
-                np.nan, name='irprop-plus/previous-error'),
+                asfloat(np.nan), name='irprop-plus/previous-error'),
         )
 
     def on_epoch_start_update(self, epoch):
@@ -240,7 +242,7 @@ class IRPROPPlus(RPROP):
         previous_error = self.errors.previous()
         if previous_error:
             last_error = self.errors.last()
-            session = tensorflow_session()
+            session = self.session
 
             self.variables.last_error.load(last_error, session)
             self.variables.previous_error.load(previous_error, session)
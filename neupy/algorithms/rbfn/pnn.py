@@ -44,6 +44,8 @@ class PNN(BaseNetwork, LazyLearningMixin, MinibatchTrainingMixin):
 
     {MinibatchTrainingMixin.batch_size}
 
+    {MinibatchTrainingMixin.prefetch}
+
     {BaseNetwork.verbose}
 
     Methods
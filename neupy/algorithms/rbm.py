@@ -1,6 +1,7 @@
 import numpy as np
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy.core.config import DumpableObject
 from neupy.core.properties import IntProperty, ParameterProperty
 from neupy.algorithms.base import BaseNetwork
@@ -22,8 +23,8 @@ __all__ = ('RBM',)
 
 def random_binomial(p):
     with tf.name_scope('random-binomial'):
-        samples = tf.random_uniform(tf.shape(p), dtype=tf.float32) <= p
-        return tf.cast(samples, tf.float32)
+        samples = tf.random_uniform(tf.shape(p), dtype=get_float_type()) <= p
+        return tf.cast(samples, get_float_type())
 
 
 def random_sample(data, n_samples):
@@ -57,6 +58,8 @@ class RBM(BaseAlgorithm, BaseNetwork, MinibatchTrainingMixin, DumpableObject):
     batch_size : int
         Size of the mini-batch. Defaults to ``10``.
 
+    {MinibatchTrainingMixin.prefetch}
+
     weight : array-like, Tensorfow variable, Initializer or scalar
         Default initialization methods
         you can find :ref:`here <init-methods>`.
@@ -165,12 +168,12 @@ class RBM(BaseAlgorithm, BaseNetwork, MinibatchTrainingMixin, DumpableObject):
 
             self.variables.update(
                 network_input=tf.placeholder(
-                    tf.float32,
+                    get_float_type(),
                     (None, self.n_visible),
                     name="network-input",
                 ),
                 network_hidden_input=tf.placeholder(
-                    tf.float32,
+                    get_float_type(),
                     (None, self.n_hidden),
                     name="network-hidden-input",
                 )
@@ -180,9 +183,11 @@ class RBM(BaseAlgorithm, BaseNetwork, MinibatchTrainingMixin, DumpableObject):
         with tf.variable_scope('rbm'):
             self.variables.update(
                 h_samples=tf.Variable(
-                    tf.zeros([self.batch_size, self.n_hidden]),
+                    tf.zeros(
+                        [self.batch_size, self.n_hidden],
+                        dtype=get_float_type()),
                     name="hidden-samples",
-                    dtype=tf.float32,
+                    dtype=get_float_type(),
                 ),
             )
 
@@ -276,7 +281,8 @@ class RBM(BaseAlgorithm, BaseNetwork, MinibatchTrainingMixin, DumpableObject):
         with tf.name_scope('flipped-input-features'):
             # Each row will have random feature marked with number 1
             # Other values will be equal to 0
-            possible_feature_corruptions = tf.eye(self.n_visible)
+            possible_feature_corruptions = tf.eye(
+                self.n_visible, dtype=get_float_type())
             corrupted_features = random_sample(
                 possible_feature_corruptions, n_samples)
 
@@ -410,7 +416,8 @@ class RBM(BaseAlgorithm, BaseNetwork, MinibatchTrainingMixin, DumpableObject):
         array-like
         """
         is_input_feature1d = (self.n_visible == 1)
-        visible_input = format_data(visible_input, is_input_feature1d)
+        visible_input = format_data(
+            visible_input, is_input_feature1d, float_type=self.float_type)
 
         outputs = self.apply_batches(
             function=self.methods.visible_to_hidden,
@@ -437,7 +444,8 @@ class RBM(BaseAlgorithm, BaseNetwork, MinibatchTrainingMixin, DumpableObject):
         array-like
         """
         is_input_feature1d = (self.n_hidden == 1)
-        hidden_input = format_data(hidden_input, is_input_feature1d)
+        hidden_input = format_data(
+            hidden_input, is_input_feature1d, float_type=self.float_type)
 
         outputs = self.apply_batches(
             function=self.methods.hidden_to_visible,
@@ -465,7 +473,8 @@ class RBM(BaseAlgorithm, BaseNetwork, MinibatchTrainingMixin, DumpableObject):
             Value of the pseudo-likelihood.
         """
         is_input_feature1d = (self.n_visible == 1)
-        input_data = format_data(input_data, is_input_feature1d)
+        input_data = format_data(
+            input_data, is_input_feature1d, float_type=self.float_type)
 
         errors = self.apply_batches(
             function=self.methods.prediction_error,
@@ -498,7 +507,8 @@ class RBM(BaseAlgorithm, BaseNetwork, MinibatchTrainingMixin, DumpableObject):
             units (0 and 1).
         """
         is_input_feature1d = (self.n_visible == 1)
-        visible_input = format_data(visible_input, is_input_feature1d)
+        visible_input = format_data(
+            visible_input, is_input_feature1d, float_type=self.float_type)
 
         gibbs_sampling = self.methods.gibbs_sampling
 
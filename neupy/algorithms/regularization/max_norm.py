@@ -87,6 +87,16 @@ class MaxNormRegularization(WeightUpdateConfigurable):
 
         for parameter, updated in original_updates:
             if parameter in parameters:
+                if isinstance(updated, tf.IndexedSlices):
+                    # Norm depends on all rows of the parameter,
+                    # that's why sparse update has to be converted
+                    # to the dense one
+                    indices = updated.indices
+                    updated = parameter + tf.scatter_nd(
+                        tf.expand_dims(indices, axis=1),
+                        updated.values - tf.gather(parameter, indices),
+                        tf.shape(parameter, out_type=indices.dtype))
+
                 updated = max_norm_clip(updated, self.max_norm)
             modified_updates.append((parameter, updated))
 
@@ -1,6 +1,7 @@
 from neupy.utils import asfloat
 from neupy.layers.utils import iter_parameters
 from neupy.core.properties import BoundedProperty
+from neupy.algorithms.utils import gather_rows, slice_values, with_indices
 from .base import WeightUpdateConfigurable
 
 
@@ -49,7 +50,11 @@ class WeightDecay(WeightUpdateConfigurable):
 
         for parameter, updated in original_updates:
             if parameter in parameters:
-                updated -= step * decay_rate * parameter
+                # Sparse update modifies only specified rows
+                updated = with_indices(
+                    slice_values(updated) -
+                    step * decay_rate * gather_rows(parameter, updated),
+                    updated)
             modified_updates.append((parameter, updated))
 
         return modified_updates
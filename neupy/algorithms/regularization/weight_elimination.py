@@ -3,6 +3,7 @@ import tensorflow as tf
 from neupy.core.properties import BoundedProperty
 from neupy.utils import asfloat
 from neupy.layers.utils import iter_parameters
+from neupy.algorithms.utils import gather_rows, slice_values, with_indices
 from .base import WeightUpdateConfigurable
 
 
@@ -78,11 +79,15 @@ class WeightElimination(WeightUpdateConfigurable):
 
         for parameter, updated in original_updates:
             if parameter in parameters:
-                updated -= decay_koef * (
-                    (2 * parameter / zero_weight_square) / tf.square(
-                        1 + tf.square(parameter) / zero_weight_square
-                    )
-                )
+                # Sparse update modifies only specified rows
+                parameter_rows = gather_rows(parameter, updated)
+                updated = with_indices(
+                    slice_values(updated) - decay_koef * (
+                        (2 * parameter_rows / zero_weight_square) / tf.square(
+                            1 + tf.square(parameter_rows) / zero_weight_square
+                        )
+                    ),
+                    updated)
             modified_updates.append((parameter, updated))
 
         return modified_updates
@@ -1,7 +1,7 @@
 import numpy as np
 import tensorflow as tf
 
-from neupy.utils import tensorflow_session
+from neupy.utils import asfloat
 from neupy.core.properties import (BoundedProperty,
                                    ProperFractionProperty)
 from .base import SingleStepConfigurable
@@ -54,11 +54,11 @@ class ErrDiffStepUpdate(SingleStepConfigurable):
     def init_variables(self):
         self.variables.update(
             last_error=tf.Variable(
-                np.nan,
+                asfloat(np.nan),
                 name='err-diff-step-update/last-error',
             ),
             previous_error=tf.Variable(
-                np.nan,
+                asfloat(np.nan),
                 name='err-diff-step-update/previous-error',
             ),
         )
@@ -88,7 +88,7 @@ class ErrDiffStepUpdate(SingleStepConfigurable):
 
         previous_error = self.errors.previous()
         if previous_error:
-            session = tensorflow_session()
+            session = self.session
             last_error = self.errors.last()
 
             self.variables.last_error.load(last_error, session)
@@ -1,5 +1,6 @@
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy.utils import asfloat, flatten
 from neupy.core.properties import ProperFractionProperty, BoundedProperty
 from neupy.algorithms.utils import parameter_values
@@ -59,9 +60,9 @@ class LeakStepAdaptation(SingleStepConfigurable):
 
         n_parameters = count_parameters(self.connection)
         self.variables.leak_average = tf.Variable(
-            tf.zeros(n_parameters),
+            tf.zeros(n_parameters, dtype=get_float_type()),
             name="leak-step-adapt/leak-average",
-            dtype=tf.float32,
+            dtype=get_float_type(),
         )
 
     def init_train_updates(self):
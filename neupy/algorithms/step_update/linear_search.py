@@ -1,7 +1,8 @@
 import numpy as np
 from scipy.optimize import minimize_scalar
 
-from neupy.utils import asfloat, tensorflow_session
+from neupy.utils import asfloat, initialize_uninitialized_variables
+from neupy.algorithms.utils import create_snapshot
 from neupy.core.properties import BoundedProperty, ChoiceProperty
 from .base import SingleStepConfigurable
 
@@ -82,26 +83,57 @@ class LinearSearch(SingleStepConfigurable):
     search_method = ChoiceProperty(choices=['golden', 'brent'],
                                    default='golden')
 
+    def init_methods(self):
+        super(LinearSearch, self).init_methods()
+
+        # Variables that change their values after the update,
+        # like parameters or states of the training algorithm
+        updated_variables = []
+        for update in self.variables.training_updates:
+            if isinstance(update, (list, tuple)):
+                updated_variables.append(update[0])
+
+        save_initial, restore_initial = create_snapshot(
+            updated_variables, name='linear-search/initial')
+        save_best, restore_best = create_snapshot(
+            updated_variables, name='linear-search/best')
+
+        initialize_uninitialized_variables()
+        self.variables.update(
+            save_initial=save_initial,
+            restore_initial=restore_initial,
+            save_best=save_best,
+            restore_best=restore_best,
+        )
+
     def train_epoch(self, input_train, target_train):
         train_epoch = self.methods.train_epoch
         prediction_error = self.methods.prediction_error
 
-        session = tensorflow_session()
-        params = [param for param, _ in self.init_train_updates()]
-        param_defaults = [session.run(param) for param in params]
+        variables = self.variables
+        session = self.session
+        session.run(variables.save_initial)
+
+        best_trial = {'error': np.inf}
 
         def setup_new_step(new_step):
-            for param_default, param in zip(param_defaults, params):
-                param.load(param_default, session)
+            session.run(variables.restore_initial)
+            variables.step.load(asfloat(new_step), session)
 
-            self.variables.step.load(asfloat(new_step), session)
             train_epoch(input_train, target_train)
             # Train epoch returns neural network error that was before
             # training epoch step, that's why we need to compute
             # it second time.
             error = prediction_error(input_train, target_train)
+            error = np.where(np.isnan(error), np.inf, error)
 
-            return np.where(np.isnan(error), np.inf, error)
+            # Parameters from the best step will be restored after
+            # the search, instead of repeating the update once more
+            if error < best_trial['error'] or 'step' not in best_trial:
+                session.run(variables.save_best)
+                best_trial.update(error=error, step=new_step)
+
+            return error
 
         options = {'xtol': self.tol}
         if self.search_method == 'brent':
@@ -114,4 +146,10 @@ class LinearSearch(SingleStepConfigurable):
             options=options,
         )
 
-        return setup_new_step(res.x)
+        if res.x != best_trial['step']:
+            return setup_new_step(res.x)
+
+        session.run(variables.restore_best)
+        variables.step.load(asfloat(res.x), session)
+
+        return best_trial['error']
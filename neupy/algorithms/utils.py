@@ -1,3 +1,4 @@
+import h5py
 import numpy as np
 import tensorflow as tf
 
@@ -6,7 +7,11 @@ from neupy.layers.utils import iter_parameters
 
 
 __all__ = ('shuffle', 'parameter_values', 'iter_until_converge',
-           'setup_parameter_updates')
+           'setup_parameter_updates', 'BatchSource', 'is_batch_source',
+           'check_batch_source', 'is_lazy_array',
+           'is_streaming_data', 'bucket_by_sequence_length',
+           'merge_duplicate_slices', 'gather_rows', 'slice_values',
+           'with_indices', 'assign_update', 'create_snapshot')
 
 
 def parameter_values(connection):
@@ -158,6 +163,339 @@ def shuffle(*arrays):
     return tuple(arrays)
 
 
+class BatchSource(object):
+    """
+    Re-iterable source of mini-batches. Each batch is an input
+    or a tuple of inputs for each input layer followed by the target.
+    Target can be omitted when batches are used for prediction.
+
+    Parameters
+    ----------
+    function : callable
+        Function that returns new iterator over the batches every
+        time it has been called, for instance, generator function.
+
+    Examples
+    --------
+    >>> from neupy.algorithms.utils import BatchSource
+    >>>
+    >>> @BatchSource
+    ... def training_batches():
+    ...     for i in range(0, len(x_train), 32):
+    ...         yield x_train[i:i + 32], y_train[i:i + 32]
+    ...
+    >>> network.train(training_batches, epochs=10)
+    """
+    def __init__(self, function):
+        if not callable(function):
+            raise TypeError("Batch source expects callable object, got "
+                            "{}".format(type(function).__name__))
+        self.function = function
+
+    def __call__(self):
+        return self.function()
+
+    def __repr__(self):
+        name = getattr(self.function, '__name__', repr(self.function))
+        return "{}({})".format(self.__class__.__name__, name)
+
+
+def is_batch_source(data):
+    """
+    Checks whether data is a re-iterable source of mini-batches.
+
+    Parameters
+    ----------
+    data : object
+
+    Returns
+    -------
+    bool
+    """
+    return isinstance(data, BatchSource)
+
+
+def check_batch_source(data):
+    """
+    Makes sure that function which produces mini-batches was
+    wrapped with the ``BatchSource`` class. Callable objects that
+    behave like arrays are allowed.
+
+    Parameters
+    ----------
+    data : object
+
+    Raises
+    ------
+    TypeError
+        In case if data is a callable object that hasn't
+        been wrapped with the ``BatchSource`` class.
+    """
+    if is_batch_source(data) or not callable(data):
+        return
+
+    if hasattr(data, '__len__') and hasattr(data, '__getitem__'):
+        return
+
+    raise TypeError(
+        "Callable object {!r} cannot be used as data. Function that "
+        "produces mini-batches has to be wrapped with the BatchSource "
+        "class.".format(data))
+
+
+def is_lazy_array(data):
+    """
+    Checks whether data is an array that stored outside of the
+    memory and loaded only when it's being sliced. For instance,
+    ``numpy.memmap`` or HDF5 dataset.
+
+    Parameters
+    ----------
+    data : object or list/tuple of objects
+
+    Returns
+    -------
+    bool
+    """
+    if isinstance(data, (list, tuple)):
+        return any(is_lazy_array(value) for value in data)
+    return isinstance(data, (np.memmap, h5py.Dataset))
+
+
+def is_streaming_data(data):
+    """
+    Checks whether data cannot be loaded in memory at once
+    and has to be processed batch by batch.
+
+    Parameters
+    ----------
+    data : object
+
+    Returns
+    -------
+    bool
+    """
+    return is_batch_source(data) or is_lazy_array(data)
+
+
+def bucket_by_sequence_length(arrays, sequence_length, batch_size,
+                              shuffle_data=True):
+    """
+    Creates batch source that groups samples with similar sequence
+    lengths into the same mini-batches. Recurrent layers stop
+    recurrence after the last step of the longest sequence in the
+    mini-batch, which means that less computations will be wasted
+    on the padded steps.
+
+    Parameters
+    ----------
+    arrays : list of arrays
+        Arrays that have to be split into mini-batches, for instance,
+        padded sequences, their lengths and target values. Arrays
+        will be produced by the source in the same order.
+
+    sequence_length : array-like
+        Length of each sequence.
+
+    batch_size : int
+        Number of samples in the mini-batch.
+
+    shuffle_data : bool
+        If ``True``, samples with the same length and order of the
+        mini-batches will be randomly shuffled every time source has
+        been called. Defaults to ``True``.
+
+    Returns
+    -------
+    BatchSource
+        Batch source that can be used for training
+        and validation.
+
+    Examples
+    --------
+    >>> from neupy import algorithms
+    >>> from neupy.algorithms.utils import bucket_by_sequence_length
+    >>>
+    >>> batches = bucket_by_sequence_length(
+    ...     [x_train, x_length, y_train], x_length, batch_size=32)
+    >>>
+    >>> network = algorithms.RMSProp(connection, verbose=False)
+    >>> network.train(batches, epochs=10)
+    """
+    sequence_length = np.asarray(sequence_length).ravel()
+    n_samples = len(sequence_length)
+
+    if any(len(array) != n_samples for array in arrays):
+        raise ValueError(
+            "All arrays should have the same number of samples as "
+            "sequence lengths, expected {} samples".format(n_samples))
+
+    def batch_source():
+        if shuffle_data:
+            # Stable sort keeps random order of the equal lengths
+            indices = np.random.permutation(n_samples)
+            indices = indices[np.argsort(
+                sequence_length[indices], kind='mergesort')]
+        else:
+            indices = np.argsort(sequence_length, kind='mergesort')
+
+        batches = [indices[i:i + batch_size]
+                   for i in range(0, n_samples, batch_size)]
+
+        if shuffle_data:
+            np.random.shuffle(batches)
+
+        for batch_indices in batches:
+            # Sorted indices make slicing of the lazy arrays faster
+            batch_indices = np.sort(batch_indices)
+            yield tuple(array[batch_indices] for array in arrays)
+
+    return BatchSource(batch_source)
+
+
+def merge_duplicate_slices(gradient):
+    """
+    Sums values that belong to the same row in the sparse gradient.
+    For instance, gradient for the embedding matrix has one slice per
+    each token in the mini-batch and the same token can appear
+    multiple times.
+
+    Parameters
+    ----------
+    gradient : Tensorfow variable or IndexedSlices
+
+    Returns
+    -------
+    Tensorfow variable or IndexedSlices
+        Dense gradient will be returned without changes.
+    """
+    if not isinstance(gradient, tf.IndexedSlices):
+        return gradient
+
+    with tf.name_scope('merge-duplicate-slices'):
+        indices, positions = tf.unique(gradient.indices)
+        values = tf.unsorted_segment_sum(
+            gradient.values, positions, tf.shape(indices)[0])
+
+        return tf.IndexedSlices(values, indices, gradient.dense_shape)
+
+
+def gather_rows(value, sparse_value):
+    """
+    Selects rows from the value that has to be updated in case if
+    sparse value (gradient or update) is an ``IndexedSlices`` object.
+    In case if sparse value is dense, the whole value will be returned.
+
+    Parameters
+    ----------
+    value : Tensorfow variable
+    sparse_value : Tensorfow variable or IndexedSlices
+
+    Returns
+    -------
+    Tensorfow variable
+    """
+    if isinstance(sparse_value, tf.IndexedSlices):
+        return tf.gather(value, sparse_value.indices)
+    return value
+
+
+def slice_values(value):
+    """
+    Returns values from the ``IndexedSlices`` object. Dense
+    value will be returned without changes.
+    """
+    if isinstance(value, tf.IndexedSlices):
+        return value.values
+    return value
+
+
+def with_indices(value, sparse_value):
+    """
+    Associates new values for the rows with the indices from
+    the sparse value. In case if sparse value is dense, value
+    will be returned without changes.
+
+    Parameters
+    ----------
+    value : Tensorfow variable
+        New values for the rows.
+
+    sparse_value : Tensorfow variable or IndexedSlices
+
+    Returns
+    -------
+    Tensorfow variable or IndexedSlices
+    """
+    if isinstance(sparse_value, tf.IndexedSlices):
+        return tf.IndexedSlices(
+            value, sparse_value.indices, sparse_value.dense_shape)
+    return value
+
+
+def assign_update(variable, new_value):
+    """
+    Creates operation that assigns new value to the variable. In
+    case if new value is an ``IndexedSlices`` object, only rows
+    specified by its indices will be updated.
+
+    Parameters
+    ----------
+    variable : Tensorfow variable
+    new_value : Tensorfow variable or IndexedSlices
+
+    Returns
+    -------
+    Tensorfow operation
+    """
+    if isinstance(new_value, tf.IndexedSlices):
+        return tf.scatter_update(
+            variable, new_value.indices, new_value.values)
+    return variable.assign(new_value)
+
+
+def create_snapshot(variables, name='snapshot'):
+    """
+    Creates shadow copy per each variable and operations that copy
+    values between variables and their copies. Each operation copies
+    all of the values at once, which means that snapshot can be saved
+    or restored with single call to the session.
+
+    Parameters
+    ----------
+    variables : list of Tensorfow variables
+
+    name : str
+        Name scope for the shadow variables.
+        Defaults to ``snapshot``.
+
+    Returns
+    -------
+    tuple
+        Operations that save and restore snapshot.
+    """
+    with tf.name_scope(name):
+        shadow_variables = [
+            tf.Variable(
+                tf.zeros(variable.shape, dtype=variable.dtype.base_dtype),
+                name='shadow-variable',
+                trainable=False,
+            )
+            for variable in variables
+        ]
+
+        save = tf.group(*[
+            shadow.assign(variable)
+            for variable, shadow in zip(variables, shadow_variables)
+        ])
+        restore = tf.group(*[
+            variable.assign(shadow)
+            for variable, shadow in zip(variables, shadow_variables)
+        ])
+
+    return save, restore
+
+
 def make_single_vector(parameters):
     with tf.name_scope('make-single-vector'):
         return tf.concat([flatten(param) for param in parameters], axis=0)
@@ -1,11 +1,17 @@
 import os
 import random
+from contextlib import contextmanager
 
 import tensorflow as tf
 import numpy as np
 
 
-__all__ = ('reproducible',)
+__all__ = ('reproducible', 'get_float_type', 'set_float_type',
+           'using_float_type')
+
+
+SUPPORTED_FLOAT_TYPES = ('float16', 'float32', 'float64')
+_float_type = 'float32'
 
 
 def reproducible(seed=0):
@@ -22,3 +28,77 @@ def reproducible(seed=0):
     np.random.seed(seed)
     random.seed(seed)
     tf.set_random_seed(seed)
+
+
+def get_float_type():
+    """
+    Returns name of the float type that is used for the
+    parameters, input data and computations.
+
+    Returns
+    -------
+    str
+        One of the ``float16``, ``float32`` or ``float64``.
+    """
+    return _float_type
+
+
+def set_float_type(float_type):
+    """
+    Set up float type that will be used for the parameters, input
+    data and computations. Networks and layers use float type that
+    was specified during their initialization, which means that
+    float type has to be changed before they've been created.
+
+    Parameters
+    ----------
+    float_type : {'float16', 'float32', 'float64'}
+        The ``float16`` type reduces memory usage for the large
+        networks and the ``float64`` makes computations more precise.
+        Default float type is ``float32``.
+
+    Raises
+    ------
+    ValueError
+        In case if float type is not supported.
+
+    Examples
+    --------
+    >>> from neupy import environment
+    >>> environment.set_float_type('float64')
+    """
+    global _float_type
+
+    if float_type not in SUPPORTED_FLOAT_TYPES:
+        raise ValueError(
+            "Unsupported float type `{}`. Supported types: {}"
+            "".format(float_type, ', '.join(SUPPORTED_FLOAT_TYPES)))
+
+    _float_type = float_type
+
+
+@contextmanager
+def using_float_type(float_type):
+    """
+    Context manager that changes float type only inside of the
+    context. Useful in case if network needs to use float type
+    that is different from the others.
+
+    Parameters
+    ----------
+    float_type : {'float16', 'float32', 'float64'}
+
+    Examples
+    --------
+    >>> from neupy import algorithms, environment
+    >>>
+    >>> with environment.using_float_type('float64'):
+    ...     lmnet = algorithms.LevenbergMarquardt((2, 3, 1))
+    """
+    previous_float_type = get_float_type()
+    set_float_type(float_type)
+
+    try:
+        yield
+    finally:
+        set_float_type(previous_float_type)
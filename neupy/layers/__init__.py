@@ -9,6 +9,7 @@ from .merge import *
 from .reshape import *
 from .embedding import *
 from .recurrent import *
+from .inference import *
 
 from .connections import join, parallel
 from .utils import count_parameters
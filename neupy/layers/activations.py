@@ -465,11 +465,15 @@ class PRelu(ActivationLayer):
         )
 
     def activation_function(self, input_value):
-        input_value = tf.convert_to_tensor(input_value, dtype=tf.float32)
+        # Network might be used outside of the float type context in
+        # which it has been created.
+        input_value = tf.convert_to_tensor(
+            input_value, dtype=self.alpha.dtype.base_dtype)
         ndim = len(input_value.get_shape())
 
         dimensions = np.arange(ndim)
         alpha_axes = dimensions[list(self.alpha_axes)]
 
         alpha = dimshuffle(self.alpha, ndim, alpha_axes)
-        return tf.nn.leaky_relu(tf.to_float(input_value), tf.to_float(alpha))
+        alpha = tf.cast(alpha, input_value.dtype)
+        return tf.nn.leaky_relu(input_value, alpha)
@@ -5,6 +5,7 @@ from collections import OrderedDict
 import six
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy import init
 from neupy.core.config import Configurable
 from neupy.core.properties import ParameterProperty, IntProperty, Property
@@ -67,7 +68,7 @@ def create_shared_parameter(value, name, shape):
     if isinstance(value, init.Initializer):
         value = value.sample(shape)
 
-    return tf.Variable(asfloat(value), name=name, dtype=tf.float32)
+    return tf.Variable(asfloat(value), name=name, dtype=get_float_type())
 
 
 def initialize_layer(layer_class, kwargs, was_initialized):
@@ -7,11 +7,13 @@ from contextlib import contextmanager
 import six
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 from neupy.layers.utils import preformat_layer_shape, find_variables
-from neupy.utils import (as_tuple, tensorflow_session,
-                         initialize_uninitialized_variables)
+from neupy.utils import (as_tuple, tensorflow_session, find_graph,
+                         find_float_type, initialize_uninitialized_variables)
 from .utils import join, is_sequential
-from .graph import LayerGraph
+# Note: topological_sort is kept here for backward compatibility
+from .graph import LayerGraph, topological_sort  # noqa: F401
 from .inline import InlineConnection
 
 
@@ -59,7 +61,7 @@ def check_initialization(method):
     return wrapper
 
 
-def create_input_variables(input_layers):
+def create_input_variables(input_layers, float_type=None):
     """
     Create input variables for each input layer
     in the graph.
@@ -68,15 +70,23 @@ def create_input_variables(input_layers):
     ----------
     input_layers : list of layers
 
+    float_type : str or None
+        Float type of the input variables. ``None`` means that
+        float type from the environment will be used.
+        Defaults to ``None``.
+
     Returns
     -------
     list of Tensorflow variables
     """
+    if float_type is None:
+        float_type = get_float_type()
+
     inputs = []
 
     for input_layer in input_layers:
         variable = tf.placeholder(
-            tf.float32,
+            float_type,
             shape=as_tuple(None, input_layer.output_shape),
             name="network-input/to-layer-{}".format(input_layer.name),
         )
@@ -165,7 +175,11 @@ class BaseConnection(InlineConnection):
         Using current tensorflow session this method propagates
         input throught the network and returns output from it.
         """
-        session = tensorflow_session()
+        # Connection might belong to the network that has its own graph
+        variables = find_variables(self.layers)
+        graph = find_graph(variables)
+        session = tensorflow_session(graph)
+
         # We cache it in order to avoid graph creation
         # every time user calls prediction.
         cache_key = (session, id(self))
@@ -174,21 +188,20 @@ class BaseConnection(InlineConnection):
             # It's important to initialize parameters when for cases when
             # prediction requested for the network that wasn't trained or
             # loaded from the storage.
-            variables = find_variables(self.layers)
             initialize_uninitialized_variables(variables)
 
-            input_variables = create_input_variables(self.input_layers)
-
-            with self.disable_training_state():
+            with graph.as_default(), self.disable_training_state():
+                input_variables = create_input_variables(
+                    self.input_layers, find_float_type(variables))
                 self.computation_cache[cache_key] = {
                     'inputs': input_variables,
                     'outputs': self.output(*input_variables),
                 }
 
-        graph = self.computation_cache[cache_key]
-        feed_dict = dict(zip(graph['inputs'], inputs))
+        computation = self.computation_cache[cache_key]
+        feed_dict = dict(zip(computation['inputs'], inputs))
 
-        return session.run(graph['outputs'], feed_dict=feed_dict)
+        return session.run(computation['outputs'], feed_dict=feed_dict)
 
 
 def make_common_graph(left_layer, right_layer):
@@ -214,47 +227,6 @@ def make_common_graph(left_layer, right_layer):
     return graph
 
 
-def topological_sort(graph):
-    """
-    Repeatedly go through all of the nodes in the graph, moving each of
-    the nodes that has all its edges resolved, onto a sequence that
-    forms our sorted graph. A node has all of its edges resolved and
-    can be moved once all the nodes its edges point to, have been moved
-    from the unsorted graph onto the sorted one.
-
-    Parameters
-    ----------
-    graph : dict
-        Dictionary that has graph structure.
-
-    Raises
-    ------
-    RuntimeError
-        If graph has cycles.
-
-    Returns
-    -------
-    list
-        List of nodes sorted in topological order.
-    """
-    sorted_nodes = []
-    graph_unsorted = graph.copy()
-
-    while graph_unsorted:
-        acyclic = False
-
-        for node, edges in list(graph_unsorted.items()):
-            if all(edge not in graph_unsorted for edge in edges):
-                acyclic = True
-                del graph_unsorted[node]
-                sorted_nodes.append(node)
-
-        if not acyclic:
-            raise RuntimeError("A cyclic dependency occurred")
-
-    return sorted_nodes
-
-
 class ParallelConnection(BaseConnection):
     """
     Connection between separate layer networks in parallel.
@@ -677,7 +649,7 @@ class LayerConnection(BaseConnection):
         return len(self.graph.forward_graph)
 
     def __iter__(self):
-        for layer in topological_sort(self.graph.backward_graph):
+        for layer in self.graph.topological_order:
             yield layer
 
     def __repr__(self):
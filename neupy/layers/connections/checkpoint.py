@@ -0,0 +1,234 @@
+import six
+import tensorflow as tf
+
+
+__all__ = ('recompute_gradients', 'checkpointed_output')
+
+
+def recompute_gradients(function, inputs, parameters, recompute=None):
+    """
+    Applies function to the inputs without storing intermediate
+    values that are required for the gradient computation.
+    Instead, they will be recomputed from the inputs during the
+    backward pass.
+
+    Parameters
+    ----------
+    function : callable
+        Function that accepts inputs and returns list of outputs.
+
+    inputs : list of Tensorfow variables
+
+    parameters : list of Tensorfow variables
+        Parameters used by the function. Gradients with respect to
+        the parameters will be propagated through the recomputed
+        values.
+
+    recompute : callable or None
+        Function that will be used in order to recompute outputs
+        during the backward pass. It has to produce the same
+        outputs as the main function. Defaults to ``None``, which
+        means that the main function will be used.
+
+    Returns
+    -------
+    list of Tensorfow variables
+    """
+    n_inputs = len(inputs)
+
+    if recompute is None:
+        recompute = function
+
+    @tf.custom_gradient
+    def apply_function(*arguments):
+        outputs = function(*arguments[:n_inputs])
+
+        def gradient(*output_gradients):
+            # Gradients for the outputs make sure that values will
+            # be recomputed only during the backward pass
+            with tf.control_dependencies(output_gradients):
+                input_copies = [
+                    tf.identity(value) for value in arguments[:n_inputs]]
+
+            recomputed_outputs = recompute(*input_copies)
+
+            return tf.gradients(
+                recomputed_outputs,
+                input_copies + list(arguments[n_inputs:]),
+                grad_ys=output_gradients,
+            )
+
+        return outputs, gradient
+
+    return apply_function(*(list(inputs) + list(parameters)))
+
+
+def find_checkpoints(graph, layers, checkpoints):
+    if isinstance(checkpoints, int):
+        if checkpoints < 1:
+            raise ValueError("Number of layers between checkpoints should "
+                             "be a positive integer, got {}"
+                             "".format(checkpoints))
+
+        return set(layers[checkpoints - 1::checkpoints])
+
+    checkpoint_layers = set()
+
+    for layer in checkpoints:
+        if isinstance(layer, six.string_types):
+            layer = graph.find_layer_by_name(layer)
+
+        if layer not in graph.forward_graph:
+            raise ValueError("The `{}` layer doesn't appear "
+                             "in the graph".format(layer))
+
+        checkpoint_layers.add(layer)
+
+    return checkpoint_layers
+
+
+def propagate_segment(graph, layers, input_layers, output_layers,
+                      keep_updates=True):
+    """
+    Creates function that propagates input values from the input
+    layers through the segment's layers and returns outputs from the
+    specified layers.
+
+    Parameters
+    ----------
+    graph : LayerGraph
+    layers : list of layers
+        Layers in topological order.
+    input_layers : list of layers
+    output_layers : list of layers
+    keep_updates : bool
+        If ``False``, updates defined by layers during the propagation,
+        like the ones from the batch normalization layer, will be
+        discarded. Defaults to ``True``.
+    """
+    def propagate(*input_values):
+        values = dict(zip(input_layers, input_values))
+        layer_updates = [layer.updates for layer in layers]
+
+        for layer in layers:
+            inputs = [values[input_layer]
+                      for input_layer in graph.backward_graph[layer]]
+            values[layer] = layer.output(*inputs)
+
+        if not keep_updates:
+            for layer, updates in zip(layers, layer_updates):
+                layer.updates = updates
+
+        return [values[layer] for layer in output_layers]
+
+    return propagate
+
+
+def checkpointed_output(connection, input_values, checkpoints):
+    """
+    Propagates input values through the connection and stores only
+    outputs from the checkpoint layers. Layers between checkpoints
+    will be recomputed during the backward pass, which reduces amount
+    of memory required for training at cost of the additional forward
+    pass.
+
+    Layers that generate random values, like :layer:`Dropout`, won't
+    be recomputed, since recomputed values will be different.
+
+    Parameters
+    ----------
+    connection : connection
+
+    input_values : list of Tensorfow variables
+        Inputs for each input layer.
+
+    checkpoints : list or int
+        List of layers or layer names which outputs will be stored.
+        Integer value means that output from every n-th layer will
+        be stored.
+
+    Returns
+    -------
+    Tensorfow variable or list of Tensorfow variables
+        Output from the final layer/layers.
+    """
+    # Note: Import it here in order to prevent loops
+    from neupy.layers.stochastic import Dropout, GaussianNoise
+
+    graph = connection.graph
+    outputs = {}
+
+    for input_layer, input_value in zip(connection.input_layers,
+                                        input_values):
+        outputs[input_layer] = input_layer.output(input_value)
+
+    layers = [layer for layer in graph.topological_order
+              if layer not in outputs]
+    checkpoints = find_checkpoints(graph, layers, checkpoints)
+
+    segments = []
+    segment = []
+
+    for layer in layers:
+        if isinstance(layer, (Dropout, GaussianNoise)):
+            segments.extend([segment, [layer]])
+            segment = []
+            continue
+
+        segment.append(layer)
+
+        if layer in checkpoints:
+            segments.append(segment)
+            segment = []
+
+    segments.append(segment)
+    final_layers = set(connection.output_layers)
+
+    for segment in segments:
+        if not segment:
+            continue
+
+        segment_layers = set(segment)
+        input_layers = []
+
+        for layer in segment:
+            for input_layer in graph.backward_graph[layer]:
+                if input_layer not in segment_layers and \
+                        input_layer not in input_layers:
+                    input_layers.append(input_layer)
+
+        output_layers = [
+            layer for layer in segment if layer in final_layers or any(
+                next_layer not in segment_layers
+                for next_layer in graph.forward_graph[layer])
+        ]
+
+        propagate = propagate_segment(
+            graph, segment, input_layers, output_layers)
+        inputs = [outputs[layer] for layer in input_layers]
+
+        if len(segment) == 1:
+            # There is nothing to recompute, since output
+            # from the layer will be stored anyway
+            segment_outputs = propagate(*inputs)
+        else:
+            parameters = [
+                tf.convert_to_tensor(parameter)
+                for layer in segment
+                for parameter in layer.parameters.values()
+            ]
+            # Updates have to be defined by the forward pass
+            recompute = propagate_segment(
+                graph, segment, input_layers, output_layers,
+                keep_updates=False)
+            segment_outputs = recompute_gradients(
+                propagate, inputs, parameters, recompute)
+
+        outputs.update(zip(output_layers, segment_outputs))
+
+    results = [outputs[layer] for layer in connection.output_layers]
+
+    if len(results) == 1:
+        return results[0]
+
+    return results
@@ -32,6 +32,9 @@ def filter_list(iterable, include_values):
     list
         Filtered list.
     """
+    if not isinstance(include_values, (set, frozenset)):
+        include_values = set(include_values)
+
     filtered_list = []
 
     for value in iterable:
@@ -60,6 +63,7 @@ def filter_dict(dictionary, include_keys):
     dict
     """
     filtered_dict = OrderedDict()
+    include_keys = set(include_keys)
 
     for key, value in dictionary.items():
         if key in include_keys:
@@ -144,6 +148,112 @@ def is_cyclic(graph):
     return any(visit(vertex) for vertex in graph)
 
 
+def has_path(graph, from_vertex, to_vertex):
+    """
+    Check if there is a path between two vertices in the graph.
+
+    Parameters
+    ----------
+    graph : dict
+        must be represented as a dictionary mapping vertices to
+        iterables of neighbouring vertices.
+
+    from_vertex : object
+    to_vertex : object
+
+    Returns
+    -------
+    bool
+
+    Examples
+    --------
+    >>> has_path({1: (2,), 2: (3,), 3: ()}, 1, 3)
+    True
+    >>> has_path({1: (2,), 2: (3,), 3: ()}, 3, 1)
+    False
+    """
+    visited = set([from_vertex])
+    vertices = [from_vertex]
+
+    while vertices:
+        vertex = vertices.pop()
+
+        if vertex == to_vertex:
+            return True
+
+        for neighbour in graph.get(vertex, ()):
+            if neighbour not in visited:
+                visited.add(neighbour)
+                vertices.append(neighbour)
+
+    return False
+
+
+def topological_sort(graph):
+    """
+    Repeatedly go through all of the nodes in the graph, moving each of
+    the nodes that has all its edges resolved, onto a sequence that
+    forms our sorted graph. A node has all of its edges resolved and
+    can be moved once all the nodes its edges point to, have been moved
+    from the unsorted graph onto the sorted one.
+
+    Instead of doing passes over the graph, function finds for
+    each node the pass on which it would be moved, which makes it
+    linear with respect to the number of edges in the graph.
+
+    Parameters
+    ----------
+    graph : dict
+        Dictionary that has graph structure.
+
+    Raises
+    ------
+    RuntimeError
+        If graph has cycles.
+
+    Returns
+    -------
+    list
+        List of nodes sorted in topological order.
+    """
+    positions = {node: position for position, node in enumerate(graph)}
+    dependent_nodes = {node: [] for node in graph}
+    n_unresolved_edges = {}
+
+    for node, edges in graph.items():
+        edges = [edge for edge in edges if edge in positions]
+        n_unresolved_edges[node] = len(edges)
+
+        for edge in edges:
+            dependent_nodes[edge].append(node)
+
+    passes = dict.fromkeys(graph, 0)
+    resolved_nodes = [node for node in graph if not n_unresolved_edges[node]]
+    n_resolved = 0
+
+    while resolved_nodes:
+        node = resolved_nodes.pop()
+        n_resolved += 1
+
+        for dependent_node in dependent_nodes[node]:
+            # Node that appears after its dependency will be
+            # moved on the same pass, otherwise on the next one
+            node_pass = passes[node]
+            if positions[node] > positions[dependent_node]:
+                node_pass += 1
+
+            passes[dependent_node] = max(passes[dependent_node], node_pass)
+            n_unresolved_edges[dependent_node] -= 1
+
+            if not n_unresolved_edges[dependent_node]:
+                resolved_nodes.append(dependent_node)
+
+    if n_resolved != len(positions):
+        raise RuntimeError("A cyclic dependency occurred")
+
+    return sorted(graph, key=lambda node: (passes[node], positions[node]))
+
+
 def does_layer_expect_one_input(layer):
     """
     Check whether layer can except only one input layer.
@@ -193,6 +303,13 @@ class LayerGraph(object):
     forward_graph : None or dict
     backward_graph : None or dict
 
+    Attributes
+    ----------
+    cache : dict
+        Values computed from the graph's structure, like topological
+        order and list of input layers. Cache is cleared every time
+        new layer or connection is added to the graph.
+
     Raises
     ------
     LayerConnectionError
@@ -207,6 +324,7 @@ class LayerGraph(object):
 
         self.forward_graph = forward_graph
         self.backward_graph = backward_graph
+        self.cache = {}
 
     @classmethod
     def merge(cls, left_graph, right_graph):
@@ -260,6 +378,7 @@ class LayerGraph(object):
 
         self.forward_graph[layer] = []
         self.backward_graph[layer] = []
+        self.cache.clear()
 
         return True
 
@@ -300,8 +419,11 @@ class LayerGraph(object):
 
         forward_connections.append(to_layer)
         backward_connections.append(from_layer)
+        self.cache.clear()
 
-        if is_cyclic(self.forward_graph):
+        # Graph didn't have cycles before, which means that
+        # new cycle has to go through the added connection
+        if has_path(self.forward_graph, to_layer, from_layer):
             raise LayerConnectionError(
                 "Cannot connect layer `{}` to `{}`, because this "
                 "connection creates cycle in the graph."
@@ -430,7 +552,7 @@ class LayerGraph(object):
         if all(layer not in self.forward_graph for layer in output_layers):
             return LayerGraph()
 
-        observed_layers = []
+        observed_layers = set()
         layers = copy.copy(output_layers)
 
         while layers:
@@ -441,7 +563,7 @@ class LayerGraph(object):
                 if next_layer not in observed_layers:
                     layers.append(next_layer)
 
-            observed_layers.append(current_layer)
+            observed_layers.add(current_layer)
 
         forward_subgraph = filter_dict(self.forward_graph, observed_layers)
         backward_subgraph = filter_dict(self.backward_graph, observed_layers)
@@ -507,13 +629,13 @@ class LayerGraph(object):
         list
             List of input layers.
         """
-        input_layers = []
+        if 'input_layers' not in self.cache:
+            self.cache['input_layers'] = [
+                layer for layer, next_layers in self.backward_graph.items()
+                if not next_layers
+            ]
 
-        for layer, next_layers in self.backward_graph.items():
-            if not next_layers:
-                input_layers.append(layer)
-
-        return input_layers
+        return list(self.cache['input_layers'])
 
     @property
     def output_layers(self):
@@ -530,13 +652,28 @@ class LayerGraph(object):
         list
             List of output layers.
         """
-        output_layers = []
+        if 'output_layers' not in self.cache:
+            self.cache['output_layers'] = [
+                layer for layer, next_layers in self.forward_graph.items()
+                if not next_layers
+            ]
 
-        for layer, next_layers in self.forward_graph.items():
-            if not next_layers:
-                output_layers.append(layer)
+        return list(self.cache['output_layers'])
 
-        return output_layers
+    @property
+    def topological_order(self):
+        """
+        Layers sorted in topological order.
+
+        Returns
+        -------
+        tuple
+        """
+        if 'topological_order' not in self.cache:
+            self.cache['topological_order'] = tuple(
+                topological_sort(self.backward_graph))
+
+        return self.cache['topological_order']
 
     def find_layer_by_name(self, layer_name):
         """
@@ -603,26 +740,21 @@ class LayerGraph(object):
             for input_layer in self.input_layers:
                 outputs[input_layer] = input_layer.output(input_value)
 
-        def output_from_layer(layer):
-            if layer in outputs:
-                return outputs[layer]
-
+        for layer in self.topological_order:
             input_layers = self.backward_graph[layer]
-            inputs = []
-            for input_layer in input_layers:
-                if input_layer in outputs:
-                    res = outputs[input_layer]
-                else:
-                    res = output_from_layer(input_layer)
-                    outputs[input_layer] = res
 
-                inputs.append(res)
+            # Layers before the ones that received input
+            # values directly don't have to be computed
+            if layer in outputs or not input_layers:
+                continue
 
-            return layer.output(*inputs)
+            if all(input_layer in outputs for input_layer in input_layers):
+                inputs = [outputs[input_layer] for input_layer in input_layers]
+                outputs[layer] = layer.output(*inputs)
 
         results = []
         for output_layer in self.output_layers:
-            results.append(output_from_layer(output_layer))
+            results.append(outputs[output_layer])
 
         if len(results) == 1:
             results = results[0]
@@ -0,0 +1,382 @@
+import six
+import tensorflow as tf
+
+from neupy.utils import (tensorflow_session, find_graph, find_float_type,
+                         initialize_uninitialized_variables)
+from .utils import extract_connection, find_variables
+from .connections.base import create_input_variables
+from .activations import ActivationLayer, Linear
+from .convolutions import Convolution
+from .normalization import BatchNorm
+from .stochastic import Dropout, GaussianNoise
+from .base import Identity
+
+
+__all__ = ('InferenceConnection', 'optimize_for_inference')
+
+
+class InferenceStep(object):
+    """
+    Single operation in the inference graph.
+
+    Parameters
+    ----------
+    layer : layer
+        Layer that produced this step. In case if other layers were
+        fused into the step, it will be the last of them.
+
+    inputs : list of layers
+        Layers which outputs will be propagated through the step.
+        Input layer of the network references itself, which means
+        that step takes value from the network's input.
+
+    operation : {``layer``, ``convolution``, ``dense``, ``scale``}
+        Operation that step performs on the input. The ``layer``
+        operation uses layer's own output method.
+
+    weight : array-like or None
+        Kernel for the ``convolution`` and ``dense`` operations and
+        multiplier for the ``scale`` operation.
+
+    bias : array-like or None
+        Value that will be added to the result of the operation.
+
+    activation : callable or None
+        Function that will be applied to the output.
+    """
+    def __init__(self, layer, inputs, operation='layer',
+                 weight=None, bias=None, activation=None):
+        self.layer = layer
+        # Layer might be replaced after fusion, but convolution
+        # options have to be taken from the original layer
+        self.operation_layer = layer
+        self.inputs = inputs
+        self.operation = operation
+        self.weight = weight
+        self.bias = bias
+        self.activation = activation
+
+    @property
+    def is_affine(self):
+        return (self.operation in ('convolution', 'dense') and
+                self.activation is None)
+
+    def output(self, *input_values):
+        if self.operation == 'layer':
+            return self.layer.output(*input_values)
+
+        input_value, = input_values
+
+        if self.operation == 'scale':
+            return input_value * self.weight + self.bias
+
+        if self.operation == 'convolution':
+            padding = self.operation_layer.padding
+
+            if not isinstance(padding, six.string_types):
+                height_pad, width_pad = padding
+                input_value = tf.pad(input_value, [
+                    [0, 0],
+                    [height_pad, height_pad],
+                    [width_pad, width_pad],
+                    [0, 0],
+                ])
+                padding = 'VALID'
+
+            output = tf.nn.convolution(
+                input_value,
+                self.weight,
+                padding=padding,
+                strides=self.operation_layer.stride,
+                dilation_rate=self.operation_layer.dilation,
+                data_format="NHWC"
+            )
+
+        else:
+            output = tf.matmul(input_value, self.weight)
+
+        if self.bias is not None:
+            # Unlike regular addition, bias_add can be fused with
+            # the previous convolution or matrix multiplication
+            output = tf.nn.bias_add(output, self.bias)
+
+        if self.activation is not None:
+            output = self.activation(output)
+
+        return output
+
+
+def is_channel_wise(parameter):
+    """
+    Checks whether batch normalization parameter has
+    different values only along the last dimension.
+    """
+    return all(dimension == 1 for dimension in parameter.shape[:-1])
+
+
+class InferenceConnection(object):
+    """
+    Inference-only version of the connection. Graph is optimized
+    in the following way.
+
+    - Stochastic layers, like :layer:`Dropout` and
+      :layer:`GaussianNoise`, and :layer:`Identity` layers
+      are removed from the graph.
+
+    - Running statistics of the :layer:`BatchNorm` layer are folded
+      into weights and bias of the preceding :layer:`Convolution` or
+      :layer:`Linear` layer. Other batch normalization layers are
+      replaced with single multiplication and addition.
+
+    - Bias and activation function are applied right after the
+      convolution or matrix multiplication, which allows Tensorflow
+      to fuse them into single operation.
+
+    Parameters are stored in the graph as constants, which means
+    that changes made after the optimization won't be propagated
+    to the inference connection.
+
+    Parameters
+    ----------
+    connection : connection
+        Connection that will be optimized.
+
+    Attributes
+    ----------
+    input_layers : list
+        List of input layers.
+
+    output_layers : list
+        List of output layers.
+
+    steps : list of InferenceStep
+        Topologicaly sorted list of operations.
+
+    Methods
+    -------
+    output(\\*input_values)
+        Propagate input values through the optimized graph.
+
+    predict(\\*inputs)
+        Propagates input throught the optimized graph and
+        returns output from it.
+    """
+    removable_layers = (Dropout, GaussianNoise, Identity)
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.input_layers = connection.input_layers
+        self.output_layers = connection.output_layers
+        self.computation_cache = {}
+
+        variables = find_variables(connection)
+        # Layer might belong to the network that has its own graph
+        self.tensorflow_graph = find_graph(variables)
+        self.float_type = find_float_type(variables)
+        initialize_uninitialized_variables(variables)
+
+        layers = [layer for layer in connection if layer.parameters]
+        parameters = tensorflow_session(self.tensorflow_graph).run([
+            dict(layer.parameters) for layer in layers])
+
+        self.parameters = {layer: {} for layer in connection}
+        self.parameters.update(zip(layers, parameters))
+
+        self.sources = self.find_sources()
+        self.steps = self.build_steps()
+
+    def find_sources(self):
+        """
+        Finds layer which output has to be used instead of the
+        output from the removed layers.
+        """
+        sources = {}
+        backward_graph = self.connection.graph.backward_graph
+
+        for layer in self.connection:
+            input_layers = backward_graph[layer]
+            sources[layer] = layer
+
+            if isinstance(layer, self.removable_layers):
+                if len(input_layers) == 1:
+                    sources[layer] = sources[input_layers[0]]
+
+        return sources
+
+    def build_steps(self):
+        backward_graph = self.connection.graph.backward_graph
+        layers = [layer for layer in self.connection
+                  if self.sources[layer] is layer]
+
+        n_consumers = dict.fromkeys(layers, 0)
+        for layer in layers:
+            for input_layer in backward_graph[layer]:
+                n_consumers[self.sources[input_layer]] += 1
+
+        for layer in self.output_layers:
+            n_consumers[self.sources[layer]] += 1
+
+        steps = {}
+
+        for layer in layers:
+            step = None
+            parameters = self.parameters[layer]
+
+            if layer in self.input_layers:
+                inputs = [layer]
+            else:
+                inputs = [self.sources[input_layer]
+                          for input_layer in backward_graph[layer]]
+
+                # Only the step that has single consumer can be
+                # modified, since other layers expect original output
+                if len(inputs) == 1 and n_consumers[inputs[0]] == 1:
+                    step = steps[inputs[0]]
+
+            if isinstance(layer, BatchNorm):
+                scale = parameters['gamma'] * parameters['running_inv_std']
+                shift = parameters['beta'] - parameters['running_mean'] * scale
+
+                if step is None or not step.is_affine \
+                        or not is_channel_wise(scale):
+                    steps[layer] = InferenceStep(
+                        layer, inputs, operation='scale',
+                        weight=scale, bias=shift)
+                    continue
+
+                scale, shift = scale.ravel(), shift.ravel()
+                bias = step.bias if step.bias is not None else 0
+
+                step.weight = step.weight * scale
+                step.bias = bias * scale + shift
+
+            elif isinstance(layer, ActivationLayer) and layer.size is None \
+                    and step is not None and step.is_affine:
+                step.activation = layer.activation_function
+
+            elif type(layer) is Convolution:
+                step = InferenceStep(
+                    layer, inputs, operation='convolution',
+                    weight=parameters['weight'],
+                    bias=parameters.get('bias'))
+
+            elif isinstance(layer, ActivationLayer) and layer.size is not None:
+                activation = None
+                if type(layer) is not Linear:
+                    activation = layer.activation_function
+
+                step = InferenceStep(
+                    layer, inputs, operation='dense',
+                    weight=parameters['weight'],
+                    bias=parameters.get('bias'),
+                    activation=activation)
+
+            else:
+                step = InferenceStep(layer, inputs)
+
+            # Layer that was fused into the next one
+            # won't be referenced by other layers
+            steps.pop(step.layer, None)
+            step.layer = layer
+            steps[layer] = step
+
+        return [steps[layer] for layer in layers if layer in steps]
+
+    def output(self, *input_values):
+        """
+        Propagate input values through the optimized graph.
+
+        Parameters
+        ----------
+        *input_values
+            Inputs for each input layer.
+
+        Returns
+        -------
+        Tensorfow expression or list of expressions
+        """
+        if len(input_values) != len(self.input_layers):
+            raise ValueError(
+                "Connection has {} input layer(s), but {} inputs was "
+                "provided".format(len(self.input_layers), len(input_values)))
+
+        values = dict(zip(self.input_layers, input_values))
+
+        with self.connection.disable_training_state():
+            for step in self.steps:
+                step_inputs = [values[layer] for layer in step.inputs]
+                values[step.layer] = step.output(*step_inputs)
+
+        outputs = [values[self.sources[layer]] for layer in self.output_layers]
+
+        if len(outputs) == 1:
+            return outputs[0]
+
+        return outputs
+
+    def predict(self, *inputs):
+        """
+        Using current tensorflow session this method propagates
+        input throught the optimized graph and returns output from it.
+        """
+        session = tensorflow_session(self.tensorflow_graph)
+        cache_key = (session, id(self))
+
+        if cache_key not in self.computation_cache:
+            with self.tensorflow_graph.as_default():
+                input_variables = create_input_variables(
+                    self.input_layers, self.float_type)
+                self.computation_cache[cache_key] = {
+                    'inputs': input_variables,
+                    'outputs': self.output(*input_variables),
+                }
+
+        graph = self.computation_cache[cache_key]
+        feed_dict = dict(zip(graph['inputs'], inputs))
+
+        return session.run(graph['outputs'], feed_dict=feed_dict)
+
+    def __iter__(self):
+        for step in self.steps:
+            yield step.layer
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __repr__(self):
+        return '{}({} layers -> {} steps)'.format(
+            self.__class__.__name__, len(self.sources), len(self.steps))
+
+
+def optimize_for_inference(connection):
+    """
+    Creates inference-only version of the connection with
+    optimized graph.
+
+    Parameters
+    ----------
+    connection : network, connection or list of layers
+
+    Returns
+    -------
+    InferenceConnection
+
+    Examples
+    --------
+    >>> from neupy import layers
+    >>>
+    >>> connection = layers.join(
+    ...     layers.Input((28, 28, 1)),
+    ...     layers.Convolution((3, 3, 16), bias=None),
+    ...     layers.BatchNorm(),
+    ...     layers.Relu(),
+    ...     layers.Dropout(0.5),
+    ...     layers.Reshape(),
+    ...     layers.Softmax(10),
+    ... )
+    >>> inference_connection = layers.optimize_for_inference(connection)
+    >>> inference_connection
+    InferenceConnection(7 layers -> 4 steps)
+    """
+    connection = extract_connection(connection)
+    return InferenceConnection(connection)
@@ -2,14 +2,17 @@ import numpy as np
 import tensorflow as tf
 
 from neupy import init
-from neupy.utils import AttributeKeyDict, as_tuple, tensorflow_session
+from neupy.utils import (AttributeKeyDict, as_tuple, tensorflow_session,
+                         find_graph, find_float_type,
+                         initialize_uninitialized_variables)
 from neupy.exceptions import LayerConnectionError
 from neupy.core.properties import (IntProperty, Property, NumberProperty,
                                    ParameterProperty)
+from .utils import extract_connection, find_variables
 from .base import BaseLayer
 
 
-__all__ = ('LSTM', 'GRU')
+__all__ = ('LSTM', 'GRU', 'StatefulConnection')
 
 
 def clip_gradient(value, clip_value):
@@ -60,7 +63,12 @@ def unroll_scan(fn, sequence, outputs_info):
         outputs = []
         prev_vals = outputs_info
 
-        for entity in tf.unstack(sequence):
+        if isinstance(sequence, (list, tuple)):
+            entities = zip(*[tf.unstack(value) for value in sequence])
+        else:
+            entities = tf.unstack(sequence)
+
+        for entity in entities:
             output = fn(prev_vals, entity)
             outputs.append(output[-1])
             prev_vals = output
@@ -68,6 +76,30 @@ def unroll_scan(fn, sequence, outputs_info):
         return tf.stack(outputs)
 
 
+def project_sequence(sequence, weights, biases):
+    """
+    Applies input weights to the inputs from all time steps with single
+    matrix multiplication. It's faster than doing multiplication at
+    every step of the recurrence, since one large matrix multiplication
+    uses BLAS more efficiently than many small ones.
+
+    Parameters
+    ----------
+    sequence : Tensorfow variable
+        Tensor with shape ``(n_time_steps, n_batch, n_features)``.
+
+    weights : Tensorfow variable
+    biases : Tensorfow variable
+
+    Returns
+    -------
+    Tensorfow variable
+        Tensor with shape ``(n_time_steps, n_batch, n_outputs)``.
+    """
+    with tf.name_scope('input-projection'):
+        return tf.tensordot(sequence, weights, axes=[[2], [0]]) + biases
+
+
 class MultiCallableProperty(ParameterProperty):
     expected_type = as_tuple(dict)
 
@@ -111,6 +143,36 @@ class BaseRNNLayer(BaseLayer):
         optimization which saves memory. Defaults to ``True``.
 
     {BaseLayer.Parameters}
+
+    Notes
+    -----
+    Layer accepts optional second input with the length of each
+    sequence in the mini-batch. Sequences have to be padded at the
+    end. Hidden states stop changing after the last step of the
+    sequence, the final output is taken from the last step of each
+    sequence and outputs for the padded steps are equal to zero.
+    The recurrence stops after the last step of the longest
+    sequence in the mini-batch, which means that sequences with
+    similar lengths can be processed faster when they're grouped
+    into the same mini-batch (see
+    :func:`bucket_by_sequence_length
+    <neupy.algorithms.utils.bucket_by_sequence_length>`).
+
+    .. code-block:: python
+
+        from neupy import layers
+
+        sequence = layers.Input(n_time_steps)
+        sequence_length = layers.Input(1)
+
+        network = layers.join(
+            [
+                sequence > layers.Embedding(n_categories, 10),
+                sequence_length,
+            ],
+            layers.LSTM(20),
+            layers.Sigmoid(1),
+        )
     """
     size = IntProperty(minval=1)
     only_return_final = Property(default=True, expected_type=bool)
@@ -118,6 +180,34 @@ class BaseRNNLayer(BaseLayer):
     def __init__(self, size, **kwargs):
         super(BaseRNNLayer, self).__init__(size=size, **kwargs)
 
+    @property
+    def input_shape(self):
+        return self.input_shape_
+
+    @input_shape.setter
+    def input_shape(self, shape):
+        # Layer receives list of shapes, because it has
+        # optional input with lengths of the sequences
+        if isinstance(shape, list):
+            clsname = self.__class__.__name__
+
+            if len(shape) not in (1, 2):
+                raise LayerConnectionError(
+                    "{} layer expects sequence and, optionally, their "
+                    "lengths as inputs, got {} inputs instead"
+                    "".format(clsname, len(shape)))
+
+            if len(shape) == 2 and np.prod(shape[1]) != 1:
+                raise LayerConnectionError(
+                    "{} layer expects one sequence length value per "
+                    "sample, got input with shape {}".format(
+                        clsname, shape[1]))
+
+            shape = shape[0]
+
+        self.validate(shape)
+        self.input_shape_ = shape
+
     def validate(self, input_shape):
         n_input_dims = len(input_shape) + 1  # +1 for batch dimension
         clsname = self.__class__.__name__
@@ -136,6 +226,158 @@ class BaseRNNLayer(BaseLayer):
         n_time_steps = self.input_shape[0]
         return as_tuple(n_time_steps, self.size)
 
+    @property
+    def initial_states(self):
+        """
+        List of parameters with initial states of the recurrence.
+        Each parameter has shape ``(1, size)``.
+        """
+        raise NotImplementedError
+
+    def recurrent_step(self, states, input_n):
+        """
+        Computes new states of the recurrence from the states
+        of the previous step and projected input for the current
+        step. The last state is an output from the step.
+        """
+        raise NotImplementedError
+
+    def tile_initial_states(self, n_batch):
+        return [tf.tile(state, (n_batch, 1)) for state in self.initial_states]
+
+    def output_step(self, input_value, states):
+        """
+        Applies single step of the recurrence.
+
+        Parameters
+        ----------
+        input_value : Tensorfow variable
+            Input for the current time step with shape
+            ``(n_batch, n_features)``.
+
+        states : list of Tensorfow variables
+            States from the previous step.
+
+        Returns
+        -------
+        list of Tensorfow variables
+            New states. The last state is an output from the layer.
+        """
+        input_value = tf.matmul(input_value, self.input_weights) + self.biases
+        return self.recurrent_step(states, input_value)
+
+    def apply_recurrence(self, step, sequence, initial_states,
+                         sequence_length=None, name=None):
+        """
+        Applies recurrent step to each element of the sequence
+        and builds output from the layer.
+
+        Parameters
+        ----------
+        step : callable
+            Function that accepts list of states from the previous
+            step and input for the current step and returns list of
+            the new states. The last state is used as an output.
+
+        sequence : Tensorfow variable
+            Tensor with shape ``(n_time_steps, n_batch, n_features)``.
+
+        initial_states : list of Tensorfow variables
+
+        sequence_length : Tensorfow variable or None
+            Length of each sequence in the mini-batch. ``None`` means
+            that all steps of the sequences have to be processed.
+
+        name : str or None
+            Name of the scan operation.
+
+        Returns
+        -------
+        Tensorfow variable
+        """
+        n_time_steps = tf.shape(sequence)[0]
+        mask = None
+
+        if sequence_length is not None:
+            sequence_length = tf.to_int32(tf.reshape(sequence_length, [-1]))
+
+            if not self.unroll_scan:
+                # There is no need to process steps that follow
+                # after the end of the longest sequence
+                sequence = sequence[:tf.reduce_max(sequence_length)]
+
+            n_steps = tf.shape(sequence)[0]
+
+            if self.unroll_scan:
+                # Unrolled recurrence requires static number of steps
+                n_steps = sequence.shape[0].value
+
+            mask = tf.sequence_mask(
+                sequence_length, n_steps, dtype=sequence.dtype)
+            mask = tf.expand_dims(tf.transpose(mask), axis=-1)
+
+            def masked_step(states, elements):
+                input_n, mask_n = elements
+                new_states = step(states, input_n)
+
+                # Finished sequences keep their last states
+                return [
+                    mask_n * new_state + (1 - mask_n) * state
+                    for new_state, state in zip(new_states, states)
+                ]
+
+        def reverse(value):
+            if sequence_length is None:
+                return tf.reverse(value, axis=[0])
+
+            # Padded steps have to stay at the end of the sequence
+            return tf.reverse_sequence(
+                value, sequence_length, seq_axis=0, batch_axis=1)
+
+        if self.backwards:
+            sequence = reverse(sequence)
+
+        if mask is not None:
+            sequence = (sequence, mask)
+            step_function = masked_step
+        else:
+            step_function = step
+
+        if self.unroll_scan:
+            # Explicitly unroll the recurrence instead of using scan
+            output = unroll_scan(
+                fn=step_function,
+                sequence=sequence,
+                outputs_info=initial_states,
+            )
+        else:
+            states = tf.scan(
+                fn=step_function,
+                elems=sequence,
+                initializer=initial_states,
+                name=name,
+            )
+            output = states[-1]
+
+        # When it is requested that we only return the final sequence step,
+        # we need to slice it out immediately after scan is applied
+        if self.only_return_final:
+            return output[-1]
+
+        if mask is not None:
+            output *= mask
+
+        # if scan is backward reverse the output
+        if self.backwards:
+            output = reverse(output)
+
+        if mask is not None and not self.unroll_scan:
+            n_skipped_steps = n_time_steps - tf.shape(output)[0]
+            output = tf.pad(output, [[0, n_skipped_steps], [0, 0], [0, 0]])
+
+        # dimshuffle back to (n_batch, n_time_steps, n_features))
+        return tf.transpose(output, [1, 0, 2])
+
 
 class LSTM(BaseRNNLayer):
     """
@@ -230,6 +472,8 @@ class LSTM(BaseRNNLayer):
     Code was adapted from the
     `Lasagne <https://github.com/Lasagne/Lasagne>`_ library.
 
+    {BaseRNNLayer.Notes}
+
     Examples
     --------
 
@@ -325,87 +569,67 @@ class LSTM(BaseRNNLayer):
             trainable=self.learn_init,
         )
 
-    def output(self, input_value):
-        # Because scan iterates over the first dimension we
-        # dimshuffle to (n_time_steps, n_batch, n_features)
-        input_value = tf.transpose(input_value, [1, 0, 2])
-        input_shape = tf.shape(input_value)
-        n_batch = input_shape[1]
-
-        def one_lstm_step(states, input_n):
-            with tf.name_scope('lstm-cell'):
-                cell_previous, hid_previous = states
-                input_n = tf.matmul(input_n, self.input_weights) + self.biases
-
-                # Calculate gates pre-activations and slice
-                gates = input_n + tf.matmul(hid_previous, self.hidden_weights)
-
-                # Clip gradients
-                if self.gradient_clipping != 0:
-                    gates = clip_gradient(gates, self.gradient_clipping)
+    @property
+    def initial_states(self):
+        return [self.cell_init, self.hidden_init]
 
-                # Extract the pre-activation gate values
-                ingate, forgetgate, cell_input, outgate = tf.split(
-                    gates, 4, axis=1)
+    def recurrent_step(self, states, input_n):
+        with tf.name_scope('lstm-cell'):
+            cell_previous, hid_previous = states
 
-                if self.peepholes:
-                    # Compute peephole connections
-                    ingate += cell_previous * self.weight_cell_to_ingate
-                    forgetgate += (
-                        cell_previous * self.weight_cell_to_forgetgate)
+            # Calculate gates pre-activations and slice
+            gates = input_n + tf.matmul(hid_previous, self.hidden_weights)
 
-                # Apply nonlinearities
-                ingate = self.activation_functions.ingate(ingate)
-                forgetgate = self.activation_functions.forgetgate(forgetgate)
-                cell_input = self.activation_functions.cell(cell_input)
+            # Clip gradients
+            if self.gradient_clipping != 0:
+                gates = clip_gradient(gates, self.gradient_clipping)
 
-                # Compute new cell value
-                cell = forgetgate * cell_previous + ingate * cell_input
+            # Extract the pre-activation gate values
+            ingate, forgetgate, cell_input, outgate = tf.split(
+                gates, 4, axis=1)
 
-                if self.peepholes:
-                    outgate += cell * self.weight_cell_to_outgate
+            if self.peepholes:
+                # Compute peephole connections
+                ingate += cell_previous * self.weight_cell_to_ingate
+                forgetgate += (
+                    cell_previous * self.weight_cell_to_forgetgate)
 
-                outgate = self.activation_functions.outgate(outgate)
+            # Apply nonlinearities
+            ingate = self.activation_functions.ingate(ingate)
+            forgetgate = self.activation_functions.forgetgate(forgetgate)
+            cell_input = self.activation_functions.cell(cell_input)
 
-                # Compute new hidden unit activation
-                hid = outgate * tf.tanh(cell)
-                return [cell, hid]
+            # Compute new cell value
+            cell = forgetgate * cell_previous + ingate * cell_input
 
-        cell_init = tf.tile(self.cell_init, (n_batch, 1))
-        hidden_init = tf.tile(self.hidden_init, (n_batch, 1))
-        sequence = input_value
+            if self.peepholes:
+                outgate += cell * self.weight_cell_to_outgate
 
-        if self.backwards:
-            sequence = tf.reverse(sequence, axis=[0])
+            outgate = self.activation_functions.outgate(outgate)
 
-        if self.unroll_scan:
-            # Explicitly unroll the recurrence instead of using scan
-            hid_out = unroll_scan(
-                fn=one_lstm_step,
-                sequence=sequence,
-                outputs_info=[cell_init, hidden_init],
-            )
-        else:
-            _, hid_out = tf.scan(
-                fn=one_lstm_step,
-                elems=input_value,
-                initializer=[cell_init, hidden_init],
-                name='lstm-scan',
-            )
+            # Compute new hidden unit activation
+            hid = outgate * tf.tanh(cell)
+            return [cell, hid]
 
-        # When it is requested that we only return the final sequence step,
-        # we need to slice it out immediately after scan is applied
-        if self.only_return_final:
-            return hid_out[-1]
-
-        # if scan is backward reverse the output
-        if self.backwards:
-            hid_out = tf.reverse(hid_out, axis=[0])
-
-        # dimshuffle back to (n_batch, n_time_steps, n_features))
-        hid_out = tf.transpose(hid_out, [1, 0, 2])
+    def output(self, input_value, sequence_length=None):
+        # Because scan iterates over the first dimension we
+        # dimshuffle to (n_time_steps, n_batch, n_features)
+        input_value = tf.transpose(input_value, [1, 0, 2])
+        input_shape = tf.shape(input_value)
+        n_batch = input_shape[1]
 
-        return hid_out
+        # Input weights don't depend on the previous states, which
+        # means that we can apply them to all time steps at once
+        input_value = project_sequence(
+            input_value, self.input_weights, self.biases)
+
+        return self.apply_recurrence(
+            step=self.recurrent_step,
+            sequence=input_value,
+            initial_states=self.tile_initial_states(n_batch),
+            sequence_length=sequence_length,
+            name='lstm-scan',
+        )
 
 
 class GRU(BaseRNNLayer):
@@ -482,6 +706,8 @@ class GRU(BaseRNNLayer):
     Code was adapted from the
     `Lasagne <https://github.com/Lasagne/Lasagne>`_ library.
 
+    {BaseRNNLayer.Notes}
+
     Examples
     --------
 
@@ -549,87 +775,307 @@ class GRU(BaseRNNLayer):
             trainable=self.learn_init
         )
 
-    def output(self, input_value):
+    @property
+    def initial_states(self):
+        return [self.hidden_init]
+
+    def recurrent_step(self, states, input_n):
+        # input_n is the n'th vector of the projected input
+        with tf.name_scope('gru-cell'):
+            hid_previous, = states
+
+            # Compute W_{hr} h_{t - 1}, W_{hu} h_{t - 1},
+            # and W_{hc} h_{t - 1}
+            hid_input = tf.matmul(hid_previous, self.hidden_weights)
+
+            if self.gradient_clipping != 0:
+                hid_input = clip_gradient(
+                    hid_input, self.gradient_clipping)
+
+            hid_resetgate, hid_updategate, hid_hidden = tf.split(
+                hid_input, 3, axis=1)
+
+            in_resetgate, in_updategate, in_hidden = tf.split(
+                input_n, 3, axis=1)
+
+            # Reset and update gates
+            resetgate = self.activation_functions.resetgate(
+                hid_resetgate + in_resetgate)
+
+            updategate = self.activation_functions.updategate(
+                hid_updategate + in_updategate)
+
+            # Compute W_{xc}x_t + r_t \odot (W_{hc} h_{t - 1})
+            hidden_update = in_hidden + resetgate * hid_hidden
+
+            if self.gradient_clipping != 0:
+                hidden_update = clip_gradient(
+                    hidden_update, self.gradient_clipping)
+
+            hidden_update = self.activation_functions.hidden_update(
+                hidden_update)
+
+            # Compute (1 - u_t)h_{t - 1} + u_t c_t
+            return [
+                hid_previous - updategate * (hid_previous - hidden_update)
+            ]
+
+    def output(self, input_value, sequence_length=None):
         # Because scan iterates over the first dimension we
         # dimshuffle to (n_time_steps, n_batch, n_features)
         input_value = tf.transpose(input_value, [1, 0, 2])
         input_shape = tf.shape(input_value)
         n_batch = input_shape[1]
 
-        # Create single recurrent computation step function
-        # input_n is the n'th vector of the input
-        def one_gru_step(states, input_n):
-            with tf.name_scope('gru-cell'):
-                hid_previous, = states
-                input_n = tf.matmul(input_n, self.input_weights) + self.biases
-
-                # Compute W_{hr} h_{t - 1}, W_{hu} h_{t - 1},
-                # and W_{hc} h_{t - 1}
-                hid_input = tf.matmul(hid_previous, self.hidden_weights)
+        # Input weights don't depend on the previous states, which
+        # means that we can apply them to all time steps at once
+        input_value = project_sequence(
+            input_value, self.input_weights, self.biases)
 
-                if self.gradient_clipping != 0:
-                    input_n = clip_gradient(input_n, self.gradient_clipping)
-                    hid_input = clip_gradient(
-                        hid_input, self.gradient_clipping)
+        if self.gradient_clipping != 0:
+            input_value = clip_gradient(input_value, self.gradient_clipping)
 
-                hid_resetgate, hid_updategate, hid_hidden = tf.split(
-                    hid_input, 3, axis=1)
-
-                in_resetgate, in_updategate, in_hidden = tf.split(
-                    input_n, 3, axis=1)
+        return self.apply_recurrence(
+            step=self.recurrent_step,
+            sequence=input_value,
+            initial_states=self.tile_initial_states(n_batch),
+            sequence_length=sequence_length,
+            name='gru-scan',
+        )
 
-                # Reset and update gates
-                resetgate = self.activation_functions.resetgate(
-                    hid_resetgate + in_resetgate)
 
-                updategate = self.activation_functions.updategate(
-                    hid_updategate + in_updategate)
+class StatefulConnection(object):
+    """
+    Connection that propagates sequence through the network one
+    time step per call. States of the recurrent layers are kept
+    between the calls, which means that every new time step
+    requires constant amount of computations, unlike prediction
+    that processes the whole history of the sequence.
+
+    Each stream has its own states, which makes it possible to
+    process multiple independent sequences with the same network.
+    Layers before the recurrent layers get input with one time
+    step, so they have to process each time step independently
+    (like :layer:`Embedding`).
 
-                # Compute W_{xc}x_t + r_t \odot (W_{hc} h_{t - 1})
-                hidden_update = in_hidden + resetgate * hid_hidden
+    Parameters
+    ----------
+    connection : network, connection or list of layers
+        Connection with at least one recurrent layer. Connection
+        should have only one input layer and recurrent layers cannot
+        process sequences backwards.
 
-                if self.gradient_clipping != 0:
-                    hidden_update = clip_gradient(
-                        hidden_update, self.gradient_clipping)
+    Attributes
+    ----------
+    recurrent_layers : list of layers
+        Recurrent layers in topological order.
 
-                hidden_update = self.activation_functions.hidden_update(
-                    hidden_update)
+    states : dict
+        States of the recurrent layers for each stream.
 
-                # Compute (1 - u_t)h_{t - 1} + u_t c_t
-                return [
-                    hid_previous - updategate * (hid_previous - hidden_update)
-                ]
+    Methods
+    -------
+    step(input_value, stream_id=None)
+        Propagates one time step through the network.
 
-        hidden_init = tf.tile(self.hidden_init, (n_batch, 1))
-        sequence = input_value
+    reset_state(stream_id=None)
+        Removes states of the stream.
 
-        if self.backwards:
-            sequence = tf.reverse(sequence, axis=[0])
+    Examples
+    --------
+    >>> from neupy import layers
+    >>>
+    >>> connection = layers.join(
+    ...     layers.Input(n_time_steps),
+    ...     layers.Embedding(n_categories, 10),
+    ...     layers.LSTM(20),
+    ...     layers.Sigmoid(1),
+    ... )
+    >>> stream = layers.StatefulConnection(connection)
+    >>>
+    >>> for token in tokens:
+    ...     prediction = stream.step([token])
+    ...
+    >>> stream.reset_state()
+    """
+    def __init__(self, connection):
+        connection = extract_connection(connection)
 
-        if self.unroll_scan:
-            # Explicitly unroll the recurrence instead of using scan
-            hid_out = unroll_scan(
-                fn=one_gru_step,
-                sequence=sequence,
-                outputs_info=[hidden_init]
-            )
-        else:
-            hid_out, = tf.scan(
-                fn=one_gru_step,
-                elems=input_value,
-                initializer=[hidden_init],
-                name='gru-scan',
-            )
+        if len(connection.input_layers) != 1:
+            raise ValueError(
+                "Connection should have only one input layer, got {}"
+                "".format(len(connection.input_layers)))
 
-        # When it is requested that we only return the final sequence step,
-        # we need to slice it out immediately after scan is applied
-        if self.only_return_final:
-            return hid_out[-1]
+        self.recurrent_layers = [
+            layer for layer in connection
+            if isinstance(layer, BaseRNNLayer)]
 
-        # if scan is backward reverse the output
-        if self.backwards:
-            hid_out = tf.reverse(hid_out, axis=[0])
+        if not self.recurrent_layers:
+            raise ValueError("Connection doesn't have recurrent layers")
 
-        # dimshuffle back to (n_batch, n_time_steps, n_features))
-        hid_out = tf.transpose(hid_out, [1, 0, 2])
-        return hid_out
+        for layer in self.recurrent_layers:
+            if layer.backwards:
+                raise ValueError(
+                    "Layer `{}` processes sequence backwards and it "
+                    "cannot be used for streaming".format(layer.name))
+
+        self.connection = connection
+        self.input_layer = connection.input_layers[0]
+        self.states = {}
+        self.computation_cache = {}
+
+        # Connection might belong to the network that has its own graph
+        self.variables = find_variables(connection)
+        self.tensorflow_graph = find_graph(self.variables)
+        self.float_type = find_float_type(self.variables)
+
+    def output(self, input_value, states):
+        """
+        Propagates one time step through the network.
+
+        Parameters
+        ----------
+        input_value : Tensorfow variable
+            Input for the current time step. It has the same shape
+            as input for the network, but without time dimension.
+
+        states : dict
+            List of the states from the previous step for
+            each recurrent layer.
+
+        Returns
+        -------
+        tuple
+            Output from the network and new states for each
+            recurrent layer.
+        """
+        backward_graph = self.connection.graph.backward_graph
+        values = {self.input_layer: tf.expand_dims(input_value, axis=1)}
+        new_states = {}
+
+        with self.connection.disable_training_state():
+            for layer in self.connection:
+                if layer is self.input_layer:
+                    continue
+
+                inputs = [values[input_layer]
+                          for input_layer in backward_graph[layer]]
+
+                if not isinstance(layer, BaseRNNLayer):
+                    values[layer] = layer.output(*inputs)
+                    continue
+
+                new_states[layer] = layer.output_step(
+                    inputs[0][:, 0], states[layer])
+                output = new_states[layer][-1]
+
+                if not layer.only_return_final:
+                    output = tf.expand_dims(output, axis=1)
+
+                values[layer] = output
+
+        outputs = [values[layer] for layer in self.connection.output_layers]
+
+        if len(outputs) == 1:
+            return outputs[0], new_states
+
+        return outputs, new_states
+
+    def initial_states(self, n_batch):
+        session = tensorflow_session(self.tensorflow_graph)
+        initial_states = session.run({
+            layer: layer.initial_states for layer in self.recurrent_layers})
+
+        return {
+            layer: [np.tile(state, (n_batch, 1)) for state in states]
+            for layer, states in initial_states.items()
+        }
+
+    def step(self, input_value, stream_id=None):
+        """
+        Propagates one time step through the network using
+        states of the stream and updates them.
+
+        Parameters
+        ----------
+        input_value : array-like
+            Input for the current time step. It has the same shape
+            as input for the network, but without time dimension.
+
+        stream_id : hashable object
+            Identifier of the stream. Defaults to ``None``.
+
+        Returns
+        -------
+        array-like
+            Output from the network for the current time step.
+        """
+        session = tensorflow_session(self.tensorflow_graph)
+        cache_key = (session, id(self))
+
+        if cache_key not in self.computation_cache:
+            initialize_uninitialized_variables(self.variables)
+
+            with self.tensorflow_graph.as_default():
+                input_variable = tf.placeholder(
+                    self.float_type,
+                    shape=as_tuple(None, self.input_layer.output_shape[1:]),
+                    name="stream-input/to-layer-{}".format(
+                        self.input_layer.name),
+                )
+                state_variables = {
+                    layer: [
+                        tf.placeholder(
+                            self.float_type, shape=(None, layer.size))
+                        for _ in layer.initial_states
+                    ]
+                    for layer in self.recurrent_layers
+                }
+                output, new_states = self.output(
+                    input_variable, state_variables)
+
+            self.computation_cache[cache_key] = {
+                'input': input_variable,
+                'states': state_variables,
+                'outputs': [output, new_states],
+            }
+
+        graph = self.computation_cache[cache_key]
+        n_batch = len(input_value)
+
+        if stream_id not in self.states:
+            self.states[stream_id] = self.initial_states(n_batch)
+
+        states = self.states[stream_id]
+        feed_dict = {graph['input']: input_value}
+
+        for layer in self.recurrent_layers:
+            for variable, value in zip(graph['states'][layer], states[layer]):
+                if len(value) != n_batch:
+                    raise ValueError(
+                        "Stream `{}` has states for {} samples, got "
+                        "input with {} samples".format(
+                            stream_id, len(value), n_batch))
+
+                feed_dict[variable] = value
+
+        output, self.states[stream_id] = session.run(
+            graph['outputs'], feed_dict=feed_dict)
+
+        return output
+
+    def reset_state(self, stream_id=None):
+        """
+        Removes states of the stream. Next step of the stream will
+        start from the initial states of the recurrent layers.
+
+        Parameters
+        ----------
+        stream_id : hashable object
+            Identifier of the stream. Defaults to ``None``.
+        """
+        self.states.pop(stream_id, None)
+
+    def __repr__(self):
+        return '{}({} streams)'.format(
+            self.__class__.__name__, len(self.states))
@@ -79,7 +79,8 @@ class GaussianNoise(BaseLayer):
         noise = tf.random_normal(
             shape=tf.shape(input_value),
             mean=self.mean,
-            stddev=self.std)
+            stddev=self.std,
+            dtype=input_value.dtype)
 
         return input_value + noise
 
@@ -0,0 +1,659 @@
+"""
+Inference engine that propagates data through the trained network
+using only NumPy. Exported network doesn't depend on Tensorflow,
+which makes it cheap to load and use in the processes that only
+need to make predictions.
+"""
+from functools import reduce
+
+import numpy as np
+from scipy.special import expit
+from six.moves import cPickle as pickle
+from numpy.lib.stride_tricks import as_strided
+
+
+__all__ = ('InferenceNetwork', 'export_inference')
+
+
+def padding_size(dimension_size, filter_size, padding, stride):
+    """
+    Computes number of zeros that have to be added before
+    and after the spatial dimension. Rules are the same as in
+    Tensorflow.
+
+    Parameters
+    ----------
+    dimension_size : int
+    filter_size : int
+        Filter size that includes dilation.
+    padding : {'VALID', 'SAME'} or int
+    stride : int
+
+    Returns
+    -------
+    tuple
+        Padding before and after the dimension.
+    """
+    if padding == 'VALID':
+        return (0, 0)
+
+    if padding == 'SAME':
+        output_size = -(-dimension_size // stride)
+        total = max((output_size - 1) * stride + filter_size -
+                    dimension_size, 0)
+        return (total // 2, total - total // 2)
+
+    return (padding, padding)
+
+
+def extract_patches(value, size, stride, dilation=(1, 1)):
+    """
+    Creates view for the 4D input tensor that contains all patches
+    that convolution or pooling filter slides over.
+
+    Parameters
+    ----------
+    value : array
+        Input with shape ``(samples, rows, cols, channels)``.
+    size : tuple
+        Filter size.
+    stride : tuple
+    dilation : tuple
+
+    Returns
+    -------
+    array
+        View with shape ``(samples, output rows, output cols,
+        filter rows, filter cols, channels)``.
+    """
+    n_samples, rows, cols, channels = value.shape
+    (filter_rows, filter_cols) = size
+    (row_stride, col_stride) = stride
+    (row_dilation, col_dilation) = dilation
+
+    output_rows = (rows - (filter_rows - 1) * row_dilation - 1) // row_stride
+    output_cols = (cols - (filter_cols - 1) * col_dilation - 1) // col_stride
+
+    sample_step, row_step, col_step, channel_step = value.strides
+
+    return as_strided(
+        value,
+        shape=(n_samples, output_rows + 1, output_cols + 1,
+               filter_rows, filter_cols, channels),
+        strides=(sample_step, row_step * row_stride, col_step * col_stride,
+                 row_step * row_dilation, col_step * col_dilation,
+                 channel_step),
+        writeable=False,
+    )
+
+
+def pad_spatial(value, size, padding, stride, dilation=(1, 1),
+                constant=0):
+    """
+    Adds padding to the rows and columns of the 4D input tensor.
+    """
+    pads = [(0, 0)]
+
+    for i in range(2):
+        filter_size = (size[i] - 1) * dilation[i] + 1
+        dimension_padding = padding[i] if isinstance(padding, tuple) \
+            else padding
+        pads.append(padding_size(
+            value.shape[i + 1], filter_size, dimension_padding, stride[i]))
+
+    pads.append((0, 0))
+
+    if any(pad != (0, 0) for pad in pads):
+        value = np.pad(value, pads, 'constant', constant_values=constant)
+
+    return value
+
+
+def softmax(value):
+    value = np.exp(value - value.max(axis=-1, keepdims=True))
+    return value / value.sum(axis=-1, keepdims=True)
+
+
+activation_functions = {
+    'linear': lambda value: value,
+    'sigmoid': expit,
+    'hard_sigmoid': lambda value: np.clip(0.2 * value + 0.5, 0, 1),
+    'tanh': np.tanh,
+    'relu': lambda value: np.maximum(value, 0),
+    'softplus': lambda value: np.logaddexp(0, value),
+    'softmax': softmax,
+    'elu': lambda value: np.where(value > 0, value, np.expm1(value)),
+}
+
+
+def activation(inputs, function, weight=None, bias=None, alpha=None):
+    value, = inputs
+
+    if weight is not None:
+        value = np.dot(value, weight)
+
+    if bias is not None:
+        value = value + bias
+
+    if alpha is not None:
+        # The same as leaky relu, but alpha can be an array
+        return np.maximum(value, alpha * value)
+
+    return activation_functions[function](value)
+
+
+def convolution(inputs, weight, bias, padding, stride, dilation):
+    value, = inputs
+    filter_rows, filter_cols = weight.shape[:2]
+
+    value = pad_spatial(
+        value, (filter_rows, filter_cols), padding, stride, dilation)
+    patches = extract_patches(
+        value, (filter_rows, filter_cols), stride, dilation)
+
+    # Patches will be copied into the matrix and multiplied
+    # with weights using single BLAS call
+    output = np.tensordot(patches, weight, axes=3)
+
+    if bias is not None:
+        output += bias
+
+    return output
+
+
+def deconv_output_size(dimension_size, filter_size, padding, stride):
+    if padding == 'VALID':
+        return dimension_size * stride + max(filter_size - stride, 0)
+
+    if padding == 'SAME':
+        return dimension_size * stride
+
+    # Output size before explicit paddings will be removed
+    return dimension_size * stride + filter_size - 1
+
+
+def deconvolution(inputs, weight, bias, padding, stride):
+    value, = inputs
+    n_samples, rows, cols, _ = value.shape
+    filter_rows, filter_cols, n_filters, _ = weight.shape
+    row_stride, col_stride = stride
+
+    output_rows = deconv_output_size(rows, filter_rows, padding, row_stride)
+    output_cols = deconv_output_size(cols, filter_cols, padding, col_stride)
+
+    full_rows = (rows - 1) * row_stride + filter_rows
+    full_cols = (cols - 1) * col_stride + filter_cols
+
+    # Each input pixel contributes filter-sized patch to the output.
+    # Patches are combined with overlap defined by the stride.
+    contributions = np.tensordot(value, weight, axes=([3], [3]))
+    full_output = np.zeros(
+        (n_samples, max(full_rows, output_rows),
+         max(full_cols, output_cols), n_filters),
+        dtype=contributions.dtype)
+
+    for i in range(filter_rows):
+        for j in range(filter_cols):
+            full_output[
+                :,
+                i:i + rows * row_stride:row_stride,
+                j:j + cols * col_stride:col_stride,
+                :
+            ] += contributions[:, :, :, i, j, :]
+
+    row_offset = col_offset = 0
+
+    if padding == 'SAME':
+        row_offset = max(full_rows - output_rows, 0) // 2
+        col_offset = max(full_cols - output_cols, 0) // 2
+
+    output = full_output[
+        :,
+        row_offset:row_offset + output_rows,
+        col_offset:col_offset + output_cols,
+        :
+    ]
+
+    if isinstance(padding, tuple):
+        row_padding, col_padding = padding
+        output = output[
+            :,
+            row_padding:output.shape[1] - row_padding,
+            col_padding:output.shape[2] - col_padding,
+            :
+        ]
+
+    if bias is not None:
+        output = output + bias
+
+    return output
+
+
+def pooling(inputs, function, size, stride, padding):
+    value, = inputs
+
+    if function == 'max':
+        value = pad_spatial(value, size, padding, stride, constant=-np.inf)
+        return extract_patches(value, size, stride).max(axis=(3, 4))
+
+    # Average pooling ignores padded values
+    counts = np.ones((1,) + value.shape[1:3] + (1,), dtype=value.dtype)
+    counts = pad_spatial(counts, size, padding, stride)
+    counts = extract_patches(counts, size, stride).sum(axis=(3, 4))
+
+    value = pad_spatial(value, size, padding, stride)
+    return extract_patches(value, size, stride).sum(axis=(3, 4)) / counts
+
+
+def upscale(inputs, scale):
+    value, = inputs
+    value = np.repeat(value, scale[0], axis=1)
+    return np.repeat(value, scale[1], axis=2)
+
+
+def global_pooling(inputs, function):
+    value, = inputs
+
+    if value.ndim in (1, 2):
+        return value
+
+    axes = tuple(range(1, value.ndim - 1))
+    return getattr(np, function)(value, axis=axes)
+
+
+def batch_norm(inputs, gamma, beta, running_mean, running_inv_std):
+    value, = inputs
+    return gamma * ((value - running_mean) * running_inv_std) + beta
+
+
+def local_response_norm(inputs, depth_radius, k, alpha, beta):
+    value, = inputs
+    n_channels = value.shape[-1]
+
+    squared = np.square(value)
+    cumulative = np.cumsum(squared, axis=-1)
+    cumulative = np.concatenate([
+        np.zeros(value.shape[:-1] + (1,), dtype=value.dtype),
+        cumulative,
+    ], axis=-1)
+
+    channels = np.arange(n_channels)
+    upper = np.minimum(channels + depth_radius + 1, n_channels)
+    lower = np.maximum(channels - depth_radius, 0)
+    squared_sum = cumulative[..., upper] - cumulative[..., lower]
+
+    return value / (k + alpha * squared_sum) ** beta
+
+
+def elementwise(inputs, function):
+    return reduce(getattr(np, function), inputs)
+
+
+def concatenate(inputs, axis):
+    return np.concatenate(inputs, axis=axis)
+
+
+def gated_average(inputs, gating_layer_index):
+    inputs = list(inputs)
+    gating_value = inputs.pop(gating_layer_index)
+
+    output = 0
+    for i, value in enumerate(inputs):
+        gate = gating_value[:, i].reshape((-1,) + (1,) * (value.ndim - 1))
+        output = output + value * gate
+
+    return output
+
+
+def reshape(inputs, shape):
+    value, = inputs
+    return value.reshape((value.shape[0],) + shape)
+
+
+def transpose(inputs, perm):
+    value, = inputs
+    return np.transpose(value, (0,) + perm)
+
+
+def embedding(inputs, weight):
+    value, = inputs
+    return weight[value.astype(np.int32)]
+
+
+def identity(inputs):
+    value, = inputs
+    return value
+
+
+operations = {
+    'activation': activation,
+    'convolution': convolution,
+    'deconvolution': deconvolution,
+    'pooling': pooling,
+    'upscale': upscale,
+    'global_pooling': global_pooling,
+    'batch_norm': batch_norm,
+    'local_response_norm': local_response_norm,
+    'elementwise': elementwise,
+    'concatenate': concatenate,
+    'gated_average': gated_average,
+    'reshape': reshape,
+    'transpose': transpose,
+    'embedding': embedding,
+    'identity': identity,
+}
+
+
+class InferenceNetwork(object):
+    """
+    Network that makes predictions using only NumPy. Network
+    can be exported from the trained layers with the
+    :func:`export_inference` function.
+
+    Parameters
+    ----------
+    steps : list
+        Each step is a tuple that contains operation name, list
+        of indices for the input values and dictionary with options
+        for the operation. Values produced by the steps are stored
+        after the network's inputs. Steps have to be ordered in the
+        way that each step uses only inputs and values produced by
+        the previous steps.
+
+    n_inputs : int
+        Number of inputs to the network.
+
+    outputs : list of int
+        Indices of the values that network returns.
+
+    float_type : str
+        Data type of the inputs and parameters.
+
+    Methods
+    -------
+    predict(\\*inputs)
+        Propagates inputs through the network.
+
+    save(filepath)
+        Save network in the pickle file.
+
+    load(filepath)
+        Load network from the pickle file.
+
+    Examples
+    --------
+    >>> from neupy import layers, numpy_inference
+    >>>
+    >>> connection = layers.Input(10) > layers.Relu(5) > layers.Softmax(3)
+    >>> network = numpy_inference.export_inference(connection)
+    >>> network.save('network.pickle')
+    >>>
+    >>> # Tensorflow won't be imported in this case
+    >>> from neupy.numpy_inference import InferenceNetwork
+    >>> network = InferenceNetwork.load('network.pickle')
+    >>> network.predict(x_test)
+    """
+    def __init__(self, steps, n_inputs, outputs, float_type='float32'):
+        self.steps = steps
+        self.n_inputs = n_inputs
+        self.outputs = outputs
+        self.float_type = float_type
+
+    def predict(self, *inputs):
+        if len(inputs) != self.n_inputs:
+            raise ValueError(
+                "Network expects {} input(s), got {}"
+                "".format(self.n_inputs, len(inputs)))
+
+        values = [np.asarray(value, dtype=self.float_type)
+                  for value in inputs]
+
+        for operation, input_indices, options in self.steps:
+            step_inputs = [values[index] for index in input_indices]
+            values.append(operations[operation](step_inputs, **options))
+
+        if len(self.outputs) == 1:
+            return values[self.outputs[0]]
+
+        return [values[index] for index in self.outputs]
+
+    def save(self, filepath):
+        with open(filepath, 'wb') as f:
+            pickle.dump({
+                'steps': self.steps,
+                'n_inputs': self.n_inputs,
+                'outputs': self.outputs,
+                'float_type': self.float_type,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filepath):
+        with open(filepath, 'rb') as f:
+            return cls(**pickle.load(f))
+
+    def __repr__(self):
+        return '{}({} steps)'.format(self.__class__.__name__, len(self.steps))
+
+
+def export_layer(layer, parameters):
+    """
+    Converts layer to the inference step.
+
+    Parameters
+    ----------
+    layer : layer
+    parameters : dict
+        Parameter values of the layer.
+
+    Returns
+    -------
+    tuple
+        Operation name and its options.
+
+    Raises
+    ------
+    ValueError
+        In case if layer is not supported.
+    """
+    # Note: Import it here in order to make sure that module can
+    # be used without Tensorflow
+    import tensorflow as tf
+    from neupy import layers
+
+    layer_class = type(layer)
+    activations = {
+        layers.Linear: 'linear',
+        layers.Sigmoid: 'sigmoid',
+        layers.HardSigmoid: 'hard_sigmoid',
+        layers.Tanh: 'tanh',
+        layers.Softplus: 'softplus',
+        layers.Softmax: 'softmax',
+        layers.Elu: 'elu',
+        layers.Relu: 'relu',
+        layers.LeakyRelu: 'relu',
+        layers.PRelu: 'relu',
+    }
+    merge_functions = {
+        tf.add: 'add',
+        tf.multiply: 'multiply',
+        tf.maximum: 'maximum',
+        tf.minimum: 'minimum',
+        tf.subtract: 'subtract',
+    }
+
+    if layer_class in activations:
+        options = dict(
+            function=activations[layer_class],
+            weight=parameters.get('weight'),
+            bias=parameters.get('bias'),
+        )
+
+        if layer_class is layers.Relu and layer.alpha != 0:
+            options['alpha'] = layer.alpha
+
+        elif layer_class is layers.LeakyRelu:
+            options['alpha'] = 0.01
+
+        elif layer_class is layers.PRelu:
+            ndim = len(layer.output_shape) + 1
+            alpha_axes = np.arange(ndim)[list(layer.alpha_axes)]
+            alpha = parameters['alpha']
+
+            for axis in range(ndim):
+                if axis not in alpha_axes:
+                    alpha = np.expand_dims(alpha, axis)
+
+            options['alpha'] = alpha
+
+        return 'activation', options
+
+    if layer_class is layers.Convolution:
+        return 'convolution', dict(
+            weight=parameters['weight'],
+            bias=parameters.get('bias'),
+            padding=layer.padding,
+            stride=tuple(layer.stride),
+            dilation=tuple(layer.dilation or (1, 1)),
+        )
+
+    if layer_class is layers.Deconvolution:
+        return 'deconvolution', dict(
+            weight=parameters['weight'],
+            bias=parameters.get('bias'),
+            padding=layer.padding,
+            stride=tuple(layer.stride),
+        )
+
+    if layer_class in (layers.MaxPooling, layers.AveragePooling):
+        return 'pooling', dict(
+            function='max' if layer_class is layers.MaxPooling else 'avg',
+            size=tuple(layer.size),
+            stride=tuple(layer.stride or layer.size),
+            padding=layer.padding.upper(),
+        )
+
+    if layer_class is layers.Upscale:
+        return 'upscale', dict(scale=tuple(layer.scale))
+
+    if layer_class is layers.GlobalPooling:
+        functions = {tf.reduce_mean: 'mean', tf.reduce_max: 'max'}
+
+        if layer.function not in functions:
+            raise ValueError(
+                "Global pooling layer `{}` uses custom function and it "
+                "cannot be exported".format(layer.name))
+
+        return 'global_pooling', dict(function=functions[layer.function])
+
+    if layer_class is layers.BatchNorm:
+        return 'batch_norm', dict(
+            gamma=parameters['gamma'],
+            beta=parameters['beta'],
+            running_mean=parameters['running_mean'],
+            running_inv_std=parameters['running_inv_std'],
+        )
+
+    if layer_class is layers.LocalResponseNorm:
+        return 'local_response_norm', dict(
+            depth_radius=layer.depth_radius,
+            k=layer.k,
+            alpha=layer.alpha,
+            beta=layer.beta,
+        )
+
+    if layer_class is layers.Elementwise:
+        if layer.merge_function not in merge_functions:
+            raise ValueError(
+                "Elementwise layer `{}` uses custom function and it "
+                "cannot be exported".format(layer.name))
+
+        return 'elementwise', dict(
+            function=merge_functions[layer.merge_function])
+
+    if layer_class is layers.Concatenate:
+        return 'concatenate', dict(axis=layer.axis)
+
+    if layer_class is layers.GatedAverage:
+        return 'gated_average', dict(
+            gating_layer_index=layer.gating_layer_index)
+
+    if layer_class is layers.Reshape:
+        return 'reshape', dict(shape=tuple(layer.shape))
+
+    if layer_class is layers.Transpose:
+        return 'transpose', dict(perm=tuple(layer.perm))
+
+    if layer_class is layers.Embedding:
+        return 'embedding', dict(weight=parameters['weight'])
+
+    # Stochastic layers don't change input during the inference
+    if layer_class in (layers.Input, layers.Identity,
+                       layers.Dropout, layers.GaussianNoise):
+        return 'identity', {}
+
+    raise ValueError(
+        "Layer `{}` of type {} cannot be exported for inference"
+        "".format(layer.name, layer_class.__name__))
+
+
+def export_inference(connection):
+    """
+    Exports network, connection or list of layers to the network
+    that makes predictions using only NumPy. Layers are converted
+    in topological order and each layer becomes one step of the
+    inference network.
+
+    Parameters
+    ----------
+    connection : network, connection or list of layers
+
+    Returns
+    -------
+    InferenceNetwork
+
+    Raises
+    ------
+    ValueError
+        In case if some of the layers cannot be exported.
+    """
+    # Note: Import it here in order to make sure that module can
+    # be used without Tensorflow
+    from neupy.storage import save_dict
+    from neupy.layers.utils import extract_connection, find_variables
+    from neupy.utils import find_float_type
+
+    connection = extract_connection(connection)
+    graph = connection.graph
+
+    layer_parameters = {}
+    for layer_data in save_dict(connection)['layers']:
+        layer_parameters[layer_data['name']] = {
+            name: parameter['value']
+            for name, parameter in layer_data['parameters'].items()
+        }
+
+    input_layers = connection.input_layers
+    value_indices = {}
+    steps = []
+
+    for layer in connection:
+        if layer in input_layers:
+            input_indices = [input_layers.index(layer)]
+        else:
+            input_indices = [
+                value_indices[input_layer]
+                for input_layer in graph.backward_graph[layer]
+            ]
+
+        operation, options = export_layer(
+            layer, layer_parameters[layer.name])
+
+        value_indices[layer] = len(input_layers) + len(steps)
+        steps.append((operation, input_indices, options))
+
+    return InferenceNetwork(
+        steps=steps,
+        n_inputs=len(input_layers),
+        outputs=[value_indices[layer] for layer in connection.output_layers],
+        float_type=find_float_type(find_variables(connection)),
+    )
@@ -42,7 +42,34 @@ def sequential_and(*conditions):
     return tf.logical_and(first_condition, sequential_and(*other_conditions))
 
 
-def line_search(f, f_deriv, maxiter=20, c1=1e-4, c2=0.9):
+def evaluation_function(f, f_deriv):
+    """
+    Creates function that returns value of the function and its
+    derivative at the specified point.
+
+    Parameters
+    ----------
+    f : callable f(x)
+        Objective scalar function. In case if ``f_deriv`` is equal
+        to ``None`` function has to return value and derivative.
+
+    f_deriv : callable f'(x) or None
+        Objective function derivative.
+
+    Returns
+    -------
+    callable
+    """
+    if f_deriv is None:
+        return f
+
+    def evaluate(x):
+        return f(x), f_deriv(x)
+
+    return evaluate
+
+
+def line_search(f, f_deriv=None, maxiter=20, c1=1e-4, c2=0.9):
     """
     Find ``x`` that satisfies strong Wolfe conditions.
     ``x > 0`` is assumed to be a descent direction.
@@ -50,10 +77,15 @@ def line_search(f, f_deriv, maxiter=20, c1=1e-4, c2=0.9):
     Parameters
     ----------
     f : callable f(x)
-        Objective scalar function.
+        Objective scalar function. In case if ``f_deriv``
+        is equal to ``None`` function has to return tuple with
+        value and derivative at point ``x``.
 
-    f_deriv : callable f'(x)
-        Objective function derivative.
+    f_deriv : callable f'(x) or None
+        Objective function derivative. Function and its derivative
+        might share most of the computations. In this case, it's more
+        efficient to compute both of them in the ``f`` function.
+        Defaults to ``None``.
 
     maxiter : int
         Maximum number of iterations. Defaults ``20``.
@@ -76,6 +108,11 @@ def line_search(f, f_deriv, maxiter=20, c1=1e-4, c2=0.9):
     conditions.  See Wright and Nocedal, 'Numerical Optimization',
     1999, pg. 59-60.
     For the zoom phase it uses an algorithm by [...].
+
+    Function and its derivative are evaluated only once per each
+    trial point. Values from the previous trial points are passed
+    between iterations and only one of the zoom phases will be
+    executed.
     """
 
     if not 0 < c1 < 1:
@@ -91,13 +128,13 @@ def line_search(f, f_deriv, maxiter=20, c1=1e-4, c2=0.9):
         raise ValueError("maxiter needs to be greater than 0")
 
     c1, c2 = asfloat(c1), asfloat(c2)
+    evaluate = evaluation_function(f, f_deriv)
 
     def search_iteration_step(condition, x_previous, x_current, y_previous,
-                              y_current, y_deriv_previous, iteration, x_star):
+                              y_current, y_deriv_previous, y_deriv_current,
+                              iteration, x_star):
 
-        y_deriv_current = f_deriv(x_current)
         x_new = x_current * asfloat(2)
-        y_new = f(x_new)
 
         condition1 = tf.logical_or(
             y_current > (y0 + c1 * x_current * y_deriv_0),
@@ -109,40 +146,40 @@ def line_search(f, f_deriv, maxiter=20, c1=1e-4, c2=0.9):
         condition2 = tf.abs(y_deriv_current) <= -c2 * y_deriv_0
         condition3 = y_deriv_current >= 0
 
-        x_star = tf.where(
+        # Unlike ``tf.where``, condition executes only one
+        # of the branches, which means that only one of the
+        # zoom phases will evaluate the function.
+        x_star = tf.cond(
             condition1,
-            zoom(
+            lambda: zoom(
                 x_previous, x_current, y_previous,
                 y_current, y_deriv_previous,
-                f, f_deriv, y0, y_deriv_0, c1, c2
+                evaluate, None, y0, y_deriv_0, c1, c2
             ),
-            tf.where(
+            lambda: tf.cond(
                 condition2,
-                x_current,
-                tf.where(
+                lambda: x_current,
+                lambda: tf.cond(
                     condition3,
-                    zoom(
+                    lambda: zoom(
                         x_current, x_previous, y_current,
                         y_previous, y_deriv_current,
-                        f, f_deriv, y0, y_deriv_0, c1, c2
+                        evaluate, None, y0, y_deriv_0, c1, c2
                     ),
-                    x_new,
+                    lambda: x_new,
                 ),
             ),
         )
-        y_deriv_previous_new = tf.where(
-            condition1,
-            y_deriv_previous,
-            y_deriv_current
-        )
 
         is_any_condition_satisfied = sequential_or(
             condition1, condition2, condition3)
 
-        y_current_new = tf.where(
+        # Function will be evaluated at the new point
+        # only in case if search will continue.
+        y_new, y_deriv_new = tf.cond(
             is_any_condition_satisfied,
-            y_current,
-            y_new
+            lambda: (y_current, y_deriv_current),
+            lambda: evaluate(x_new),
         )
         continue_searching_condition = tf.logical_and(
             tf.not_equal(x_new, 0),
@@ -151,21 +188,21 @@ def line_search(f, f_deriv, maxiter=20, c1=1e-4, c2=0.9):
 
         return [
             continue_searching_condition,
-            x_current, x_new, y_current, y_current_new,
-            y_deriv_previous_new, iteration + 1, x_star
+            x_current, x_new, y_current, y_new,
+            y_deriv_current, y_deriv_new, iteration + 1, x_star
         ]
 
     one = tf.constant(asfloat(1))
     zero = tf.constant(asfloat(0))
 
     x0, x1 = zero, one
-    y0, y1 = f(x0), f(x1)
-    y_deriv_0 = f_deriv(x0)
+    y0, y_deriv_0 = evaluate(x0)
+    y1, y_deriv_1 = evaluate(x1)
 
     outs = tf.while_loop(
         cond=lambda condition, *args: condition,
         body=search_iteration_step,
-        loop_vars=[True, x0, x1, y0, y1, y_deriv_0, 1, zero],
+        loop_vars=[True, x0, x1, y0, y1, y_deriv_0, y_deriv_1, 1, zero],
         back_prop=False,
         maximum_iterations=maxiter,
     )
@@ -346,9 +383,10 @@ def zoom(x_low, x_high, y_low, y_high, y_deriv_low,
         Value of derivative at x_low
 
     f : callable f(x)
-        Generates computational graph
+        Generates computational graph. In case if ``f_deriv`` is
+        equal to ``None`` function has to return value and derivative.
 
-    f_deriv : callable f'(x)
+    f_deriv : callable f'(x) or None
         Generates computational graph
 
     y0 : float
@@ -375,8 +413,7 @@ def zoom(x_low, x_high, y_low, y_high, y_deriv_low,
             x_high, y_high,
             x_recent, y_recent)
 
-        y_new = f(x_new)
-        y_deriv_new = f_deriv(x_new)
+        y_new, y_deriv_new = evaluate(x_new)
 
         continue_searching_condition = sequential_or(
             y_new > (y0 + c1 * x_new * y_deriv_0),
@@ -413,6 +450,8 @@ def zoom(x_low, x_high, y_low, y_high, y_deriv_low,
             x_star
         ]
 
+    evaluate = evaluation_function(f, f_deriv)
+
     zero = tf.constant(asfloat(0))
     x_recent = zero
     y_recent = y0
@@ -3,6 +3,7 @@ import tensorflow as tf
 import matplotlib.pyplot as plt
 from scipy.ndimage.filters import gaussian_filter
 
+from neupy.environment import get_float_type
 from neupy.utils import tensorflow_session, as_tuple
 from neupy.exceptions import InvalidConnection
 
@@ -27,7 +28,7 @@ def saliency_map_graph(connection):
     x = tf.placeholder(
         shape=as_tuple(None, connection.input_shape),
         name='saliency-map/input',
-        dtype=tf.float32,
+        dtype=get_float_type(),
     )
 
     with connection.disable_training_state():
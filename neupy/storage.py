@@ -9,8 +9,8 @@ from six.moves import cPickle as pickle
 
 import neupy
 from neupy.core.docs import shared_docs
-from neupy.layers.utils import extract_connection
-from neupy.utils import (asfloat, tensorflow_session,
+from neupy.layers.utils import extract_connection, find_variables
+from neupy.utils import (asfloat, tensorflow_session, find_graph,
                          initialize_uninitialized_variables)
 
 
@@ -69,8 +69,6 @@ def load_layer_parameter(layer, layer_data):
     Set layer parameters to the values specified in the
     stored data
     """
-    session = tensorflow_session()
-
     for param_name, param_data in layer_data['parameters'].items():
         parameter = getattr(layer, param_name)
 
@@ -80,7 +78,10 @@ def load_layer_parameter(layer, layer_data):
                 "instance of the tf.Variable, but current value equal to {}. "
                 "Layer: {}".format(param_name, layer.name, parameter, layer))
 
-        parameter.load(asfloat(param_data['value']), session)
+        # Layer might belong to the network that has its own graph
+        session = tensorflow_session(parameter.graph)
+        float_type = parameter.dtype.base_dtype.name
+        parameter.load(asfloat(param_data['value'], float_type), session)
 
 
 def load_dict_by_names(layers_conn, layers_data, ignore_missing=False,
@@ -321,8 +322,14 @@ def save_dict(connection):
     ['layers', 'graph', 'metadata']
     """
     connection = extract_connection(connection)
-    session = tensorflow_session()
-    initialize_uninitialized_variables()
+    variables = find_variables(connection)
+
+    # Layer might belong to the network that has its own graph
+    graph = find_graph(variables)
+    session = tensorflow_session(graph)
+
+    with graph.as_default():
+        initialize_uninitialized_variables()
 
     data = {
         'metadata': {
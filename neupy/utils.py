@@ -1,15 +1,24 @@
 import inspect
+import weakref
+import threading
 from functools import wraps
+from collections import OrderedDict
+from contextlib import contextmanager
 
+import h5py
 import numpy as np
 from scipy.sparse import issparse
 import tensorflow as tf
 
+from neupy.environment import get_float_type
 
 __all__ = ('format_data', 'asfloat', 'AttributeKeyDict', 'preformat_value',
            'as_tuple', 'number_type', 'all_equal', 'class_method_name_scope',
-           'tensorflow_session', 'tensorflow_eval', 'tf_repeat',
-           'initialize_uninitialized_variables', 'function_name_scope')
+           'tensorflow_session', 'close_tensorflow_session', 'find_graph',
+           'find_float_type',
+           'tensorflow_eval', 'tf_repeat',
+           'initialize_uninitialized_variables', 'function_name_scope',
+           'read_variables_per_iteration')
 
 
 number_type = (int, float, np.floating, np.integer)
@@ -41,7 +50,8 @@ def class_method_name_scope(method):
     return wrapper
 
 
-def format_data(data, is_feature1d=True, copy=False, make_float=True):
+def format_data(data, is_feature1d=True, copy=False, make_float=True,
+                float_type=None):
     """
     Transform data in a standardized format.
 
@@ -67,6 +77,10 @@ def format_data(data, is_feature1d=True, copy=False, make_float=True):
         If `True` then input will be converted to float.
         Defaults to ``False``.
 
+    float_type : str or None
+        Float type for the data. ``None`` means that float type
+        from the environment will be used. Defaults to ``None``.
+
     Returns
     -------
     ndarray
@@ -77,7 +91,7 @@ def format_data(data, is_feature1d=True, copy=False, make_float=True):
         return data
 
     if make_float:
-        data = asfloat(data)
+        data = asfloat(data, float_type)
 
     if not isinstance(data, np.ndarray) or copy:
         data = np.array(data, copy=copy)
@@ -92,21 +106,28 @@ def format_data(data, is_feature1d=True, copy=False, make_float=True):
     return data
 
 
-def asfloat(value):
+def asfloat(value, float_type=None):
     """
-    Convert variable to 32 bit float number.
+    Convert variable to float number. By default, float type
+    is the same as the one specified in the environment
+    (``float32`` by default).
 
     Parameters
     ----------
     value : matrix, ndarray, Tensorfow variable or scalar
         Value that could be converted to float type.
 
+    float_type : str or None
+        Float type. ``None`` means that float type from the
+        environment will be used. Defaults to ``None``.
+
     Returns
     -------
     matrix, ndarray, Tensorfow variable or scalar
-        Output would be input value converted to 32 bit float.
+        Output would be input value converted to float.
     """
-    float_type = 'float32'
+    if float_type is None:
+        float_type = get_float_type()
 
     if isinstance(value, (np.matrix, np.ndarray)):
         if value.dtype != np.dtype(float_type):
@@ -115,7 +136,7 @@ def asfloat(value):
         return value
 
     elif isinstance(value, (tf.Tensor, tf.SparseTensor)):
-        return tf.cast(value, tf.float32)
+        return tf.cast(value, float_type)
 
     elif issparse(value):
         return value
@@ -172,7 +193,7 @@ def preformat_value(value):
     elif isinstance(value, (list, tuple, set)):
         return [preformat_value(v) for v in value]
 
-    elif isinstance(value, (np.ndarray, np.matrix)):
+    elif isinstance(value, (np.ndarray, np.matrix, h5py.Dataset)):
         return value.shape
 
     elif hasattr(value, 'default'):
@@ -242,28 +263,124 @@ def all_equal(array):
     return True
 
 
-def tensorflow_session():
-    if hasattr(tensorflow_session, 'cache'):
-        session = tensorflow_session.cache
+def tensorflow_session(graph=None):
+    """
+    Returns Tensorflow session associated with the graph. Each
+    graph has its own session. New session will be created in case
+    if graph doesn't have one or if it was closed.
 
-        if not session._closed:
-            return session
+    Parameters
+    ----------
+    graph : tf.Graph or None
+        Graph that session runs. ``None`` means that default graph
+        will be used. Defaults to ``None``.
 
-    config = tf.ConfigProto(
-        allow_soft_placement=True,
-        inter_op_parallelism_threads=0,
-        intra_op_parallelism_threads=0,
-    )
-    session = tf.Session(config=config)
+    Returns
+    -------
+    tf.Session
+    """
+    if graph is None:
+        graph = tf.get_default_graph()
+
+    session = tensorflow_session.cache.get(graph)
+
+    if session is not None and not session._closed:
+        return session
+
+    # Lock makes sure that threads that use the same
+    # graph won't create different sessions.
+    with tensorflow_session.lock:
+        session = tensorflow_session.cache.get(graph)
+
+        if session is None or session._closed:
+            config = tf.ConfigProto(
+                allow_soft_placement=True,
+                inter_op_parallelism_threads=0,
+                intra_op_parallelism_threads=0,
+            )
+            session = tf.Session(graph=graph, config=config)
+            tensorflow_session.cache[graph] = session
 
-    tensorflow_session.cache = session
     return session
 
 
+# Graph is used as a weak key, so the entry doesn't outlive the graph
+# that was discarded (for instance, with ``tf.reset_default_graph``)
+# and which session has been closed.
+tensorflow_session.cache = weakref.WeakKeyDictionary()
+tensorflow_session.lock = threading.Lock()
+
+
+def find_graph(variables):
+    """
+    Returns graph that contains specified Tensorflow variables.
+
+    Parameters
+    ----------
+    variables : list of Tensorflow variables
+
+    Returns
+    -------
+    tf.Graph
+        Graph of the first variable or default graph in
+        case if list is empty.
+    """
+    if variables:
+        return variables[0].graph
+    return tf.get_default_graph()
+
+
+def find_float_type(variables):
+    """
+    Returns float type of the Tensorflow variables. Variables keep
+    float type that was specified in the environment at the moment
+    when they were created.
+
+    Parameters
+    ----------
+    variables : list of Tensorflow variables
+
+    Returns
+    -------
+    str
+        Float type of the first float variable or float type from
+        the environment in case if there are no float variables.
+    """
+    for variable in variables:
+        dtype = variable.dtype.base_dtype
+        if dtype.is_floating:
+            return dtype.name
+    return get_float_type()
+
+
+def close_tensorflow_session(graph=None):
+    """
+    Closes Tensorflow session associated with the graph and
+    releases all resources that it holds.
+
+    Parameters
+    ----------
+    graph : tf.Graph or None
+        ``None`` means that default graph will be used.
+        Defaults to ``None``.
+    """
+    if graph is None:
+        graph = tf.get_default_graph()
+
+    with tensorflow_session.lock:
+        session = tensorflow_session.cache.pop(graph, None)
+
+    if session is not None:
+        session.close()
+
+
 def tensorflow_eval(value):
-    session = tensorflow_session()
-    initialize_uninitialized_variables()
-    return session.run(value)
+    graph = getattr(value, 'graph', None) or tf.get_default_graph()
+
+    with graph.as_default():
+        session = tensorflow_session()
+        initialize_uninitialized_variables()
+        return session.run(value)
 
 
 @function_name_scope
@@ -294,15 +411,64 @@ def initialize_uninitialized_variables(variables=None):
     if variables is None:
         variables = tf.global_variables()
 
-    session = tensorflow_session()
-    is_not_initialized = session.run([
-        tf.is_variable_initialized(var) for var in variables])
+    graph = find_graph(variables)
+    session = tensorflow_session(graph)
+
+    with graph.as_default():
+        is_not_initialized = session.run([
+            tf.is_variable_initialized(var) for var in variables])
+
+        not_initialized_vars = [
+            v for (v, f) in zip(variables, is_not_initialized) if not f]
+
+        if len(not_initialized_vars):
+            session.run(tf.variables_initializer(not_initialized_vars))
+
+
+@contextmanager
+def read_variables_per_iteration(variables, dependencies):
+    """
+    Context manager that makes specified variables, when they are
+    used in the operations defined inside of the context, return
+    value that has been read only after all the dependencies have
+    been computed. By default, variable's value inside of the
+    ``tf.while_loop`` body is read only once before the loop, which
+    means that updates made on one iteration won't be visible on the
+    next one. Context is useful for the loop's body where dependency
+    is one of the loop variables.
+
+    Contexts can be nested. Variables inside of the nested context
+    depend only on its own dependencies and reads made in the outer
+    context are available again after the nested context exits.
+
+    Parameters
+    ----------
+    variables : list
+        List of Tensorflow variables that have to be read
+        per each iteration.
+
+    dependencies : list
+        List of tensors that have to be computed before
+        reading variable's value.
+    """
+    variables = list(OrderedDict.fromkeys(variables))
+
+    with tf.control_dependencies(dependencies):
+        values = [variable.read_value() for variable in variables]
+
+    # Variable returns its snapshot every time it's been converted
+    # to tensor. Snapshot is replaced only for the variables that
+    # were specified and only while context is active.
+    snapshots = [variable._snapshot for variable in variables]
 
-    not_initialized_vars = [
-        v for (v, f) in zip(variables, is_not_initialized) if not f]
+    for variable, value in zip(variables, values):
+        variable._snapshot = value
 
-    if len(not_initialized_vars):
-        session.run(tf.variables_initializer(not_initialized_vars))
+    try:
+        yield
+    finally:
+        for variable, snapshot in zip(variables, snapshots):
+            variable._snapshot = snapshot
 
 
 def tf_repeat(tensor, repeats):
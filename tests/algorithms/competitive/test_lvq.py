@@ -258,3 +258,39 @@ class LVQTestCase(BaseTestCase):
             step=0.001,
             weight=prepared_lvq_weights,
         )
+
+    def test_lvq_with_search_index(self):
+        dataset = datasets.load_iris()
+        data, target = dataset.data, dataset.target
+
+        lvq = algorithms.LVQ(n_inputs=4, n_subclasses=6, n_classes=3)
+        lvq.train(data, target, epochs=1)
+        prepared_lvq_weights = lvq.weight
+
+        for network_class in (algorithms.LVQ, algorithms.LVQ21):
+            lvqnet = network_class(
+                n_inputs=4,
+                n_subclasses=6,
+                n_classes=3,
+                weight=prepared_lvq_weights.copy(),
+                verbose=False,
+            )
+            indexed_lvqnet = network_class(
+                n_inputs=4,
+                n_subclasses=6,
+                n_classes=3,
+                weight=prepared_lvq_weights.copy(),
+                # Index rebuilt after every update produces
+                # the same results as exhaustive search
+                search_index=algorithms.PrototypeIndex(rebuild_after=1),
+                verbose=False,
+            )
+
+            lvqnet.train(data, target, epochs=10)
+            indexed_lvqnet.train(data, target, epochs=10)
+
+            np.testing.assert_array_almost_equal(
+                lvqnet.weight, indexed_lvqnet.weight)
+
+            np.testing.assert_array_equal(
+                lvqnet.predict(data), indexed_lvqnet.predict(data))
@@ -0,0 +1,68 @@
+import numpy as np
+
+from neupy import algorithms
+
+from base import BaseTestCase
+
+
+class PrototypeIndexTestCase(BaseTestCase):
+    def test_prototype_index_exceptions(self):
+        with self.assertRaisesRegexp(ValueError, "Number of candidates"):
+            algorithms.PrototypeIndex(n_candidates=0)
+
+        with self.assertRaisesRegexp(ValueError, "eps cannot be negative"):
+            algorithms.PrototypeIndex(eps=-1)
+
+        with self.assertRaisesRegexp(ValueError, "rebuild_after"):
+            algorithms.PrototypeIndex(rebuild_after=0)
+
+        index = algorithms.PrototypeIndex()
+        with self.assertRaisesRegexp(ValueError, "only 3 prototypes"):
+            index.query(np.random.random((5, 2)),
+                        np.random.random((3, 2)), k=4)
+
+    def test_prototype_index_query(self):
+        input_data = np.random.random((20, 3))
+        prototypes = np.random.random((50, 3))
+
+        index = algorithms.PrototypeIndex(n_candidates=1)
+        indices, distances = index.query(input_data, prototypes, k=3)
+
+        expected_distances = np.linalg.norm(
+            input_data[:, None, :] - prototypes[None, :, :], axis=2)
+        expected_indices = expected_distances.argsort(axis=1)[:, :3]
+
+        np.testing.assert_array_equal(indices, expected_indices)
+        np.testing.assert_array_almost_equal(
+            distances, np.sort(expected_distances, axis=1)[:, :3])
+
+    def test_prototype_index_rebuild(self):
+        input_data = np.array([[0, 0], [10, 10]])
+        prototypes = np.array([[1, 1], [9, 9], [5, 5]], dtype=float)
+
+        index = algorithms.PrototypeIndex(n_candidates=1, rebuild_after=2)
+        indices, _ = index.query(input_data, prototypes)
+        np.testing.assert_array_equal(indices[:, 0], [0, 1])
+
+        # Tree stores copy of the prototypes, which means that
+        # the change won't be visible until tree gets rebuilt
+        prototypes[2] = [0, 0]
+        index.register_updates()
+
+        indices, distances = index.query(input_data, prototypes)
+        np.testing.assert_array_equal(indices[:, 0], [0, 1])
+        # Distances computed from the current prototypes
+        np.testing.assert_array_almost_equal(
+            distances[:, 0], [np.sqrt(2), np.sqrt(2)])
+
+        index.register_updates()
+        indices, _ = index.query(input_data, prototypes)
+        np.testing.assert_array_equal(indices[:, 0], [2, 1])
+        self.assertEqual(index.n_updates, 0)
+
+        prototypes[1] = [10, 10]
+        index.reset()
+
+        indices, distances = index.query(input_data, prototypes)
+        np.testing.assert_array_equal(indices[:, 0], [2, 1])
+        np.testing.assert_array_almost_equal(distances[:, 0], [0, 0])
@@ -1,4 +1,5 @@
 import math
+import tempfile
 
 import numpy as np
 
@@ -397,6 +398,200 @@ class SOFMTestCase(BaseTestCase):
         np.testing.assert_array_almost_equal(
             sn.predict(input_data), answers)
 
+    def test_sofm_batch_training(self):
+        for distance in ('euclid', 'dot_product', 'cos'):
+            sn = algorithms.SOFM(
+                n_inputs=2,
+                n_outputs=3,
+                weight=input_data[(2, 0, 4), :].T,
+                distance=distance,
+                learning_radius=0,
+                features_grid=(3,),
+                training_mode='batch',
+                verbose=False,
+            )
+            sn.train(input_data, epochs=10)
+
+            np.testing.assert_array_almost_equal(
+                sn.predict(input_data), answers)
+
+    def test_sofm_batch_training_weighted_average(self):
+        sn = algorithms.SOFM(
+            n_inputs=2,
+            n_outputs=3,
+            weight=input_data[(2, 0, 4), :].T,
+            learning_radius=0,
+            features_grid=(3,),
+            training_mode='batch',
+            verbose=False,
+        )
+        sn.train(input_data, epochs=1)
+
+        expected_weight = np.array([
+            input_data[2:4].mean(axis=0),
+            input_data[0:2].mean(axis=0),
+            input_data[4:6].mean(axis=0),
+        ]).T
+        np.testing.assert_array_almost_equal(sn.weight, expected_weight)
+
+    def test_sofm_batch_training_with_neighbours(self):
+        data = make_circle(max_samples=100)
+
+        for grid_type in ('rect', 'hexagon'):
+            sofm = algorithms.SOFM(
+                n_inputs=2,
+                features_grid=(3, 3),
+                learning_radius=1,
+                reduce_radius_after=4,
+                grid_type=grid_type,
+                weight='sample_from_data',
+                training_mode='batch',
+                verbose=False,
+            )
+
+            sofm.train(data, epochs=1)
+            error_after_first_epoch = sofm.errors.last()
+
+            sofm.train(data, epochs=9)
+            self.assertLess(sofm.errors.last(), error_after_first_epoch)
+
+    def test_sofm_parallel_batch_training(self):
+        data = make_circle(max_samples=200)
+        weight = np.random.random((2, 9))
+
+        sofm_options = dict(
+            n_inputs=2,
+            features_grid=(3, 3),
+            learning_radius=1,
+            training_mode='batch',
+            chunk_size=16,
+            verbose=False,
+        )
+
+        sofm = algorithms.SOFM(weight=weight.copy(), **sofm_options)
+        sofm.train(data, epochs=5)
+
+        parallel_sofm = algorithms.SOFM(
+            weight=weight.copy(), n_jobs=2, **sofm_options)
+        parallel_sofm.train(data, epochs=5)
+
+        np.testing.assert_array_almost_equal(
+            sofm.weight, parallel_sofm.weight)
+        np.testing.assert_array_almost_equal(
+            sofm.errors, parallel_sofm.errors)
+
+        with tempfile.NamedTemporaryFile() as temporary_file:
+            memmap_data = np.memmap(
+                temporary_file.name, dtype=data.dtype,
+                mode='w+', shape=data.shape)
+            memmap_data[:] = data
+
+            parallel_sofm = algorithms.SOFM(
+                weight=weight.copy(), n_jobs=3, **sofm_options)
+            parallel_sofm.train(memmap_data, epochs=5)
+
+            np.testing.assert_array_almost_equal(
+                sofm.weight, parallel_sofm.weight)
+
+    def test_sofm_chunked_prediction(self):
+        data = np.random.random((11, 3))
+        weight = np.random.random((3, 5))
+
+        expected_outputs = {
+            'euclid': -np.linalg.norm(
+                data[:, :, None] - weight[None, :, :], axis=1),
+            'dot_product': data.dot(weight),
+            'cos': data.dot(weight) / np.outer(
+                np.linalg.norm(data, axis=1),
+                np.linalg.norm(weight, axis=0)),
+        }
+
+        for distance, expected_output in expected_outputs.items():
+            sofm = algorithms.SOFM(
+                n_inputs=3,
+                n_outputs=5,
+                weight=weight.copy(),
+                distance=distance,
+                chunk_size=4,
+            )
+
+            np.testing.assert_array_almost_equal(
+                sofm.predict_raw(data), expected_output)
+
+            np.testing.assert_array_equal(
+                sofm.find_winners(data), expected_output.argmax(axis=1))
+
+            np.testing.assert_array_equal(
+                sofm.predict(data).argmax(axis=1),
+                expected_output.argmax(axis=1))
+
+    def test_sofm_neighbourhood_cache(self):
+        for grid_type in ('rect', 'hexagon'):
+            sofm = algorithms.SOFM(
+                n_inputs=2,
+                features_grid=(4, 5),
+                grid_type=grid_type,
+            )
+
+            for neuron_winner in range(sofm.n_outputs):
+                layer_output = np.zeros((1, sofm.n_outputs))
+                layer_output[0, neuron_winner] = 1
+
+                neighbours, step_scaler = sofm.find_neighbours(
+                    layer_output, learning_radius=2, std=0.5)
+                expected_index_y, = np.nonzero(neighbours)
+
+                index_y, actual_step_scaler = sofm.find_neighbourhood(
+                    neuron_winner, learning_radius=2, std=0.5)
+
+                np.testing.assert_array_equal(index_y, expected_index_y)
+                np.testing.assert_array_almost_equal(
+                    actual_step_scaler, step_scaler[expected_index_y])
+
+            self.assertEqual(len(sofm.neighbourhood_cache), sofm.n_outputs)
+
+            sofm.find_neighbourhood(0, learning_radius=2, std=0.25)
+            self.assertEqual(len(sofm.neighbourhood_cache), 1)
+            self.assertEqual(sofm.neighbourhood_cache_key, (2, 0.25))
+
+    def test_sofm_search_index(self):
+        data = make_circle(max_samples=100)
+        weight = np.random.random((2, 16))
+
+        for distance in ('euclid', 'cos'):
+            for training_mode in ('online', 'batch'):
+                sofm_options = dict(
+                    n_inputs=2,
+                    features_grid=(4, 4),
+                    learning_radius=1,
+                    distance=distance,
+                    training_mode=training_mode,
+                    verbose=False,
+                )
+                sofm = algorithms.SOFM(
+                    weight=weight.copy(), **sofm_options)
+                indexed_sofm = algorithms.SOFM(
+                    weight=weight.copy(),
+                    search_index=algorithms.PrototypeIndex(rebuild_after=1),
+                    **sofm_options)
+
+                sofm.train(data, epochs=5)
+                indexed_sofm.train(data, epochs=5)
+
+                np.testing.assert_array_almost_equal(
+                    sofm.weight, indexed_sofm.weight)
+
+                np.testing.assert_array_equal(
+                    sofm.predict(data), indexed_sofm.predict(data))
+
+        with self.assertRaisesRegexp(ValueError, "dot_product"):
+            algorithms.SOFM(
+                n_inputs=2,
+                n_outputs=4,
+                distance='dot_product',
+                search_index=algorithms.PrototypeIndex(),
+            )
+
     def test_sofm_euclide_norm_distance(self):
         weight = np.array([
             [1.41700099, 0.52680476],
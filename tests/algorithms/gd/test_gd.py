@@ -1,6 +1,7 @@
 from functools import partial
 
 import numpy as np
+import tensorflow as tf
 
 from neupy import algorithms, layers, environment
 from neupy.algorithms.gd.base import apply_batches
@@ -135,3 +136,69 @@ class GDAdditionalFunctionsTestCase(BaseTestCase):
                 arguments=[np.random.random((36, 1))],
                 batch_size=12,
             )
+
+
+class SparseUpdatesTestCase(BaseTestCase):
+    def test_sparse_embedding_updates(self):
+        x_train = np.random.randint(0, 3, size=(20, 4))
+        y_train = np.random.random((20, 1))
+
+        optimizers = [
+            partial(algorithms.GradientDescent, step=0.1),
+            partial(algorithms.Momentum, step=0.1, nesterov=True),
+            partial(algorithms.Adagrad, step=0.1),
+            partial(algorithms.RMSProp, step=0.1),
+            partial(algorithms.Adam, step=0.1),
+            partial(algorithms.Adamax, step=0.1),
+            partial(algorithms.Adadelta),
+            partial(algorithms.Momentum, step=0.1,
+                    addons=[algorithms.WeightDecay]),
+            partial(algorithms.Adam, step=0.1,
+                    addons=[algorithms.MaxNormRegularization]),
+        ]
+
+        for optimizer in optimizers:
+            embedding = layers.Embedding(10, 3)
+            network = optimizer(
+                [
+                    layers.Input(4),
+                    embedding,
+                    layers.Reshape(),
+                    layers.Sigmoid(1),
+                ],
+                batch_size=5,
+                sparse_updates=True,
+                verbose=False,
+            )
+            weight_before = self.eval(embedding.weight)
+
+            updates = dict(network.variables.training_updates)
+            if not network.addons:
+                self.assertIsInstance(
+                    updates[embedding.weight], tf.IndexedSlices)
+
+            network.train(x_train, y_train, epochs=3)
+            weight_after = self.eval(embedding.weight)
+
+            # Rows that weren't used during the training
+            # should stay the same
+            np.testing.assert_array_equal(
+                weight_before[3:], weight_after[3:])
+            self.assertFalse(np.allclose(weight_before[:3], weight_after[:3]))
+
+    def test_dense_embedding_updates_by_default(self):
+        embedding = layers.Embedding(10, 3)
+        network = algorithms.Momentum(
+            [
+                layers.Input(4),
+                embedding,
+                layers.Reshape(),
+                layers.Sigmoid(1),
+            ],
+            verbose=False,
+        )
+
+        self.assertFalse(network.sparse_updates)
+
+        updates = dict(network.variables.training_updates)
+        self.assertNotIsInstance(updates[embedding.weight], tf.IndexedSlices)
@@ -1,18 +1,37 @@
+import tempfile
 from itertools import product
 
+import h5py
 import numpy as np
 
 from neupy import algorithms, init, layers
 from neupy.algorithms.gd.base import (
     BatchSizeProperty, iter_batches,
     average_batch_errors, count_samples,
-    cannot_divide_into_batches,
+    cannot_divide_into_batches, prefetch_batches,
+    apply_batches,
 )
+from neupy.algorithms.utils import (bucket_by_sequence_length, BatchSource,
+                                    is_batch_source)
 
 from data import simple_classification
 from base import BaseTestCase
 
 
+def create_network(network_class=algorithms.GradientDescent, batch_size=12,
+                   **options):
+    return network_class(
+        [
+            layers.Input(10),
+            layers.Sigmoid(20, weight=init.Constant(0.1)),
+            layers.Sigmoid(1, weight=init.Constant(0.1)),
+        ],
+        batch_size=batch_size,
+        verbose=False,
+        **options
+    )
+
+
 class MinibatchGDTestCase(BaseTestCase):
     def setUp(self):
         super(MinibatchGDTestCase, self).setUp()
@@ -83,6 +102,15 @@ class MinibatchGDTestCase(BaseTestCase):
         actual_error = average_batch_errors([1, 1, 0.4], 300, 100)
         self.assertAlmostEqual(expected_error, actual_error)
 
+    def test_batch_average_with_unknown_number_of_samples(self):
+        actual_error = average_batch_errors(
+            [1, 1, 0.5], batch_sizes=[100, 100, 50])
+        self.assertAlmostEqual(0.9, actual_error)
+
+        actual_error = average_batch_errors(
+            [1, 0.2, 0.5], batch_sizes=[10, 50, 40])
+        self.assertAlmostEqual(0.4, actual_error)
+
     def test_cannot_divide_into_batches(self):
         x = np.random.random(10)
 
@@ -101,3 +129,314 @@ class MinibatchGDTestCase(BaseTestCase):
 
         self.assertEqual(count_samples(x), 10)
         self.assertEqual(count_samples([x, x]), 10)
+
+    def test_prefetch_batches(self):
+        batches = prefetch_batches(iter(range(10)), n_batches=2)
+        self.assertEqual(list(batches), list(range(10)))
+
+        def invalid_batches():
+            yield 1
+            raise ZeroDivisionError("Invalid batch")
+
+        with self.assertRaisesRegexp(ZeroDivisionError, "Invalid batch"):
+            list(prefetch_batches(invalid_batches(), n_batches=3))
+
+    def test_apply_batches_with_prefetch(self):
+        x = np.random.random((50, 2))
+        outputs = apply_batches(
+            function=lambda x: x,
+            arguments=[x],
+            batch_size=20,
+            show_error_output=False,
+            scalar_output=False,
+            prefetch=2,
+        )
+        np.testing.assert_array_equal(np.concatenate(outputs, axis=0), x)
+
+    def test_training_with_prefetch(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+        errors = []
+
+        for prefetch in (0, 1, 3):
+            network = algorithms.GradientDescent(
+                [
+                    layers.Input(10),
+                    layers.Sigmoid(20, weight=init.Constant(0.1)),
+                    layers.Sigmoid(1, weight=init.Constant(0.1)),
+                ],
+                batch_size=10,
+                prefetch=prefetch,
+                verbose=False,
+            )
+            network.train(x_train, y_train, x_test, y_test, epochs=5)
+            errors.append(network.errors)
+
+        np.testing.assert_array_almost_equal(errors[0], errors[1])
+        np.testing.assert_array_almost_equal(errors[0], errors[2])
+
+    def test_prefetch_invalid_values(self):
+        with self.assertRaises(ValueError):
+            algorithms.GradientDescent((10, 20, 1), prefetch=-1)
+
+        with self.assertRaises(TypeError):
+            algorithms.GradientDescent((10, 20, 1), prefetch=1.5)
+
+
+class StreamingDataTestCase(BaseTestCase):
+    def test_train_with_batch_source(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+
+        @BatchSource
+        def training_batches():
+            for i in range(0, len(x_train), 10):
+                yield x_train[i:i + 10], y_train[i:i + 10]
+
+        @BatchSource
+        def validation_batches():
+            for i in range(0, len(x_test), 7):
+                yield x_test[i:i + 7], y_test[i:i + 7]
+
+        network = create_network(batch_size=10)
+        network.train(x_train, y_train, x_test, y_test, epochs=5)
+
+        streamed_network = create_network(batch_size=10)
+        streamed_network.train(
+            training_batches, input_test=validation_batches, epochs=5)
+
+        np.testing.assert_array_almost_equal(
+            network.errors, streamed_network.errors)
+        np.testing.assert_array_almost_equal(
+            network.validation_errors, streamed_network.validation_errors)
+
+        np.testing.assert_array_almost_equal(
+            network.predict(x_test),
+            streamed_network.predict(
+                BatchSource(lambda: iter([x_test[:5], x_test[5:]]))),
+        )
+        # Targets produced by the source are ignored during prediction
+        np.testing.assert_array_almost_equal(
+            network.predict(x_test),
+            streamed_network.predict(validation_batches),
+        )
+        self.assertAlmostEqual(
+            network.prediction_error(x_test, y_test),
+            streamed_network.prediction_error(validation_batches),
+        )
+
+    def test_train_with_memmap(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+
+        with tempfile.NamedTemporaryFile() as temp:
+            x_memmap = np.memmap(temp.name, dtype='float64',
+                                 mode='w+', shape=x_train.shape)
+            x_memmap[:] = x_train
+
+            network = create_network(batch_size=10)
+            network.train(x_train, y_train, epochs=5)
+
+            streamed_network = create_network(batch_size=10, prefetch=2)
+            streamed_network.train(x_memmap, y_train, epochs=5)
+
+            np.testing.assert_array_almost_equal(
+                network.errors, streamed_network.errors)
+
+            np.testing.assert_array_almost_equal(
+                network.predict(x_train),
+                streamed_network.predict(x_memmap),
+            )
+
+    def test_train_with_hdf5_dataset(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+
+        with tempfile.NamedTemporaryFile() as temp:
+            with h5py.File(temp.name, mode='w') as f:
+                f.create_dataset('input', data=x_train)
+                f.create_dataset('target', data=y_train)
+
+            with h5py.File(temp.name, mode='r') as f:
+                network = create_network(batch_size=10, shuffle_data=True)
+                network.train(f['input'], f['target'], epochs=10)
+                self.assertEqual(len(network.errors), 10)
+
+                predicted = network.predict(f['input'])
+                self.assertEqual(predicted.shape, (len(x_train), 1))
+
+    def test_bucket_by_sequence_length(self):
+        x_train = np.arange(20).reshape((10, 2))
+        sequence_length = np.array([5, 1, 4, 2, 3, 5, 1, 4, 2, 3])
+
+        batches = bucket_by_sequence_length(
+            [x_train, sequence_length], sequence_length, batch_size=4)
+
+        for _ in range(3):
+            seen_samples = []
+
+            for x_batch, length_batch in batches():
+                np.testing.assert_array_equal(
+                    length_batch, sequence_length[x_batch[:, 0] // 2])
+                self.assertLessEqual(np.ptp(length_batch), 1)
+                seen_samples.extend(x_batch[:, 0])
+
+            self.assertEqual(sorted(seen_samples), list(range(0, 20, 2)))
+
+        batches = bucket_by_sequence_length(
+            [x_train, sequence_length], sequence_length,
+            batch_size=4, shuffle_data=False)
+
+        length_batches = [sorted(length) for _, length in batches()]
+        self.assertEqual(length_batches, [[1, 1, 2, 2], [3, 3, 4, 4], [5, 5]])
+
+        with self.assertRaisesRegexp(ValueError, "same number of samples"):
+            bucket_by_sequence_length(
+                [x_train[:5]], sequence_length, batch_size=4)
+
+    def test_batch_source_exceptions(self):
+        x_train, _, y_train, _ = simple_classification()
+
+        @BatchSource
+        def training_batches():
+            yield x_train, y_train
+
+        network = algorithms.BaseGradientDescent((10, 2, 1), verbose=False)
+        with self.assertRaisesRegexp(TypeError, "cannot use batch source"):
+            network.train(training_batches, epochs=1)
+
+        network = create_network(batch_size=10)
+        with self.assertRaisesRegexp(ValueError, "produced by the batch"):
+            network.train(training_batches, y_train, epochs=1)
+
+        with self.assertRaisesRegexp(ValueError, "Target training samples"):
+            network.train(x_train, epochs=1)
+
+        with self.assertRaisesRegexp(ValueError, "any batches"):
+            network.train(BatchSource(lambda: iter([])), epochs=1)
+
+        with self.assertRaisesRegexp(TypeError, "BatchSource class"):
+            network.train(training_batches.function, epochs=1)
+
+        with self.assertRaisesRegexp(TypeError, "BatchSource class"):
+            network.predict(lambda: iter([x_train]))
+
+        with self.assertRaisesRegexp(TypeError, "expects callable"):
+            BatchSource(x_train)
+
+    def test_callable_array_is_not_batch_source(self):
+        class CallableArray(np.ndarray):
+            def __call__(self):
+                return self
+
+        x_train, _, y_train, _ = simple_classification()
+        x_callable = x_train.view(CallableArray)
+
+        self.assertFalse(is_batch_source(x_callable))
+
+        network = create_network(batch_size=10)
+        network.train(x_callable, y_train, epochs=2)
+        self.assertEqual(len(network.errors), 2)
+
+
+class StagedDataTestCase(BaseTestCase):
+    def test_staged_data_training(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+
+        network = create_network()
+        network.train(x_train, y_train, x_test, y_test, epochs=5)
+
+        staged_network = create_network(stage_data=True)
+        staged_network.train(x_train, y_train, x_test, y_test, epochs=5)
+
+        np.testing.assert_array_almost_equal(
+            network.errors, staged_network.errors)
+        np.testing.assert_array_almost_equal(
+            network.validation_errors, staged_network.validation_errors)
+
+        # Staged data has to be removed after training and network
+        # should be able to use data provided directly
+        self.assertIsNone(staged_network.staged)
+        np.testing.assert_array_almost_equal(
+            network.predict(x_test), staged_network.predict(x_test))
+        self.assertAlmostEqual(
+            network.prediction_error(x_test, y_test),
+            staged_network.prediction_error(x_test, y_test),
+        )
+
+    def test_staged_data_with_shuffling(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+
+        network = create_network(stage_data=True, shuffle_data=True)
+        network.train(x_train, y_train, x_test, y_test, epochs=50)
+
+        self.assertEqual(len(network.errors), 50)
+        self.assertLess(network.errors.last(), network.errors[0])
+
+    def test_staged_data_multiple_inputs(self):
+        network = algorithms.GradientDescent(
+            [
+                [
+                    layers.Input(2) > layers.Sigmoid(3),
+                    layers.Input(3) > layers.Sigmoid(5),
+                ],
+                layers.Concatenate(),
+                layers.Sigmoid(1),
+            ],
+            batch_size=4,
+            stage_data=True,
+            shuffle_data=True,
+            verbose=False,
+        )
+
+        x_train_1 = np.random.random((10, 2))
+        x_train_2 = np.random.random((10, 3))
+        y_train = np.random.random((10, 1))
+
+        network.train([x_train_1, x_train_2], y_train, epochs=3)
+        self.assertEqual(len(network.errors), 3)
+
+
+class FusedTrainingStepsTestCase(BaseTestCase):
+    def test_fused_training_steps(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+
+        for network_class in (algorithms.GradientDescent, algorithms.Adam):
+            network = create_network(network_class)
+            network.train(x_train, y_train, x_test, y_test, epochs=5)
+
+            # Number of steps is selected in the way that the last
+            # call will have less mini-batches than the others
+            fused_network = create_network(network_class, steps_per_call=4)
+            fused_network.train(x_train, y_train, x_test, y_test, epochs=5)
+
+            np.testing.assert_array_almost_equal(
+                network.errors, fused_network.errors)
+            np.testing.assert_array_almost_equal(
+                network.validation_errors, fused_network.validation_errors)
+            np.testing.assert_array_almost_equal(
+                network.predict(x_test), fused_network.predict(x_test))
+
+    def test_fused_training_steps_with_staged_data(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+
+        network = create_network()
+        network.train(x_train, y_train, x_test, y_test, epochs=5)
+
+        fused_network = create_network(steps_per_call=3, stage_data=True)
+        fused_network.train(x_train, y_train, x_test, y_test, epochs=5)
+
+        np.testing.assert_array_almost_equal(
+            network.errors, fused_network.errors)
+        np.testing.assert_array_almost_equal(
+            network.validation_errors, fused_network.validation_errors)
+
+    def test_fused_training_steps_per_call_output(self):
+        x_train, _, y_train, _ = simple_classification()
+
+        network = create_network(steps_per_call=3)
+        errors = network.methods.fused_train_epoch(
+            network.batch_size, x_train[:30], y_train[:30])
+
+        # 30 samples divided into mini-batches with 12 samples
+        self.assertEqual(errors.shape, (3,))
+
+    def test_fused_training_steps_invalid_values(self):
+        with self.assertRaises(ValueError):
+            create_network(steps_per_call=0)
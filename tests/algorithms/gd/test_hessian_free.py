@@ -0,0 +1,89 @@
+from functools import partial
+
+import numpy as np
+import tensorflow as tf
+
+from neupy import algorithms
+from neupy.utils import asfloat
+from neupy.algorithms.gd.hessian_free import (hessian_vector_product,
+                                              conjugate_gradient)
+
+from utils import compare_networks
+from data import simple_classification
+from base import BaseTestCase
+
+
+class HessianFreeTestCase(BaseTestCase):
+    def test_hessian_vector_product(self):
+        x = tf.Variable(asfloat(np.array([1])), name='x')
+        y = tf.Variable(asfloat(np.array([2])), name='y')
+
+        f = x ** 2 + y ** 3 + 7 * x * y
+        # Hessian function:
+        # [[2, 7    ]
+        #  [7, 6 * y]]
+        gradients = tf.gradients(f, [x, y])
+        product = hessian_vector_product(
+            gradients, [x, y], asfloat(np.array([1, -1])))
+
+        np.testing.assert_array_almost_equal(
+            self.eval(product),
+            np.array([2 - 7, 7 - 12]),
+        )
+
+    def test_conjugate_gradient(self):
+        matrix = asfloat(np.array([
+            [4, 1, 0],
+            [1, 3, 1],
+            [0, 1, 2],
+        ]))
+        vector = asfloat(np.array([1, 2, 3]))
+
+        solution = conjugate_gradient(
+            lambda value: tf.tensordot(matrix, value, 1),
+            tf.constant(vector), maxiter=10, tol=1e-7)
+
+        np.testing.assert_array_almost_equal(
+            self.eval(solution),
+            np.linalg.solve(matrix, vector),
+            decimal=5,
+        )
+
+    def test_conjugate_gradient_negative_curvature(self):
+        matrix = asfloat(-np.eye(2))
+        vector = tf.constant(asfloat(np.array([1, 2])))
+
+        solution = conjugate_gradient(
+            lambda value: tf.tensordot(matrix, value, 1),
+            vector, maxiter=10, tol=1e-7)
+
+        np.testing.assert_array_equal(self.eval(solution), np.zeros(2))
+
+    def test_hessian_free_assign_step_exception(self):
+        with self.assertRaises(ValueError):
+            # Doesn't have step parameter
+            algorithms.HessianFree((2, 3, 1), step=0.01)
+
+    def test_compare_bp_and_hessian_free(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+        compare_networks(
+            # Test classes
+            partial(algorithms.GradientDescent, batch_size='all'),
+            partial(algorithms.HessianFree, curvature_batch_size=20),
+            # Test data
+            (x_train, y_train, x_test, y_test),
+            # Network configurations
+            connection=(10, 15, 1),
+            shuffle_data=True,
+            verbose=False,
+            show_epoch=1,
+            # Test configurations
+            epochs=5,
+            show_comparison_plot=False
+        )
+
+    def test_hessian_free_overfit(self):
+        self.assertCanNetworkOverfit(
+            partial(algorithms.HessianFree, damping=0.001, verbose=False),
+            epochs=100,
+        )
@@ -5,7 +5,7 @@ import tensorflow as tf
 from sklearn import datasets, preprocessing
 from sklearn.model_selection import train_test_split
 
-from neupy import algorithms, layers
+from neupy import algorithms, layers, init
 from neupy.utils import asfloat
 from neupy.algorithms.gd.lev_marq import compute_jacobian
 
@@ -88,3 +88,40 @@ class LevenbergMarquardtTestCase(BaseTestCase):
             partial(algorithms.LevenbergMarquardt, verbose=False),
             epochs=50,
         )
+
+    def check_chunked_training(self, create_connection):
+        x_train = np.random.random((23, 3))
+        y_train = np.random.random((23, 2))
+        weights = []
+
+        for chunk_size in (None, 5):
+            network = algorithms.LevenbergMarquardt(
+                create_connection(),
+                chunk_size=chunk_size,
+                mu=0.1,
+                verbose=False,
+            )
+            network.train(x_train, y_train, epochs=3)
+            weights.append(self.eval(network.layers[-1].weight))
+
+        np.testing.assert_array_almost_equal(*weights, decimal=4)
+
+    def test_levenberg_marquardt_chunks(self):
+        weight_1 = init.Normal().sample((3, 4), return_array=True)
+        weight_2 = init.Normal().sample((4, 2), return_array=True)
+
+        self.check_chunked_training(lambda: [
+            layers.Input(3),
+            layers.Sigmoid(4, weight=weight_1),
+            layers.Sigmoid(2, weight=weight_2, bias=None),
+        ])
+
+    def test_levenberg_marquardt_chunks_non_dense_layers(self):
+        weight_1 = init.Normal().sample((3, 4), return_array=True)
+        weight_2 = init.Normal().sample((4, 2), return_array=True)
+
+        self.check_chunked_training(lambda: [
+            layers.Input(3),
+            layers.PRelu(4, weight=weight_1),
+            layers.Sigmoid(2, weight=weight_2),
+        ])
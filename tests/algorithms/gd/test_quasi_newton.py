@@ -185,6 +185,44 @@ class QuasiNewtonTestCase(BaseTestCase):
             min_accepted_error=0.002,
         )
 
+    def test_quasi_newton_lbfgs_overfit(self):
+        self.assertCanNetworkOverfit(
+            partial(
+                algorithms.QuasiNewton,
+                update_function='lbfgs',
+                memory_size=5,
+                verbose=False,
+            ),
+            epochs=100,
+            min_accepted_error=0.002,
+        )
+
+    def test_lbfgs_and_bfgs_equivalence(self):
+        gradient = asfloat(np.array([0.5, -1, 2]))
+        delta_ws = asfloat(np.array([
+            [0, 0, 0],
+            [0.1, 0.2, 0.3],
+            [0.2, -0.1, 0.1],
+        ]))
+        delta_grads = asfloat(np.array([
+            [0, 0, 0],
+            [0.3, 0.4, 0.5],
+            [0.4, -0.1, 0.3],
+        ]))
+
+        # The first pair is empty and has to be ignored
+        gamma = delta_ws[-1].dot(delta_grads[-1])
+        gamma /= delta_grads[-1].dot(delta_grads[-1])
+        inv_hessian = gamma * asfloat(np.eye(3))
+
+        for delta_w, delta_grad in zip(delta_ws[1:], delta_grads[1:]):
+            inv_hessian = qn.bfgs(inv_hessian, delta_w, delta_grad)
+
+        np.testing.assert_array_almost_equal(
+            self.eval(qn.lbfgs(gradient, delta_ws, delta_grads)),
+            self.eval(qn.dot(inv_hessian, gradient)),
+        )
+
     def test_safe_division(self):
         value = self.eval(qn.safe_division(2.0, 4.0, epsilon=1e-7))
         self.assertAlmostEqual(0.5, value)
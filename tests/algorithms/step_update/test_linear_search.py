@@ -1,10 +1,12 @@
 import numpy as np
+import tensorflow as tf
 from sklearn import datasets, preprocessing
 from sklearn.model_selection import train_test_split
 
 from neupy import algorithms, layers
-from neupy.utils import asfloat
+from neupy.utils import asfloat, tensorflow_session
 from neupy.algorithms.gd import errors
+from neupy.algorithms.utils import create_snapshot
 
 from base import BaseTestCase
 
@@ -15,7 +17,7 @@ class LinearSearchTestCase(BaseTestCase):
     def test_linear_search(self):
         methods = [
             ('golden', 0.36517048),
-            ('brent', 0.36848962),
+            ('brent', 0.35220632),
         ]
 
         for method_name, valid_error in methods:
@@ -55,3 +57,20 @@ class LinearSearchTestCase(BaseTestCase):
             )
             error = self.eval(error)
             self.assertAlmostEqual(valid_error, error, places=5)
+
+    def test_create_snapshot(self):
+        weight = tf.Variable(asfloat(np.ones((2, 3))), name='weight')
+        bias = tf.Variable(asfloat(np.zeros(3)), name='bias')
+
+        save, restore = create_snapshot([weight, bias])
+        session = tensorflow_session()
+
+        self.eval([weight, bias])
+        session.run(save)
+
+        weight.load(asfloat(np.zeros((2, 3))), session)
+        bias.load(asfloat(np.ones(3)), session)
+        session.run(restore)
+
+        np.testing.assert_array_equal(self.eval(weight), np.ones((2, 3)))
+        np.testing.assert_array_equal(self.eval(bias), np.zeros(3))
@@ -1,7 +1,14 @@
-from neupy import layers, algorithms
+import threading
+
+import numpy as np
+import tensorflow as tf
+
+from neupy import layers, algorithms, init
+from neupy.utils import asfloat, initialize_uninitialized_variables
 from neupy.exceptions import InvalidConnection
 from neupy.algorithms.constructor import (ConstructibleNetwork,
-                                          generate_layers)
+                                          generate_layers, function)
+from neupy.layers.connections.checkpoint import checkpointed_output
 
 from base import BaseTestCase
 from data import simple_classification
@@ -24,6 +31,41 @@ class NetworkConstructorTestCase(BaseTestCase):
         with self.assertRaises(ValueError):
             generate_layers((5,))
 
+    def test_function_with_updates(self):
+        x = tf.placeholder(tf.float32, shape=(None, 2))
+        counter = tf.Variable(asfloat(0), dtype=tf.float32)
+        initialize_uninitialized_variables([counter])
+
+        sum_and_count = function(
+            inputs=[x],
+            outputs=tf.reduce_sum(x),
+            updates=[(counter, counter + 1)],
+        )
+
+        # Inputs with different type has to be converted
+        self.assertAlmostEqual(sum_and_count([[1, 2], [3, 4]]), 10)
+        self.assertAlmostEqual(sum_and_count(np.ones((3, 2))), 6)
+        self.assertEqual(self.eval(counter), 2)
+
+    def test_function_with_multiple_outputs(self):
+        x = tf.placeholder(tf.float32, shape=(None, 2))
+        counter = tf.Variable(asfloat(0), dtype=tf.float32)
+        initialize_uninitialized_variables([counter])
+
+        statistics = function(
+            inputs=[x],
+            outputs={
+                'sum': tf.reduce_sum(x),
+                'min_max': [tf.reduce_min(x), tf.reduce_max(x)],
+            },
+            updates=[counter.assign_add(1)],
+        )
+
+        result = statistics([[1, 2], [3, 4]])
+        self.assertAlmostEqual(result['sum'], 10)
+        np.testing.assert_array_almost_equal(result['min_max'], [1, 4])
+        self.assertEqual(self.eval(counter), 1)
+
 
 class ConstructibleNetworkTestCase(BaseTestCase):
     def test_training_with_multiple_inputs(self):
@@ -64,3 +106,216 @@ class ConstructibleNetworkTestCase(BaseTestCase):
 
         with self.assertRaises(InvalidConnection):
             ConstructibleNetwork(connection)
+
+    def test_network_with_own_graph(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+        networks = []
+
+        for _ in range(2):
+            with tf.Graph().as_default():
+                network = algorithms.GradientDescent(
+                    [
+                        layers.Input(10),
+                        layers.Sigmoid(20),
+                        layers.Sigmoid(1),
+                    ],
+                    batch_size=16,
+                    verbose=False,
+                )
+                networks.append(network)
+
+        first_network, second_network = networks
+
+        self.assertIsNot(
+            first_network.tensorflow_graph, tf.get_default_graph())
+        self.assertIsNot(
+            first_network.tensorflow_graph, second_network.tensorflow_graph)
+        self.assertIsNot(first_network.session, second_network.session)
+
+        threads = [
+            threading.Thread(
+                target=network.train,
+                args=(x_train, y_train),
+                kwargs=dict(epochs=10),
+            )
+            for network in networks
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        for network in networks:
+            self.assertEqual(len(network.errors), 10)
+            self.assertEqual(network.predict(x_test).shape, (len(x_test), 1))
+
+            session = network.session
+            network.close()
+            self.assertTrue(session._closed)
+
+    def test_networks_created_in_different_threads(self):
+        x_train, _, y_train, _ = simple_classification()
+        networks = []
+
+        def create_network():
+            network = algorithms.GradientDescent(
+                [layers.Input(10), layers.Sigmoid(1)],
+                verbose=False,
+            )
+            networks.append(network)
+
+        threads = [threading.Thread(target=create_network) for _ in range(2)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        first_network, second_network = networks
+        self.assertIsNot(
+            first_network.tensorflow_graph, second_network.tensorflow_graph)
+        self.assertIsNot(first_network.session, second_network.session)
+
+        # Networks created in the same thread share default graph
+        create_network()
+        create_network()
+        self.assertIs(
+            networks[2].tensorflow_graph, networks[3].tensorflow_graph)
+
+        with tf.Graph().as_default():
+            create_network()
+
+        self.assertIsNot(
+            networks[3].tensorflow_graph, networks[4].tensorflow_graph)
+
+        for network in networks:
+            network.train(x_train, y_train, epochs=1)
+            self.assertEqual(len(network.errors), 1)
+
+    def test_close_network_that_shares_graph(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+        first_network, second_network = [
+            algorithms.GradientDescent(
+                [
+                    layers.Input(10),
+                    layers.Sigmoid(1),
+                ],
+                verbose=False,
+            )
+            for _ in range(2)
+        ]
+
+        session = first_network.session
+        self.assertIs(session, second_network.session)
+
+        first_network.close()
+        self.assertFalse(session._closed)
+
+        second_network.train(x_train, y_train, epochs=2)
+        self.assertEqual(len(second_network.errors), 2)
+
+        second_network.close()
+        self.assertTrue(session._closed)
+
+    def test_connections_with_own_graph(self):
+        x = asfloat(np.random.random((5, 10)))
+        x_sequence = asfloat(np.random.random((5, 4, 3)))
+
+        with tf.Graph().as_default():
+            connection = layers.join(layers.Input(10), layers.Sigmoid(4))
+            recurrent_connection = layers.join(
+                layers.Input((4, 3)), layers.GRU(5))
+
+        # Methods are called outside of the graph's context
+        output = connection.predict(x)
+        self.assertEqual(output.shape, (5, 4))
+
+        inference_connection = layers.optimize_for_inference(connection)
+        np.testing.assert_array_almost_equal(
+            output, inference_connection.predict(x), decimal=5)
+
+        stream = layers.StatefulConnection(recurrent_connection)
+        self.assertEqual(stream.step(x_sequence[:, 0]).shape, (5, 5))
+
+        self.assertEqual(tf.get_default_graph().get_operations(), [])
+
+    def test_gradient_checkpoints(self):
+        x = asfloat(np.random.random((8, 10)))
+        connection = layers.join(
+            layers.Input(10),
+            layers.Relu(16),
+            layers.BatchNorm(),
+            [[
+                layers.Relu(8, name='left'),
+                layers.Tanh(8),
+            ], [
+                layers.Sigmoid(8),
+            ]],
+            layers.Concatenate(),
+            layers.Dropout(0.5),
+            layers.Sigmoid(4),
+            layers.Sigmoid(1),
+        )
+        parameters = [
+            parameter for layer in connection
+            for parameter in layer.parameters.values()
+            if parameter.is_trainable]
+
+        with connection.disable_training_state():
+            expected_gradients = tf.gradients(
+                tf.reduce_sum(connection.output(x)), parameters)
+
+            output_layer = connection.output_layers[0]
+
+            for checkpoints in (2, ['left'], [], [output_layer]):
+                output = checkpointed_output(connection, [x], checkpoints)
+                actual_gradients = tf.gradients(
+                    tf.reduce_sum(output), parameters)
+
+                for expected, actual in zip(
+                        self.eval(expected_gradients),
+                        self.eval(actual_gradients)):
+                    np.testing.assert_array_almost_equal(
+                        expected, actual, decimal=5)
+
+    def test_training_with_gradient_checkpoints(self):
+        x_train, x_test, y_train, y_test = simple_classification()
+        errors = []
+
+        for checkpoints in (None, 2, ['checkpoint']):
+            network = algorithms.GradientDescent(
+                [
+                    layers.Input(10),
+                    layers.Sigmoid(20, weight=init.Constant(0.1)),
+                    layers.BatchNorm(),
+                    layers.Sigmoid(20, weight=init.Constant(0.1),
+                                   name='checkpoint'),
+                    layers.Sigmoid(1, weight=init.Constant(0.1)),
+                ],
+                checkpoints=checkpoints,
+                batch_size=16,
+                verbose=False,
+            )
+            network.train(x_train, y_train, epochs=5)
+            errors.append(network.errors)
+
+        np.testing.assert_array_almost_equal(errors[0], errors[1])
+        np.testing.assert_array_almost_equal(errors[0], errors[2])
+
+    def test_invalid_number_of_checkpoints(self):
+        for checkpoints in (0, -2):
+            with self.assertRaisesRegexp(ValueError, "positive integer"):
+                algorithms.GradientDescent(
+                    [layers.Input(10), layers.Sigmoid(1)],
+                    checkpoints=checkpoints,
+                    verbose=False,
+                )
+
+        connection = layers.Input(10) > layers.Sigmoid(1)
+        x = tf.placeholder(tf.float32, shape=(None, 10))
+
+        with self.assertRaisesRegexp(ValueError, "positive integer"):
+            checkpointed_output(connection, [x], 0)
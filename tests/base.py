@@ -7,7 +7,8 @@ import numpy as np
 import tensorflow as tf
 
 from neupy import environment, layers, init
-from neupy.utils import tensorflow_eval, tensorflow_session
+from neupy.utils import (tensorflow_eval, tensorflow_session,
+                         close_tensorflow_session)
 
 from utils import vectors_for_testing
 
@@ -32,7 +33,9 @@ class BaseTestCase(unittest.TestCase):
                 intra_op_parallelism_threads=1,
                 inter_op_parallelism_threads=1,
             )
-            tensorflow_session.cache = tf.Session(config=config)
+            graph = tf.get_default_graph()
+            tensorflow_session.cache[graph] = tf.Session(
+                graph=graph, config=config)
 
         if not self.verbose:
             logging.disable(logging.CRITICAL)
@@ -42,8 +45,7 @@ class BaseTestCase(unittest.TestCase):
         environment.reproducible(seed=self.random_seed)
 
     def tearDown(self):
-        sess = tensorflow_session()
-        sess.close()
+        close_tensorflow_session()
 
     def assertItemsEqual(self, list1, list2):
         self.assertEqual(sorted(list1), sorted(list2))
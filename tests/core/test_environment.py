@@ -1,8 +1,10 @@
 import random
 
 import numpy as np
+import tensorflow as tf
 
-from neupy import environment
+from neupy import environment, algorithms, layers
+from neupy.utils import asfloat
 
 from base import BaseTestCase
 
@@ -26,3 +28,88 @@ class EnvironmentTestCase(BaseTestCase):
         x2 = np.random.random((10, 10))
 
         np.testing.assert_array_almost_equal(x1, x2)
+
+    def test_float_type(self):
+        self.assertEqual(environment.get_float_type(), 'float32')
+        self.assertEqual(asfloat(1).dtype, np.float32)
+
+        with environment.using_float_type('float64'):
+            self.assertEqual(environment.get_float_type(), 'float64')
+            self.assertEqual(asfloat(1).dtype, np.float64)
+            self.assertEqual(asfloat(np.ones(3)).dtype, np.float64)
+
+        self.assertEqual(environment.get_float_type(), 'float32')
+
+        with self.assertRaisesRegexp(ValueError, "Unsupported float type"):
+            environment.set_float_type('float128')
+
+    def test_network_with_float64_type(self):
+        x_train = np.random.random((20, 3))
+        y_train = np.random.random((20, 1))
+
+        with environment.using_float_type('float64'):
+            network = algorithms.LevenbergMarquardt(
+                [
+                    layers.Input(3),
+                    layers.Sigmoid(5),
+                    layers.Sigmoid(1),
+                ],
+                verbose=False,
+            )
+
+        for layer in network.layers[1:]:
+            self.assertEqual(layer.weight.dtype.base_dtype, tf.float64)
+
+        self.assertEqual(network.float_type, 'float64')
+        self.assertEqual(network.format_input_data(x_train).dtype, np.float64)
+
+        network.train(x_train, y_train, epochs=5)
+        self.assertEqual(len(network.errors), 5)
+        self.assertEqual(network.predict(x_train).dtype, np.float64)
+
+    def test_network_with_float16_type(self):
+        x_train = np.random.random((20, 3))
+        y_train = np.random.random((20, 1))
+
+        with environment.using_float_type('float16'):
+            network = algorithms.GradientDescent(
+                [
+                    layers.Input(3),
+                    layers.Relu(5),
+                    layers.Sigmoid(1),
+                ],
+                batch_size=5,
+                verbose=False,
+            )
+
+        network.train(x_train, y_train, epochs=2)
+        self.assertEqual(network.predict(x_train).dtype, np.float16)
+
+    def test_float64_connection_used_outside_of_context(self):
+        x = np.random.random((4, 3))
+        x_sequence = np.random.random((4, 5, 3))
+
+        with environment.using_float_type('float64'):
+            connection = layers.join(
+                layers.Input(3),
+                layers.PRelu(6),
+                layers.Sigmoid(2),
+            )
+            recurrent_connection = layers.join(
+                layers.Input((5, 3)),
+                layers.GRU(4),
+            )
+
+        self.assertEqual(environment.get_float_type(), 'float32')
+
+        output = connection.predict(x)
+        self.assertEqual(output.dtype, np.float64)
+
+        inference_connection = layers.optimize_for_inference(connection)
+        inference_output = inference_connection.predict(x)
+
+        self.assertEqual(inference_output.dtype, np.float64)
+        np.testing.assert_array_almost_equal(output, inference_output)
+
+        stream = layers.StatefulConnection(recurrent_connection)
+        self.assertEqual(stream.step(x_sequence[:, 0]).dtype, np.float64)
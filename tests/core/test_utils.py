@@ -5,7 +5,8 @@ import tensorflow as tf
 from scipy.sparse import csr_matrix
 
 from neupy.utils import (preformat_value, as_tuple, AttributeKeyDict,
-                         asfloat, format_data, all_equal)
+                         asfloat, format_data, all_equal,
+                         read_variables_per_iteration)
 from neupy.algorithms.utils import shuffle, iter_until_converge
 from neupy import algorithms
 
@@ -131,6 +132,38 @@ class UtilsTestCase(BaseTestCase):
             self.assertEqual(actual_output, testcase.expected_output,
                              msg="Input args: {}".format(testcase.input_args))
 
+    def test_read_variables_per_iteration_nested(self):
+        variable = tf.Variable(asfloat(1))
+        other_variable = tf.Variable(asfloat(2))
+        outer_step = tf.constant(0)
+        inner_step = tf.constant(1)
+
+        with read_variables_per_iteration([variable], [outer_step]):
+            outer_read = tf.convert_to_tensor(variable)
+            other_read = tf.convert_to_tensor(other_variable)
+
+            with read_variables_per_iteration([variable], [inner_step]):
+                inner_read = tf.convert_to_tensor(variable)
+
+            # Reads from the outer context have to be restored
+            outer_read_after_nested = tf.convert_to_tensor(variable)
+
+        default_read = tf.convert_to_tensor(variable)
+
+        self.assertIsNot(outer_read, inner_read)
+        self.assertIs(outer_read, outer_read_after_nested)
+        self.assertIsNot(default_read, outer_read)
+        self.assertIs(default_read, variable.value())
+
+        # Variables that weren't specified stay unchanged
+        self.assertIs(other_read, other_variable.value())
+
+        self.assertIn(outer_step.op, outer_read.op.control_inputs)
+        self.assertIn(inner_step.op, inner_read.op.control_inputs)
+        self.assertNotIn(inner_step.op, outer_read.op.control_inputs)
+
+        self.assertEqual(self.eval(inner_read), 1)
+
 
 class IterUntilConvergeTestCase(BaseTestCase):
     def test_iter_until_converge_critical_cases(self):
@@ -1,9 +1,10 @@
 import math
 
 import numpy as np
+import tensorflow as tf
 
 from neupy.utils import asfloat
-from neupy import layers, algorithms, init
+from neupy import layers, algorithms, init, environment
 
 from base import BaseTestCase
 from data import simple_classification
@@ -187,6 +188,28 @@ class PReluTestCase(BaseTestCase):
         actual_output = self.eval(actual_output)
         self.assertEqual(actual_output.shape, (1, 8, 8, 5))
 
+    def test_prelu_output_with_float64_type(self):
+        x_train, _, y_train, _ = simple_classification()
+
+        with environment.using_float_type('float64'):
+            prelu_layer = layers.PRelu(20, alpha=0.25)
+            network = algorithms.GradientDescent(
+                [
+                    layers.Input(10),
+                    prelu_layer,
+                    layers.Sigmoid(1),
+                ],
+                batch_size='all',
+                verbose=False,
+            )
+
+        self.assertEqual(prelu_layer.output_shape, (20,))
+        self.assertEqual(prelu_layer.alpha.dtype.base_dtype, tf.float64)
+
+        network.train(x_train, y_train, epochs=2)
+        self.assertEqual(len(network.errors), 2)
+        self.assertEqual(network.predict(x_train).dtype, np.float64)
+
     def test_prelu_param_updates(self):
         x_train, _, y_train, _ = simple_classification()
         prelu_layer1 = layers.PRelu(20, alpha=0.25)
@@ -342,3 +342,39 @@ class LayerGraphTestCase(BaseTestCase):
         ]
 
         self.assertListEqual(actual_graph, expected_graph)
+
+    def test_graph_topological_order_cache(self):
+        l1 = layers.Input(1)
+        l2 = layers.Relu()
+        l3 = layers.Sigmoid()
+
+        graph = LayerGraph()
+        graph.connect_layers(l1, l2)
+
+        self.assertEqual(graph.topological_order, (l1, l2))
+        self.assertEqual(graph.output_layers, [l2])
+        self.assertIn('topological_order', graph.cache)
+
+        graph.connect_layers(l2, l3)
+
+        self.assertNotIn('topological_order', graph.cache)
+        self.assertEqual(graph.topological_order, (l1, l2, l3))
+        self.assertEqual(graph.output_layers, [l3])
+
+        # Changes in the returned list shouldn't affect cache
+        graph.input_layers.append(l3)
+        self.assertEqual(graph.input_layers, [l1])
+
+    def test_graph_topological_sort_order(self):
+        graph = {'a': ['b', 'c'], 'b': ['c'], 'c': [], 'd': ['a', 'e']}
+        self.assertEqual(topological_sort(graph), ['c', 'b', 'a', 'd'])
+
+    def test_graph_propagate_forward_long_sequence(self):
+        connection = layers.join(
+            layers.Input(2),
+            *[layers.Relu() for _ in range(2000)]
+        )
+        input_value = asfloat(np.random.random((3, 2)))
+        output_value = self.eval(connection.output(input_value))
+
+        np.testing.assert_array_almost_equal(output_value, input_value)
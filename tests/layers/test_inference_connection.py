@@ -0,0 +1,119 @@
+import numpy as np
+
+from neupy import layers, init
+from neupy.utils import asfloat
+
+from base import BaseTestCase
+
+
+def random_batch_norm(**options):
+    return layers.BatchNorm(
+        gamma=init.Uniform(0.5, 1.5),
+        beta=init.Uniform(-1, 1),
+        running_mean=init.Uniform(-1, 1),
+        running_inv_std=init.Uniform(0.5, 2),
+        **options
+    )
+
+
+class InferenceConnectionTestCase(BaseTestCase):
+    def assertSamePredictions(self, connection, *inputs):
+        inputs = [asfloat(value) for value in inputs]
+        inference_connection = layers.optimize_for_inference(connection)
+
+        np.testing.assert_array_almost_equal(
+            connection.predict(*inputs),
+            inference_connection.predict(*inputs),
+            decimal=5,
+        )
+        return inference_connection
+
+    def test_inference_connection_fold_batch_norm(self):
+        connection = layers.join(
+            layers.Input((10, 10, 3)),
+            layers.Convolution((3, 3, 8), bias=None),
+            random_batch_norm(),
+            layers.Relu(),
+            layers.Dropout(0.5),
+            layers.Convolution((3, 3, 4), padding=1),
+            random_batch_norm(),
+            layers.Reshape(),
+            layers.Linear(10),
+            random_batch_norm(),
+            layers.GaussianNoise(std=1),
+            layers.Softmax(),
+        )
+        inference_connection = self.assertSamePredictions(
+            connection, np.random.random((5, 10, 10, 3)))
+
+        operations = [step.operation for step in inference_connection.steps]
+        self.assertEqual(
+            operations,
+            ['layer', 'convolution', 'convolution', 'layer', 'dense'])
+
+        self.assertEqual(
+            str(inference_connection),
+            "InferenceConnection(12 layers -> 5 steps)")
+
+    def test_inference_connection_shared_outputs(self):
+        input_layer = layers.Input((6, 6, 2))
+        convolution = layers.Convolution((3, 3, 4))
+
+        connection = layers.join(
+            input_layer,
+            convolution,
+            [[
+                random_batch_norm(),
+                layers.Relu(),
+            ], [
+                layers.Dropout(0.2),
+                layers.Sigmoid(),
+            ]],
+            layers.Concatenate(),
+        )
+        inference_connection = self.assertSamePredictions(
+            connection, np.random.random((3, 6, 6, 2)))
+
+        # Convolution has two consumers and batch normalization
+        # cannot be folded into it
+        operations = [step.operation for step in inference_connection.steps]
+        self.assertEqual(operations.count('scale'), 1)
+        self.assertIn(convolution, list(inference_connection))
+
+    def test_inference_connection_not_channel_wise_batch_norm(self):
+        connection = layers.join(
+            layers.Input((4, 4, 3)),
+            layers.Convolution((1, 1, 2), bias=None),
+            random_batch_norm(axes=(0,)),
+            layers.Tanh(),
+        )
+        inference_connection = self.assertSamePredictions(
+            connection, np.random.random((3, 4, 4, 3)))
+
+        operations = [step.operation for step in inference_connection.steps]
+        self.assertEqual(
+            operations, ['layer', 'convolution', 'scale', 'layer'])
+
+    def test_inference_connection_multiple_inputs(self):
+        input_layer_1 = layers.Input(10)
+        input_layer_2 = layers.Input(10)
+
+        connection = layers.join(
+            [
+                input_layer_1 > layers.Relu(5),
+                input_layer_2 > layers.Dropout(0.5),
+            ],
+            layers.Concatenate(),
+            layers.Linear(4),
+            random_batch_norm(),
+            layers.Sigmoid(),
+        )
+        self.assertSamePredictions(
+            connection, np.random.random((4, 10)), np.random.random((4, 10)))
+
+    def test_inference_connection_exceptions(self):
+        inference_connection = layers.optimize_for_inference(
+            layers.Input(10) > layers.Sigmoid(2))
+
+        with self.assertRaisesRegexp(ValueError, "1 input layer"):
+            inference_connection.output(np.ones((2, 10)), np.ones((2, 10)))
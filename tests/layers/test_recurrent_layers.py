@@ -22,6 +22,29 @@ def add_padding(data):
     return data_matrix
 
 
+def check_sequence_length_masking(testcase, layer_class, **options):
+    x = asfloat(np.random.random((3, 5, 2)))
+    sequence_length = np.array([[5], [2], [3]])
+
+    for only_return_final in (True, False):
+        layer = layer_class(
+            4, only_return_final=only_return_final, **options)
+        connection = layers.join(
+            [layers.Input((5, 2)), layers.Input(1)], layer)
+        output = testcase.eval(connection.output(x, sequence_length))
+
+        for i, length in enumerate(sequence_length[:, 0]):
+            expected = testcase.eval(layer.output(x[i:i + 1, :length]))
+
+            if only_return_final:
+                np.testing.assert_array_almost_equal(
+                    expected[0], output[i], decimal=5)
+            else:
+                np.testing.assert_array_almost_equal(
+                    expected[0], output[i, :length], decimal=5)
+                np.testing.assert_array_equal(0, output[i, length:])
+
+
 class GradientClippingTestCase(BaseTestCase):
     def test_clip_gradient(self):
         session = tensorflow_session()
@@ -122,6 +145,51 @@ class LSTMTestCase(BaseTestCase):
         )
         self.assertEqual(network_2.output_shape, (10, 20))
 
+    def test_lstm_output_matches_step_by_step_computation(self):
+        x = asfloat(np.random.random((3, 5, 2)))
+        lstm = layers.LSTM(4, only_return_final=False)
+        connection = layers.join(layers.Input((5, 2)), lstm)
+
+        actual_output = self.eval(connection.output(x))
+        input_weights, hidden_weights, biases = self.eval([
+            lstm.input_weights, lstm.hidden_weights, lstm.biases])
+
+        def sigmoid(value):
+            return 1 / (1 + np.exp(-value))
+
+        cell = hidden = np.zeros((3, 4))
+        expected_output = []
+
+        for i in range(5):
+            gates = x[:, i].dot(input_weights) + biases
+            gates += hidden.dot(hidden_weights)
+            ingate, forgetgate, cell_input, outgate = np.split(gates, 4, 1)
+
+            cell = (sigmoid(forgetgate) * cell +
+                    sigmoid(ingate) * np.tanh(cell_input))
+            hidden = sigmoid(outgate) * np.tanh(cell)
+            expected_output.append(hidden)
+
+        expected_output = np.stack(expected_output, axis=1)
+        np.testing.assert_array_almost_equal(
+            expected_output, actual_output, decimal=5)
+
+    def test_lstm_with_sequence_length(self):
+        check_sequence_length_masking(self, layers.LSTM)
+        check_sequence_length_masking(self, layers.LSTM, backwards=True)
+        check_sequence_length_masking(self, layers.LSTM, unroll_scan=True)
+
+    def test_lstm_sequence_length_exceptions(self):
+        with self.assertRaisesRegexp(LayerConnectionError, "length"):
+            layers.join(
+                [layers.Input((5, 2)), layers.Input(2)],
+                layers.LSTM(10))
+
+        with self.assertRaisesRegexp(LayerConnectionError, "3 inputs"):
+            layers.join(
+                [layers.Input((5, 2)), layers.Input(1), layers.Input(1)],
+                layers.LSTM(10))
+
     def test_stacked_lstm(self):
         x_train, x_test, y_train, y_test = self.data
         network = algorithms.RMSProp(
@@ -266,6 +334,43 @@ class GRUTestCase(BaseTestCase):
         )
         self.assertEqual(network_2.output_shape, (10, 20))
 
+    def test_gru_output_matches_step_by_step_computation(self):
+        x = asfloat(np.random.random((3, 5, 2)))
+        gru = layers.GRU(4, only_return_final=False)
+        connection = layers.join(layers.Input((5, 2)), gru)
+
+        actual_output = self.eval(connection.output(x))
+        input_weights, hidden_weights, biases = self.eval([
+            gru.input_weights, gru.hidden_weights, gru.biases])
+
+        def sigmoid(value):
+            return 1 / (1 + np.exp(-value))
+
+        hidden = np.zeros((3, 4))
+        expected_output = []
+
+        for i in range(5):
+            in_reset, in_update, in_hidden = np.split(
+                x[:, i].dot(input_weights) + biases, 3, 1)
+            hid_reset, hid_update, hid_hidden = np.split(
+                hidden.dot(hidden_weights), 3, 1)
+
+            resetgate = sigmoid(in_reset + hid_reset)
+            updategate = sigmoid(in_update + hid_update)
+            hidden_update = np.tanh(in_hidden + resetgate * hid_hidden)
+
+            hidden = hidden - updategate * (hidden - hidden_update)
+            expected_output.append(hidden)
+
+        expected_output = np.stack(expected_output, axis=1)
+        np.testing.assert_array_almost_equal(
+            expected_output, actual_output, decimal=5)
+
+    def test_gru_with_sequence_length(self):
+        check_sequence_length_masking(self, layers.GRU)
+        check_sequence_length_masking(self, layers.GRU, backwards=True)
+        check_sequence_length_masking(self, layers.GRU, unroll_scan=True)
+
     def test_stacked_gru(self):
         x_train, x_test, y_train, y_test = self.data
         network = algorithms.RMSProp(
@@ -336,3 +441,58 @@ class GRUTestCase(BaseTestCase):
         self.assertIs(gru.activation_functions.resetgate, tf.tanh)
         self.assertIs(gru.activation_functions.updategate, tf.tanh)
         self.assertIs(gru.activation_functions.hidden_update, tf.sin)
+
+
+class StatefulConnectionTestCase(BaseTestCase):
+    def test_stateful_connection_matches_prediction(self):
+        x = np.random.randint(0, 5, size=(3, 6))
+        connection = layers.join(
+            layers.Input(6),
+            layers.Embedding(5, 4),
+            layers.LSTM(8, only_return_final=False),
+            layers.GRU(6),
+            layers.Sigmoid(2),
+        )
+        stream = layers.StatefulConnection(connection)
+
+        for i in range(6):
+            expected = self.eval(connection.output(x[:, :i + 1]))
+            actual = stream.step(x[:, i])
+            np.testing.assert_array_almost_equal(expected, actual, decimal=5)
+
+        stream.reset_state()
+        np.testing.assert_array_almost_equal(
+            self.eval(connection.output(x[:, :1])),
+            stream.step(x[:, 0]),
+            decimal=5)
+
+    def test_stateful_connection_streams(self):
+        x = asfloat(np.random.random((2, 4, 3)))
+        connection = layers.join(layers.Input((4, 3)), layers.GRU(5))
+        stream = layers.StatefulConnection(connection)
+
+        for i in range(4):
+            output_a = stream.step(x[:1, i], stream_id='a')
+            output_b = stream.step(x[1:, i], stream_id='b')
+
+        expected = self.eval(connection.output(x))
+        np.testing.assert_array_almost_equal(
+            expected, np.concatenate([output_a, output_b]), decimal=5)
+
+        stream.reset_state('a')
+        self.assertEqual(list(stream.states), ['b'])
+
+        with self.assertRaisesRegexp(ValueError, "states for 1 samples"):
+            stream.step(x[:, 0], stream_id='b')
+
+    def test_stateful_connection_exceptions(self):
+        with self.assertRaisesRegexp(ValueError, "recurrent layers"):
+            layers.StatefulConnection(layers.Input(2) > layers.Sigmoid(1))
+
+        with self.assertRaisesRegexp(ValueError, "backwards"):
+            layers.StatefulConnection(
+                layers.Input((4, 3)) > layers.LSTM(5, backwards=True))
+
+        with self.assertRaisesRegexp(ValueError, "one input layer"):
+            layers.StatefulConnection(layers.join(
+                [layers.Input((4, 3)), layers.Input(1)], layers.LSTM(5)))
@@ -0,0 +1,154 @@
+import os
+import tempfile
+
+import numpy as np
+import tensorflow as tf
+
+from neupy import algorithms, layers, numpy_inference
+from neupy.utils import asfloat
+
+from base import BaseTestCase
+
+
+class InferenceNetworkTestCase(BaseTestCase):
+    def assertSamePredictions(self, connection, *inputs):
+        inputs = [asfloat(value) for value in inputs]
+        inference_network = numpy_inference.export_inference(connection)
+
+        np.testing.assert_array_almost_equal(
+            connection.predict(*inputs),
+            inference_network.predict(*inputs),
+            decimal=5,
+        )
+
+    def test_inference_mlp(self):
+        connection = layers.join(
+            layers.Input(10),
+            layers.Relu(20, alpha=0.1),
+            layers.Dropout(0.5),
+            layers.Sigmoid(15),
+            layers.Tanh(12),
+            layers.Elu(8),
+            layers.PRelu(7),
+            layers.Softplus(6),
+            layers.HardSigmoid(5),
+            layers.LeakyRelu(4),
+            layers.Softmax(3),
+        )
+        self.assertSamePredictions(connection, np.random.random((11, 10)))
+
+    def test_inference_network(self):
+        network = algorithms.GradientDescent(
+            [
+                layers.Input(4),
+                layers.Sigmoid(5),
+                layers.GaussianNoise(std=1),
+                layers.Linear(2),
+            ],
+            verbose=False,
+        )
+        x_train = asfloat(np.random.random((20, 4)))
+        y_train = asfloat(np.random.random((20, 2)))
+        network.train(x_train, y_train, epochs=2)
+
+        inference_network = numpy_inference.export_inference(network)
+        np.testing.assert_array_almost_equal(
+            network.predict(x_train),
+            inference_network.predict(x_train),
+            decimal=5,
+        )
+
+    def test_inference_cnn(self):
+        connection = layers.join(
+            layers.Input((12, 12, 3)),
+            layers.Convolution((3, 3, 8), padding='same', stride=2),
+            layers.BatchNorm(),
+            layers.Relu(),
+            layers.Convolution((3, 3, 8), padding=1, dilation=2),
+            layers.LocalResponseNorm(depth_radius=3),
+            layers.MaxPooling((2, 2), padding='same', stride=(1, 1)),
+            layers.Deconvolution((3, 3, 4), stride=2),
+            layers.Deconvolution((2, 2, 4), padding='same', stride=2),
+            layers.Deconvolution((3, 3, 4), padding=1),
+            layers.AveragePooling((3, 3), padding='same'),
+            layers.Upscale((2, 2)),
+            layers.AveragePooling((2, 2)),
+            layers.Transpose([2, 1, 3]),
+            layers.Reshape(),
+            layers.Softmax(10),
+        )
+        self.assertSamePredictions(
+            connection, np.random.random((5, 12, 12, 3)))
+
+    def test_inference_global_pooling(self):
+        connection = layers.join(
+            layers.Input((6, 6, 3)),
+            layers.Convolution((2, 2, 4)),
+            layers.GlobalPooling('max'),
+        )
+        self.assertSamePredictions(
+            connection, np.random.random((4, 6, 6, 3)))
+
+    def test_inference_merge_layers(self):
+        input_layer_1 = layers.Input(10)
+        input_layer_2 = layers.Input(10)
+
+        gated_average = layers.join([
+            input_layer_1 > layers.Softmax(2),
+            input_layer_1 > layers.Relu(5),
+            input_layer_2 > layers.Relu(5),
+        ], layers.GatedAverage(), layers.Linear(4))
+
+        concatenate = layers.join([
+            input_layer_1 > layers.Sigmoid(3),
+            input_layer_2 > layers.Tanh(3),
+        ], layers.Concatenate(), layers.Elu(4))
+
+        connection = layers.join(
+            [gated_average, concatenate],
+            layers.Elementwise(merge_function=tf.multiply),
+        )
+
+        self.assertSamePredictions(
+            connection,
+            np.random.random((7, 10)),
+            np.random.random((7, 10)),
+        )
+
+    def test_inference_embedding(self):
+        connection = layers.join(
+            layers.Input(3),
+            layers.Embedding(10, 4),
+            layers.Reshape(),
+            layers.Sigmoid(2),
+        )
+        self.assertSamePredictions(
+            connection, np.random.randint(10, size=(6, 3)))
+
+    def test_inference_save_and_load(self):
+        connection = layers.Input(10) > layers.Relu(5) > layers.Softmax(3)
+        inference_network = numpy_inference.export_inference(connection)
+        input_value = asfloat(np.random.random((3, 10)))
+
+        with tempfile.NamedTemporaryFile() as temp:
+            inference_network.save(temp.name)
+            temp.file.seek(0)
+            self.assertGreater(os.path.getsize(temp.name), 0)
+
+            loaded_network = numpy_inference.InferenceNetwork.load(temp.name)
+
+        np.testing.assert_array_almost_equal(
+            inference_network.predict(input_value),
+            loaded_network.predict(input_value))
+
+    def test_inference_exceptions(self):
+        connection = layers.Input((5, 2)) > layers.LSTM(3)
+
+        with self.assertRaisesRegexp(ValueError, "cannot be exported"):
+            numpy_inference.export_inference(connection)
+
+        inference_network = numpy_inference.export_inference(
+            layers.Input(3) > layers.Sigmoid(2))
+
+        with self.assertRaisesRegexp(ValueError, "expects 1 input"):
+            inference_network.predict(np.ones((2, 3)), np.ones((2, 3)))
@@ -148,3 +148,16 @@ class WolfeInterpolationTestCase(BaseTestCase):
         self.assertEqual(square(0), 6.25)
         self.assertAlmostEqual(square(x_star), 0, places=2)
         self.assertAlmostEqual(x_star, 0.5, places=2)
+
+    def test_wolfe_linear_search_value_and_derivative(self):
+        x_current = 3
+        grad = 2 * (x_current - 5.5)
+
+        def square_and_deriv(step):
+            x_new = x_current - step * grad
+            value = (x_new - 5.5) ** 2
+            # Derivative with respect to the step
+            return value, -grad * 2 * (x_new - 5.5)
+
+        x_star = self.eval(wolfe.line_search(square_and_deriv))
+        self.assertAlmostEqual(x_star, 0.5, places=2)